@@ -40,5 +40,40 @@ def download_ephemeris():
             print(f"Error downloading {filename}: {e}")
 
 
+def build_ephemeris_table():
+    """Precomputes the memory-mapped graha table used by VedicAstroEngine."""
+    import swisseph as swe
+    from src.astronomy.ephemeris_table import DEFAULT_TABLE_PATH, build_table
+
+    if os.path.exists(DEFAULT_TABLE_PATH):
+        print("  Ephemeris table already exists (skipping).")
+        return
+
+    swe.set_ephe_path(TARGET_DIR)
+    print("🧮 Building ephemeris table (1900-2100)...")
+    build_table(DEFAULT_TABLE_PATH)
+    print(f"Successfully built {DEFAULT_TABLE_PATH}")
+
+
+def build_transit_events(modes=("LAHIRI",)):
+    """Precomputes the 1900-2100 sign/nakshatra/station event table per ayanamsa."""
+    from src.astronomy.engine import VedicAstroEngine
+    from src.astronomy.ephemeris_table import EphemerisTable
+    from src.astronomy.transit_events import TransitEventTable, default_events_path
+
+    engine = VedicAstroEngine(ephemeris_table=EphemerisTable.load_default(), ephe_path=TARGET_DIR)
+    for mode in modes:
+        path = default_events_path(mode)
+        if os.path.exists(path):
+            print(f"  Transit events ({mode}) already exist (skipping).")
+            continue
+        print(f"🧮 Building transit event table ({mode}, 1900-2100)...")
+        table = TransitEventTable.build(engine, ayanamsa_mode=mode)
+        table.save(path)
+        print(f"Successfully built {path} ({len(table)} events)")
+
+
 if __name__ == "__main__":
     download_ephemeris()
+    build_ephemeris_table()
+    build_transit_events()
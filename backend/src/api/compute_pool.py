@@ -0,0 +1,126 @@
+import os
+import time
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+
+class PoolSaturated(Exception):
+    """Raised when the bounded compute queue stays full for longer than queue_timeout."""
+
+
+def _timed_call(fn, args, kwargs):
+    # Runs inside the worker: report when the task actually started and how long it ran
+    started = time.time()
+    result = fn(*args, **kwargs)
+    return result, started, time.time() - started
+
+
+class ComputePool:
+    """
+    Bounded process pool for CPU-heavy work (charts, dasha trees, chart images).
+
+    workers = 0 runs tasks inline in the calling thread; the queue bound still applies,
+    so at most `workers + max_queue` tasks are admitted at once and further callers
+    wait up to `queue_timeout` seconds before PoolSaturated is raised.
+    """
+
+    def __init__(self, workers=0, max_queue=64, queue_timeout=5.0, initializer=None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._executor = None
+        if workers > 0:
+            # spawn: workers start clean instead of forking the API process (torch, threads)
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=initializer,
+            )
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + max_queue)
+
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._wait_ms = deque(maxlen=2000)
+        self._run_ms = deque(maxlen=2000)
+
+    @classmethod
+    def from_env(cls, initializer=None):
+        """PANDIT_COMPUTE_WORKERS, PANDIT_COMPUTE_QUEUE, PANDIT_COMPUTE_QUEUE_TIMEOUT."""
+        return cls(
+            workers=int(os.getenv("PANDIT_COMPUTE_WORKERS", "0")),
+            max_queue=int(os.getenv("PANDIT_COMPUTE_QUEUE", "64")),
+            queue_timeout=float(os.getenv("PANDIT_COMPUTE_QUEUE_TIMEOUT", "5")),
+            initializer=initializer,
+        )
+
+    def run(self, fn, *args, **kwargs):
+        """Runs fn(*args, **kwargs) on the pool and blocks until the result is ready."""
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self.rejected += 1
+            raise PoolSaturated("Compute queue is full")
+
+        submitted_at = time.time()
+        with self._lock:
+            self.in_flight += 1
+            self.submitted += 1
+        try:
+            if self._executor is None:
+                result, started, run_s = _timed_call(fn, args, kwargs)
+            else:
+                result, started, run_s = self._executor.submit(_timed_call, fn, args, kwargs).result()
+            with self._lock:
+                self.completed += 1
+                self._wait_ms.append((started - submitted_at) * 1000)
+                self._run_ms.append(run_s * 1000)
+            return result
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def bind(self, fn):
+        """fn wrapped so every call goes through the pool."""
+        return lambda *args, **kwargs: self.run(fn, *args, **kwargs)
+
+    @staticmethod
+    def _percentiles(samples):
+        if not samples:
+            return {"p50": 0.0, "p99": 0.0, "max": 0.0}
+        s = sorted(samples)
+        return {
+            "p50": round(s[len(s) // 2], 2),
+            "p99": round(s[min(len(s) - 1, int(len(s) * 0.99))], 2),
+            "max": round(s[-1], 2),
+        }
+
+    def stats(self):
+        with self._lock:
+            return {
+                "mode": "process" if self._executor is not None else "inline",
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "capacity": max(self.workers, 1) + self.max_queue,
+                "queue_depth": max(self.in_flight - max(self.workers, 1), 0),
+                "in_flight": self.in_flight,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "wait_ms": self._percentiles(self._wait_ms),
+                "run_ms": self._percentiles(self._run_ms),
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
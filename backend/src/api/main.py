@@ -3,23 +3,38 @@ import os
 import uvicorn
 import torch
 import torch.nn as nn
-from datetime import datetime
-from fastapi import FastAPI, HTTPException, Request, Response
-from fastapi.middleware.cors import CORSMiddleware
+from datetime import date, datetime
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Path, Query, Request, Response
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel, Field
 from collections import defaultdict
 import time
-from src.api.schemas import BirthDetails, ChartResponse
+from src.api.schemas import BirthDetails, BirthDetailsBatch, ChartResponse
 
 # --- IMPORT ENGINES ---
 from src.astronomy.engine import VedicAstroEngine
+from src.astronomy.ephemeris_table import EphemerisTable
+from src.astronomy.chart_cache import ChartCache
 from src.astronomy.dasha import VimshottariDasha
-from src.astronomy.transits import TransitEngine
-from src.astronomy.match import MatchMaker
+from src.astronomy.transits import TransitEngine, SKY_BUCKET_SECONDS
+from src.astronomy.chart import GRAHA_NAMES, POINT_INDEX, MOON
+from src.astronomy.life_events import LifeEventEngine
+from src.astronomy.transit_events import (
+    EVENT_KINDS, SIGN, SIGN_RETURN_DAYS, TransitEventTable, events_to_dicts, local_minutes,
+    EVENTS_START_JD, EVENTS_END_JD,
+)
+from src.astronomy.dasha import datetime_to_jd
+from src.astronomy.dasha_systems import SIGN_NAMES
+from src.astronomy.match import MatchMaker, MatchPool
 from src.astronomy.yogas import YogaEngine
+from src.astronomy.gulika import UpagrahaEngine, jd_to_local_str
+from src.astronomy.vargas import VARGA_DIVISIONS, VARGA_INDEX
 from src.model.inference import generate_horoscope_reading, chat_with_astrologer
-from src.utils.chart_plotter import draw_north_indian_chart
+from src.api import tasks
+from src.utils.dasha_export import iter_ndjson, iter_ics, ics_uid_prefix
+from src.api.compute_pool import ComputePool, PoolSaturated
 
 app = FastAPI(title="PanditAI: Neuro-Symbolic Engine")
 
@@ -62,11 +77,60 @@ app.add_middleware(
 # ==========================================
 # 1. INITIALIZE ENGINES
 # ==========================================
-astro_engine = VedicAstroEngine()
+# Chart cache memory cap in MB (PANDIT_CHART_CACHE_MB, 0 disables caching)
+CHART_CACHE_MB = float(os.getenv("PANDIT_CHART_CACHE_MB", "64"))
+chart_cache = ChartCache(int(CHART_CACHE_MB * 1024 * 1024)) if CHART_CACHE_MB > 0 else None
+
+astro_engine = VedicAstroEngine(
+    ephemeris_table=EphemerisTable.load_default(), chart_cache=chart_cache
+)
 dasha_engine = VimshottariDasha()
-transit_engine = TransitEngine()
+transit_engine = TransitEngine(ephemeris_table=astro_engine.ephemeris_table)
+life_event_engine = LifeEventEngine(
+    ephemeris_table=astro_engine.ephemeris_table, dasha_engine=dasha_engine
+)
 match_engine = MatchMaker()
 yoga_engine = YogaEngine()
+upagraha_engine = UpagrahaEngine()
+
+# CPU-heavy work (charts, dasha trees, chart images) runs on a bounded pool.
+# PANDIT_COMPUTE_WORKERS=0 (default) keeps it inline in the request thread.
+compute_pool = ComputePool.from_env(initializer=tasks.init_worker)
+_chart_task = tasks.compute_chart if compute_pool.workers else astro_engine.calculate_chart
+compute_chart = compute_pool.bind(_chart_task)
+
+
+def run_compute(fn, *args):
+    try:
+        return compute_pool.run(fn, *args)
+    except PoolSaturated:
+        raise HTTPException(status_code=503, detail="Server busy, please retry.")
+
+
+def get_chart(d: BirthDetails):
+    try:
+        return astro_engine.get_chart(
+            d.year, d.month, d.day, d.hour, d.minute, d.latitude, d.longitude, d.timezone,
+            d.ayanamsa, compute=compute_chart,
+        )
+    except PoolSaturated:
+        raise HTTPException(status_code=503, detail="Server busy, please retry.")
+
+
+@app.on_event("startup")
+def warmup_engines():
+    info = astro_engine.warmup()
+    print(
+        f"  Ephemeris: {info['backend']} ({info['ephe_path']}), warmup {info['total_ms']} ms"
+    )
+    if compute_pool.workers:
+        print(f"  Compute pool: {compute_pool.workers} workers, queue {compute_pool.max_queue}")
+
+
+@app.on_event("shutdown")
+def shutdown_pool():
+    compute_pool.shutdown()
+
 
 # ==========================================
 # 2. LOAD PREDICTION DATA
@@ -193,68 +257,45 @@ if os.path.exists("models/destiny_net.pth"):
 
 
 def get_dl_vector(chart):
+    # [sign_id, house_number] per graha in fixed Sun..Ketu order
     vec = []
-    for p in [
-        "Sun",
-        "Moon",
-        "Mars",
-        "Mercury",
-        "Jupiter",
-        "Venus",
-        "Saturn",
-        "Rahu",
-        "Ketu",
-    ]:
-        if p in chart:
-            vec.extend([chart[p]["sign_id"], chart[p].get("house_number", 1)])
-        else:
-            vec.extend([0, 0])
+    for rec in chart.grahas:
+        vec.extend([rec.sign_id, rec.house_number])
     return torch.tensor([vec], dtype=torch.float32)
 
 
 # ==========================================
 # 4. HELPER: RULE KEY GENERATOR
 # ==========================================
+SIGN_SHORT = [
+    "ARI",
+    "TAU",
+    "GEM",
+    "CAN",
+    "LEO",
+    "VIR",
+    "LIB",
+    "SCO",
+    "SAG",
+    "CAP",
+    "AQU",
+    "PIS",
+]
+# Rule-key planet codes in chart order (Sun..Ketu)
+PLANET_SHORT = ["SUN", "MOON", "MAR", "MER", "JUP", "VEN", "SAT", "RAH", "KET"]
+
+
 def get_rules_for_chart(chart, asc_id):
     found_rules = []
     text_summary = "=== PLANETARY PLACEMENTS ===\n"
 
-    for p, data in chart.items():
-        if p == "Ascendant":
-            continue
-        h = data["house_number"]
-        sign_short = [
-            "ARI",
-            "TAU",
-            "GEM",
-            "CAN",
-            "LEO",
-            "VIR",
-            "LIB",
-            "SCO",
-            "SAG",
-            "CAP",
-            "AQU",
-            "PIS",
-        ][data["sign_id"]]
-        p_short = {
-            "Sun": "SUN",
-            "Moon": "MOON",
-            "Mars": "MAR",
-            "Mercury": "MER",
-            "Jupiter": "JUP",
-            "Venus": "VEN",
-            "Saturn": "SAT",
-            "Rahu": "RAH",
-            "Ketu": "KET",
-        }.get(p)
-
-        if p_short:
-            key = f"{p_short}_{sign_short}_H{h}"
-            if key in PREDICTION_DB:
-                rule = PREDICTION_DB[key]
-                found_rules.append(rule)
-                text_summary += f"* {p} in House {h}: {rule.get('prediction', '')}\n"
+    for rec, p_short in zip(chart.grahas, PLANET_SHORT):
+        h = rec.house_number
+        key = f"{p_short}_{SIGN_SHORT[rec.sign_id]}_H{h}"
+        rule = PREDICTION_DB.get(key)
+        if rule is not None:
+            found_rules.append(rule)
+            text_summary += f"* {rec.name} in House {h}: {rule.get('prediction', '')}\n"
 
     return found_rules, text_summary
 
@@ -264,28 +305,28 @@ def get_rules_for_chart(chart, asc_id):
 # ==========================================
 
 
+# Days per dasha year (see dasha_systems.YEAR_LENGTHS)
+YEAR_MODEL_QUERY = Query(
+    "GREGORIAN",
+    pattern="(?i)^(gregorian|savana|sidereal)$",
+    description="Dasha year length: GREGORIAN (365.2425 d), SAVANA (360 d) or SIDEREAL (365.2564 d)",
+)
+
+
 # Maintain backward compatibility with /calculate if needed by frontend
 @app.post("/calculate", response_model=ChartResponse)
 @app.post("/predict")
-def predict_horoscope(d: BirthDetails):
+def predict_horoscope(
+    d: BirthDetails,
+    dasha_depth: int = Query(2, ge=1, le=4, description="Dasha levels returned (4 = Sookshma)"),
+    year_model: str = YEAR_MODEL_QUERY,
+):
     try:
         # A. Calculate Chart
-        chart = astro_engine.calculate_chart(
-            d.year,
-            d.month,
-            d.day,
-            d.hour,
-            d.minute,
-            d.latitude,
-            d.longitude,
-            d.timezone,
-        )
-        asc_id = chart["Ascendant"]["sign_id"]
+        chart = get_chart(d)
+        asc_id = chart.ascendant.sign_id
 
-        # B. Assign House Numbers
-        for p, data in chart.items():
-            if p != "Ascendant":
-                data["house_number"] = (data["sign_id"] - asc_id) % 12 + 1
+        # B. House Numbers are part of the (shared, read-only) chart records
 
         # C. DL Score
         try:
@@ -299,40 +340,27 @@ def predict_horoscope(d: BirthDetails):
         rules, fact_sheet = get_rules_for_chart(chart, asc_id)
 
         # E. DASHA CALCULATION
-        dasha_data = {"timeline": [], "current": {}}
-        if "Moon" in chart:
-            moon_deg = chart["Moon"]["absolute_longitude"]
-            birth_dt = datetime(d.year, d.month, d.day, d.hour, d.minute)
-
-            raw_timeline = dasha_engine.calculate_dashas(moon_deg, birth_dt)
-            raw_current = dasha_engine.get_current_dasha_details(raw_timeline)
-
-            def serialize_node(node):
-                obj = {
-                    "lord": node["lord"],
-                    "start": node["start"].strftime("%Y-%m-%d"),
-                    "end": node["end"].strftime("%Y-%m-%d"),
-                    "type": node.get("type", "Unknown"),
-                }
-                if "sub_periods" in node and node["sub_periods"]:
-                    obj["sub_periods"] = [
-                        serialize_node(child) for child in node["sub_periods"]
-                    ]
-                return obj
-
-            dasha_data["timeline"] = [serialize_node(md) for md in raw_timeline]
-
-            if raw_current:
-                for k, v in raw_current.items():
-                    dasha_data["current"][k] = {
-                        "lord": v["lord"],
-                        "start": v["start"].strftime("%Y-%m-%d"),
-                        "end": v["end"].strftime("%Y-%m-%d"),
-                    }
+        birth_dt = datetime(d.year, d.month, d.day, d.hour, d.minute)
+        dasha_data = run_compute(
+            tasks.build_dasha, chart, birth_dt, dasha_depth, None, None, "VIMSHOTTARI", year_model
+        )
 
         # F. YOGA CALCULATION
         yogas = yoga_engine.check_yogas(chart)
 
+        # F2. UPAGRAHAS (Gulika, Mandi, Kaala, ...)
+        upagrahas = upagraha_engine.calculate_upagrahas(
+            d.year,
+            d.month,
+            d.day,
+            d.hour,
+            d.minute,
+            d.latitude,
+            d.longitude,
+            d.timezone,
+            d.ayanamsa,
+        )
+
         # G. AI Generation
         meta = {
             "fact_sheet": fact_sheet,
@@ -352,6 +380,7 @@ def predict_horoscope(d: BirthDetails):
             ][asc_id],
             "destiny_score": score,
             "house_structure": {},
+            "varga_divisions": list(VARGA_DIVISIONS),
         }
         ai_reading = generate_horoscope_reading(rules, meta)
 
@@ -362,9 +391,12 @@ def predict_horoscope(d: BirthDetails):
             "ai_reading": ai_reading,
             "dasha": dasha_data,
             "yogas": yogas,
+            "upagrahas": upagrahas,
             "jaimini_karakas": {},
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
 
@@ -372,18 +404,347 @@ def predict_horoscope(d: BirthDetails):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/predict/batch")
+def predict_batch(b: BirthDetailsBatch):
+    """
+    Bulk chart computation for offline jobs.
+    Returns columnar arrays (rows = charts, columns = planets) instead of per-chart dicts.
+    """
+    try:
+        res = astro_engine.calculate_charts_batch(
+            b.year,
+            b.month,
+            b.day,
+            b.hour,
+            b.minute,
+            b.latitude,
+            b.longitude,
+            b.timezone,
+            b.ayanamsa,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {
+        k: (v.tolist() if hasattr(v, "tolist") else v) for k, v in res.items()
+    }
+
+
 @app.post("/daily_forecast")
 def daily_forecast(d: BirthDetails):
-    c = astro_engine.calculate_chart(
-        d.year, d.month, d.day, d.hour, d.minute, d.latitude, d.longitude, d.timezone
-    )
+    c = get_chart(d)
     return {
         "transits": transit_engine.calculate_current_transits(
-            c, {"lat": d.latitude, "lon": d.longitude, "tz": d.timezone}
+            c, {"lat": d.latitude, "lon": d.longitude, "tz": d.timezone},
+            d.ayanamsa,
         )
     }
 
 
+@app.get("/sky")
+def current_sky(ayanamsa: str = "LAHIRI"):
+    """The shared current-sky snapshot behind /daily_forecast."""
+    sky = transit_engine.current_sky(ayanamsa)
+    return {
+        "jd": sky.jd,
+        "ayanamsa": sky.ayanamsa_mode,
+        "bucket_seconds": SKY_BUCKET_SECONDS,
+        "planets": {
+            name: {
+                "absolute_longitude": float(sky.longitude[i]),
+                "sign_id": int(sky.sign_id[i]),
+                "is_retrograde": bool(sky.is_retrograde[i]),
+                "speed": float(sky.speed[i]),
+            }
+            for i, name in enumerate(GRAHA_NAMES)
+        },
+    }
+
+
+@app.get("/sunrise")
+def sunrise_month(
+    year: int = Query(..., ge=1900, le=2100),
+    month: int = Query(..., ge=1, le=12),
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    timezone: float = Query(0.0, ge=-14, le=14),
+):
+    """
+    Local sunrise and sunset for every day of a month at one place, from a single
+    chained sweep that also warms the Upagraha sunrise cache for that location.
+    """
+    rows = upagraha_engine.sunrise_month(year, month, latitude, longitude, timezone)
+    return {
+        "days": [
+            {
+                "date": day.isoformat(),
+                "sunrise": jd_to_local_str(sunrise, timezone),
+                "sunset": jd_to_local_str(sunset, timezone),
+            }
+            for day, sunrise, sunset in rows
+        ]
+    }
+
+
+@app.post("/dasha")
+def dasha_periods(
+    d: BirthDetails,
+    depth: int = Query(2, ge=1, le=4, description="Levels returned below the starting point"),
+    path: Optional[str] = Query(None, description="Index path of a period, e.g. '3.0'"),
+    around: Optional[date] = Query(None, description="Expand only the periods containing this date"),
+    start: Optional[date] = Query(None, description="Requires `end`: periods overlapping [start, end)"),
+    end: Optional[date] = Query(None, description="Requires `start`"),
+    level: int = Query(0, ge=0, le=3, description="Level for start/end (0 = Maha ... 3 = Sookshma)"),
+    system: str = Query("VIMSHOTTARI", description="VIMSHOTTARI, YOGINI, ASHTOTTARI or CHARA"),
+    year_model: str = YEAR_MODEL_QUERY,
+):
+    """
+    On-demand Vimshottari periods: the top `depth` levels, the subtree under
+    `path`, the periods around a date, or the flat list of one level's periods
+    overlapping [start, end) - without building the full tree.
+    """
+    try:
+        node_path = tuple(int(i) for i in path.split(".")) if path else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid dasha path '{path}'")
+    if node_path:
+        depth = min(depth, 5 - len(node_path))
+    if (start is None) != (end is None):
+        raise HTTPException(status_code=422, detail="start and end must be given together")
+    if start and end <= start:
+        raise HTTPException(status_code=422, detail="end must be after start")
+    around_dt = datetime(around.year, around.month, around.day) if around else None
+
+    chart = get_chart(d)
+    birth_dt = datetime(d.year, d.month, d.day, d.hour, d.minute)
+    try:
+        if start:
+            periods = run_compute(
+                tasks.dasha_periods_between, chart, birth_dt,
+                datetime.combine(start, datetime.min.time()),
+                datetime.combine(end, datetime.min.time()), level, system, year_model,
+            )
+            return {"system": system.upper(), "periods": periods}
+        return run_compute(
+            tasks.build_dasha, chart, birth_dt, depth, node_path, around_dt, system, year_model,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/dasha/export")
+def export_dasha(
+    d: BirthDetails,
+    format: str = Query("ndjson", pattern="^(ndjson|ics)$"),
+    level: List[int] = Query([0, 1], description="Levels to include (0 = Maha ... 3 = Sookshma)"),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    system: str = Query("VIMSHOTTARI", description="VIMSHOTTARI, YOGINI, ASHTOTTARI or CHARA"),
+    year_model: str = YEAR_MODEL_QUERY,
+):
+    """
+    Streams dasha periods as NDJSON or an iCalendar (.ics) feed, filtered by
+    level and date window. Periods are generated one at a time from the
+    timeline, never as a full tree.
+    """
+    if not level or any(not 0 <= l <= 3 for l in level):
+        raise HTTPException(status_code=400, detail="level must be between 0 and 3")
+
+    chart = get_chart(d)
+    moon = chart["Moon"]
+    birth_dt = datetime(d.year, d.month, d.day, d.hour, d.minute)
+    try:
+        dasha_system = dasha_engine.get_system(system, chart)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    timeline = dasha_engine.get_timeline(
+        moon.absolute_longitude, birth_dt, moon.nakshatra_id, system=dasha_system,
+        year_model=year_model,
+    )
+    periods = timeline.walk(
+        level,
+        datetime.combine(start, datetime.min.time()) if start else None,
+        datetime.combine(end, datetime.min.time()) if end else None,
+    )
+
+    if format == "ics":
+        return StreamingResponse(
+            iter_ics(
+                periods,
+                f"{dasha_system.name.title()} Dasha",
+                ics_uid_prefix(
+                    dasha_system.name, birth_dt, d.latitude, d.longitude, d.timezone,
+                    d.ayanamsa, timeline.year_days,
+                ),
+            ),
+            media_type="text/calendar",
+            headers={"Content-Disposition": 'attachment; filename="dasha.ics"'},
+        )
+    return StreamingResponse(iter_ndjson(periods), media_type="application/x-ndjson")
+
+
+@app.post("/life-events")
+def life_events(
+    d: BirthDetails,
+    start: Optional[date] = Query(None, description="Window start (default: birth)"),
+    end: Optional[date] = Query(None, description="Window end (default: end of the dasha timeline)"),
+    level: List[int] = Query([0, 1], description="Dasha levels to include (0 = Maha ... 3 = Sookshma)"),
+    system: str = Query("VIMSHOTTARI", description="VIMSHOTTARI, YOGINI, ASHTOTTARI or CHARA"),
+    year_model: str = YEAR_MODEL_QUERY,
+):
+    """
+    One time-sorted list of dasha boundaries and Jupiter/Saturn/Rahu/Ketu sign
+    ingresses, each ingress tagged with its house from the natal lagna and Moon
+    (Sade Sati phases, Ashtama Shani, returns). Also lists the Sade Sati windows.
+    """
+    if not level or any(not 0 <= l <= 3 for l in level):
+        raise HTTPException(status_code=400, detail="level must be between 0 and 3")
+
+    chart = get_chart(d)
+    birth_dt = datetime(d.year, d.month, d.day, d.hour, d.minute)
+    start_dt = datetime.combine(start, datetime.min.time()) if start else None
+    end_dt = datetime.combine(end, datetime.min.time()) if end else None
+    if start_dt and end_dt and end_dt <= start_dt:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    try:
+        dasha_system = dasha_engine.get_system(system, chart)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return life_event_engine.life_events(
+        chart, birth_dt, d.timezone, start_dt, end_dt, level,
+        system=dasha_system, year_model=year_model, ayanamsa_mode=d.ayanamsa,
+    )
+
+
+# Without the precomputed table (setup_data.py), /transit-events computes the
+# requested window on the fly, up to this many days
+LIVE_EVENTS_MAX_DAYS = float(os.getenv("PANDIT_LIVE_EVENTS_MAX_DAYS", "3660"))
+
+
+def _events_table(ayanamsa, jd_start, jd_end, planets=None, kinds=None):
+    return TransitEventTable.for_window(transit_engine, jd_start, jd_end, ayanamsa, planets, kinds)
+
+
+def _utc_jd(day, tz=0.0):
+    jd = datetime_to_jd(datetime.combine(day, datetime.min.time())) - tz / 24.0
+    return min(max(jd, EVENTS_START_JD), EVENTS_END_JD)
+
+
+def _planet_index(planet):
+    idx = POINT_INDEX.get(planet.title())
+    if idx is None or idx >= len(GRAHA_NAMES):
+        raise HTTPException(status_code=400, detail=f"Unknown planet '{planet}'")
+    return idx
+
+
+@app.get("/transit-events")
+def transit_events(
+    start: date,
+    end: date,
+    planet: List[str] = Query([], description="Grahas to include (default: all)"),
+    kind: List[str] = Query([], description="sign, nakshatra, station_retrograde, station_direct"),
+    ayanamsa: str = "LAHIRI",
+    tz: float = Query(0.0, description="Timezone offset for the dates (UTC by default)"),
+    limit: int = Query(2000, ge=1, le=20000),
+):
+    """
+    Sign/nakshatra ingresses and stations in [start, end), from the precomputed
+    1900-2100 table, or computed for the range when it has not been built.
+    """
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    unknown = [k for k in kind if k.lower() not in EVENT_KINDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown event kind(s): {', '.join(unknown)}")
+    planets = [_planet_index(p) for p in planet] or None
+    kinds = [EVENT_KINDS.index(k.lower()) for k in kind] or None
+
+    t1, t2 = _utc_jd(start, tz), _utc_jd(end, tz)
+    if TransitEventTable.cached(ayanamsa) is None and t2 - t1 > LIVE_EVENTS_MAX_DAYS:
+        raise HTTPException(
+            status_code=503,
+            detail=f"No precomputed transit events for {ayanamsa}: request at most "
+                   f"{LIVE_EVENTS_MAX_DAYS:.0f} days or run setup_data.py",
+        )
+    rows = _events_table(ayanamsa, t1, t2, planets, kinds).between(t1, t2, planets, kinds)
+    return {"count": len(rows), "events": events_to_dicts(rows[:limit], tz)}
+
+
+@app.post("/transit-events/house")
+def transit_house_stay(
+    d: BirthDetails,
+    planet: str = Query(..., description="Transiting graha, e.g. Saturn"),
+    house: int = Query(..., ge=1, le=12),
+    reference: str = Query("lagna", pattern="^(lagna|moon)$", description="Count houses from the natal lagna or Moon"),
+    on: Optional[date] = Query(None, description="Reference date (default: today)"),
+):
+    """
+    When the graha entered / next leaves / finally leaves the sign that is
+    `house` from the natal lagna or Moon (its current or next passage).
+    """
+    p = _planet_index(planet)
+    chart = get_chart(d)
+    base = chart.ascendant.sign_id if reference == "lagna" else chart[MOON].sign_id
+    sign = (base + house - 1) % 12
+
+    jd = _utc_jd(on or date.today(), d.timezone)
+    # The current passage began less than a return period ago; the next one
+    # starts within a return period and lasts well under half of one
+    span = SIGN_RETURN_DAYS[p]
+    table = _events_table(d.ayanamsa, jd - span, jd + 1.5 * span, [p], [SIGN])
+    entered, next_exit, final_exit = table.stay(jd, p, sign)
+
+    def fmt(t):
+        return str(local_minutes([t], d.timezone)[0]) if t is not None else None
+
+    return {
+        "planet": GRAHA_NAMES[p],
+        "house": house,
+        "reference": reference,
+        "sign": SIGN_NAMES[sign],
+        "currently_in": table.sign_at(jd, p) == sign,
+        "entered": fmt(entered),
+        "next_exit": fmt(next_exit),
+        "final_exit": fmt(final_exit),
+    }
+
+
+@app.post("/transits/timeline")
+def transit_timeline(
+    d: BirthDetails,
+    start: Optional[date] = Query(None, description="Range start (default: today)"),
+    end: Optional[date] = Query(None, description="Range end (default: start + 12 months)"),
+    planet: List[str] = Query([], description="Grahas to include (default: all)"),
+):
+    """
+    Per-graha house occupancy over [start, end): one interval per sign, bounded
+    by its ingresses, with the house from the natal lagna and Moon.
+    """
+    start = start or date.today()
+    if end is None:
+        try:
+            end = start.replace(year=start.year + 1)
+        except ValueError:  # 29 Feb -> 28 Feb
+            end = start.replace(year=start.year + 1, day=28)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    planets = [_planet_index(p) for p in planet] or None
+
+    chart = get_chart(d)
+    timeline = transit_engine.transit_timeline(
+        chart, _utc_jd(start, d.timezone), _utc_jd(end, d.timezone), d.timezone,
+        ayanamsa_mode=d.ayanamsa, planets=planets,
+    )
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "lagna": SIGN_NAMES[chart.ascendant.sign_id],
+        "moon_sign": SIGN_NAMES[chart[MOON].sign_id],
+        "transits": timeline,
+    }
+
+
 class MatchRequest(BaseModel):
     p1: BirthDetails
     p2: BirthDetails
@@ -391,26 +752,8 @@ class MatchRequest(BaseModel):
 
 @app.post("/match")
 def match_charts(r: MatchRequest):
-    c1 = astro_engine.calculate_chart(
-        r.p1.year,
-        r.p1.month,
-        r.p1.day,
-        r.p1.hour,
-        r.p1.minute,
-        r.p1.latitude,
-        r.p1.longitude,
-        r.p1.timezone,
-    )
-    c2 = astro_engine.calculate_chart(
-        r.p2.year,
-        r.p2.month,
-        r.p2.day,
-        r.p2.hour,
-        r.p2.minute,
-        r.p2.latitude,
-        r.p2.longitude,
-        r.p2.timezone,
-    )
+    c1 = get_chart(r.p1)
+    c2 = get_chart(r.p2)
     analysis = match_engine.calculate_compatibility(c1, c2)
 
     # Construct a detailed prompt for the AI
@@ -450,6 +793,85 @@ def match_charts(r: MatchRequest):
     return {"analysis": analysis, "ai_verdict": verdict}
 
 
+# Candidate pools for /match/search, by name. Pools are saved to
+# $PANDIT_MATCH_POOL_DIR (default data/match_pools) as <name>.npz, so every
+# worker process sees them; each keeps the loaded arrays and reloads a pool when
+# its file changes (an upload through another worker).
+MATCH_POOL_DIR = os.getenv(
+    "PANDIT_MATCH_POOL_DIR", os.path.join(os.path.dirname(__file__), "../../data/match_pools")
+)
+match_pools = {}  # name -> (file mtime_ns, MatchPool)
+
+
+class MatchPoolUpload(BaseModel):
+    ids: List[str]
+    charts: BirthDetailsBatch
+
+
+class MatchSearchRequest(BaseModel):
+    query: BirthDetails
+    pool: str
+    top_k: int = Field(20, ge=1, le=1000)
+    min_score: float = Field(0, ge=0, le=36)
+    manglik: str = Field("any", pattern="^(any|compatible)$", description="'compatible': same Mars dosha status only")
+
+
+def _match_pool_path(name):
+    return os.path.join(MATCH_POOL_DIR, f"{os.path.basename(name)}.npz")
+
+
+def _match_pool(name):
+    path = _match_pool_path(name)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Unknown match pool '{name}'")
+    cached = match_pools.get(name)
+    if cached is None or cached[0] != mtime:
+        cached = match_pools[name] = (mtime, MatchPool.load(path))
+    return cached[1]
+
+
+@app.put("/match/pool/{name}")
+def upload_match_pool(u: MatchPoolUpload, name: str = Path(..., pattern="^[A-Za-z0-9_-]{1,64}$")):
+    """
+    Loads (or replaces) a candidate pool: charts are computed in one batch and
+    only the Moon pada, lagna and Mars dosha flag of each are kept.
+    """
+    if len(u.ids) != len(u.charts.year):
+        raise HTTPException(status_code=400, detail="ids and charts must have the same length")
+    if not u.ids:
+        raise HTTPException(status_code=400, detail="Empty pool")
+    c = u.charts
+    start = time.perf_counter()
+    batch = astro_engine.calculate_charts_batch(
+        c.year, c.month, c.day, c.hour, c.minute, c.latitude, c.longitude, c.timezone, c.ayanamsa,
+    )
+    pool = MatchPool.from_batch(u.ids, batch)
+
+    # Written beside the target and renamed over it, so a worker reading the
+    # pool meanwhile gets the old file or the new one, never half of it
+    path = _match_pool_path(name)
+    os.makedirs(MATCH_POOL_DIR, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pool.save(f)
+    os.replace(tmp, path)
+    match_pools[name] = (os.stat(path).st_mtime_ns, pool)
+    return {"pool": name, "size": len(pool), "seconds": round(time.perf_counter() - start, 3)}
+
+
+@app.post("/match/search")
+def match_search(r: MatchSearchRequest):
+    """
+    Scores one profile against a whole candidate pool with the koota tables and
+    returns the best top_k (no AI verdict).
+    """
+    pool = _match_pool(r.pool)
+    chart = get_chart(r.query)
+    return match_engine.search(chart, pool, r.top_k, r.min_score, r.manglik)
+
+
 class ChatRequest(BaseModel):
     query: str
     context: str
@@ -463,32 +885,68 @@ def chat_endpoint(r: ChatRequest):
 @app.post("/chart-image")
 def get_chart_image(style: str, d: BirthDetails):
     """
-    Generates a D1 or D9 chart image.
-    Query param: style ('d1' or 'd9')
+    Generates a D1 or divisional (D2-D60) chart image.
+    Query param: style ('d1', 'd9', 'd10', ... any of VARGA_DIVISIONS)
     Body: BirthDetails
     """
+    try:
+        division = int(style.lower().lstrip("d"))
+    except ValueError:
+        division = 1
+    if division != 1 and division not in VARGA_INDEX:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported chart style '{style}'. Use d1 or one of "
+            + ", ".join(f"d{v}" for v in VARGA_DIVISIONS),
+        )
+
     # Calculate Chart
-    chart = astro_engine.calculate_chart(
-        d.year, d.month, d.day, d.hour, d.minute, d.latitude, d.longitude, d.timezone
-    )
+    chart = get_chart(d)
 
-    if style.lower() == "d9":
-        # Prepare data for D9 (Navamsa)
-        d9_planets = {}
-        asc_id = chart["Ascendant"]["d9_sign_id"]
+    if division != 1:
+        # Prepare data for the Varga: the varga sign ID is used as 'sign_id' for plotting
+        col = VARGA_INDEX[division]
+        varga_planets = {}
+        asc_id = chart["Ascendant"]["vargas"][col]
         for p, info in chart.items():
-            # For D9, we use the D9 sign ID as the 'sign_id' for plotting
-            d9_planets[p] = {
-                "sign_id": info["d9_sign_id"],
+            varga_planets[p] = {
+                "sign_id": info["vargas"][col],
                 "is_retrograde": info.get("is_retrograde", False),
             }
-        buf = draw_north_indian_chart(d9_planets, asc_id, "D9 Navamsa")
+        title = "D9 Navamsa" if division == 9 else f"D{division}"
+        png = run_compute(tasks.render_chart_image, varga_planets, asc_id, title)
     else:
         # Prepare data for D1 (Rashi)
         asc_id = chart["Ascendant"]["sign_id"]
-        buf = draw_north_indian_chart(chart, asc_id, "D1 Rashi")
+        png = run_compute(tasks.render_chart_image, chart, asc_id, "D1 Rashi")
+
+    return Response(content=png, media_type="image/png")
+
+
+@app.get("/health")
+def health():
+    """Liveness plus which ephemeris backend is active and what startup warmup cost."""
+    return {
+        "status": "ok",
+        "ephemeris": astro_engine.warmup_info,
+        "chart_cache": chart_cache.stats() if chart_cache is not None else None,
+        "compute_pool": compute_pool.stats(),
+        "sky_cache": TransitEngine.sky_cache_stats(),
+    }
+
+
+@app.get("/pool-stats")
+def pool_stats():
+    """Compute pool queue depth, wait time and run time percentiles (ms)."""
+    return compute_pool.stats()
+
 
-    return StreamingResponse(buf, media_type="image/png")
+@app.get("/cache-stats")
+def cache_stats():
+    """Hit/miss/eviction counters and memory use of the chart cache."""
+    if chart_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **chart_cache.stats()}
 
 
 if __name__ == "__main__":
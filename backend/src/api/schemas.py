@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError, model_validator
 from typing import Dict, Any, Optional, List, Union
 
 
@@ -15,8 +15,43 @@ class BirthDetails(BaseModel):
     )
     latitude: float = Field(..., example=28.61)
     longitude: float = Field(..., example=77.20)
+    ayanamsa: str = Field(
+        "LAHIRI",
+        description="Sidereal mode: LAHIRI, RAMAN, KP (KRISHNAMURTI) or YUKTESHWAR",
+    )
+
+
+BATCH_COLUMNS = ("year", "month", "day", "hour", "minute", "timezone", "latitude", "longitude")
+
+
+class BirthDetailsBatch(BaseModel):
+    """Columnar birth data for bulk chart computation (one list entry per chart)."""
+
+    year: List[int]
+    month: List[int]
+    day: List[int]
+    hour: List[int]
+    minute: List[int]
+    timezone: List[float]
+    latitude: List[float]
+    longitude: List[float]
     ayanamsa: str = Field("LAHIRI")
 
+    @model_validator(mode="after")
+    def check_rows(self):
+        n = len(self.year)
+        for name in BATCH_COLUMNS[1:]:
+            if len(getattr(self, name)) != n:
+                raise ValueError(f"'{name}' has {len(getattr(self, name))} entries, expected {n}")
+        # Every row must pass the same checks as a single BirthDetails request
+        for i, row in enumerate(zip(*(getattr(self, name) for name in BATCH_COLUMNS))):
+            try:
+                BirthDetails(**dict(zip(BATCH_COLUMNS, row)), ayanamsa=self.ayanamsa)
+            except ValidationError as e:
+                err = e.errors()[0]
+                raise ValueError(f"chart {i}: '{err['loc'][0]}' {err['msg']}")
+        return self
+
 
 class PlanetData(BaseModel):
     id: Optional[int] = None
@@ -26,7 +61,12 @@ class PlanetData(BaseModel):
     is_retrograde: bool = False
     navamsa_sign_id: Optional[int] = None
     d9_sign_id: Optional[int] = None
+    vargas: Optional[List[int]] = None  # sign per divisional chart, ordered as meta.varga_divisions
     house_number: Optional[int] = None
+    nakshatra_id: Optional[int] = None  # 0 = Ashwini ... 26 = Revati
+    nakshatra: Optional[str] = None
+    pada: Optional[int] = None
+    nakshatra_lord: Optional[str] = None
     speed: Optional[float] = None
 
 
@@ -38,3 +78,4 @@ class ChartResponse(BaseModel):
     ai_reading: Optional[Union[Dict[str, Any], str]] = None
     dasha: Optional[Dict[str, Any]] = None
     yogas: Optional[List[Dict[str, Any]]] = None
+    upagrahas: Optional[Dict[str, Any]] = None
@@ -0,0 +1,124 @@
+"""
+CPU-heavy work units executed by the compute pool (see compute_pool.py).
+Everything here is a module-level function with picklable arguments/results so it
+can run in a worker process; each worker builds its engines once in init_worker().
+"""
+import io
+
+from src.astronomy.engine import VedicAstroEngine
+from src.astronomy.ephemeris_table import EphemerisTable
+from src.astronomy.dasha import VimshottariDasha
+from src.astronomy.chart import MOON
+from src.utils.chart_plotter import draw_north_indian_chart
+
+_engine = None
+_dasha_engine = None
+
+
+def init_worker():
+    """
+    Process-pool initializer: the ephemeris table, Swiss Ephemeris path and the
+    import-time ayanamsa/varga tables are loaded once per worker, not per task.
+    """
+    global _engine, _dasha_engine
+    _engine = VedicAstroEngine(ephemeris_table=EphemerisTable.load_default())
+    _engine.warmup()
+    _dasha_engine = VimshottariDasha()
+
+
+def _get_dasha_engine():
+    global _dasha_engine
+    if _dasha_engine is None:
+        _dasha_engine = VimshottariDasha()
+    return _dasha_engine
+
+
+def compute_chart(year, month, day, hour, minute, lat, lon, tz, ayanamsa_mode="LAHIRI"):
+    if _engine is None:
+        init_worker()
+    return _engine.calculate_chart(year, month, day, hour, minute, lat, lon, tz, ayanamsa_mode)
+
+
+def _date_str(value):
+    return value if isinstance(value, str) else value.strftime("%Y-%m-%d")
+
+
+def serialize_dasha_node(node):
+    obj = {
+        "lord": node["lord"],
+        "start": _date_str(node["start"]),
+        "end": _date_str(node["end"]),
+        "type": node.get("type", "Unknown"),
+    }
+    if "path" in node:
+        obj["path"] = node["path"]
+    if "sub_periods" in node and node["sub_periods"]:
+        obj["sub_periods"] = [
+            serialize_dasha_node(child) for child in node["sub_periods"]
+        ]
+    return obj
+
+
+def _dasha_timeline(chart, birth_dt, system, year_model=None):
+    dasha_engine = _get_dasha_engine()
+    moon = chart[MOON]
+    return dasha_engine.get_timeline(
+        moon.absolute_longitude, birth_dt, moon.nakshatra_id,
+        system=dasha_engine.get_system(system, chart), year_model=year_model,
+    )
+
+
+def build_dasha(chart, birth_dt, depth=2, path=None, around=None, system="VIMSHOTTARI",
+                year_model=None):
+    """
+    Dasha timeline + current periods, already serialized for the API.
+    depth: levels returned (1 = Mahadashas ... 4 = Sookshma)
+    path: only the subtree under this index path, e.g. (3, 0)
+    around: only the periods containing this date are expanded
+    system: VIMSHOTTARI, YOGINI, ASHTOTTARI or CHARA
+    year_model: GREGORIAN (default), SAVANA or SIDEREAL
+    """
+    dasha_engine = _get_dasha_engine()
+    dasha_data = {"system": system.upper(), "timeline": [], "current": {}}
+
+    timeline = _dasha_timeline(chart, birth_dt, system, year_model)
+    raw_current = dasha_engine.get_current_dasha_details(timeline)
+
+    # Dates come from one vectorized JD -> string pass (iso_dates), not per-node datetimes
+    if path:
+        node = timeline.node(path)
+        dasha_data["subtree"] = serialize_dasha_node(node.to_dict(depth, iso_dates=True))
+        del dasha_data["timeline"]
+    elif around is not None:
+        dasha_data["timeline"] = [
+            serialize_dasha_node(md) for md in timeline.around(around, depth, iso_dates=True)
+        ]
+    else:
+        dasha_data["timeline"] = [
+            serialize_dasha_node(md) for md in timeline.to_list(depth, iso_dates=True)
+        ]
+
+    if raw_current:
+        for k, v in raw_current.items():
+            dasha_data["current"][k] = {
+                "lord": v["lord"],
+                "start": _date_str(v["start"]),
+                "end": _date_str(v["end"]),
+            }
+    return dasha_data
+
+
+def dasha_periods_between(chart, birth_dt, start, end, level=0, system="VIMSHOTTARI",
+                          year_model=None):
+    """Serialized periods of one level overlapping [start, end), for calendar views."""
+    timeline = _dasha_timeline(chart, birth_dt, system, year_model)
+    return [
+        serialize_dasha_node(p.to_dict(1, iso_dates=True))
+        for p in timeline.periods_between(start, end, level)
+    ]
+
+
+def render_chart_image(planet_data, asc_sign_id, title):
+    """North Indian chart PNG as bytes."""
+    buf = draw_north_indian_chart(planet_data, asc_sign_id, title)
+    return buf.getvalue() if isinstance(buf, io.BytesIO) else buf.read()
@@ -1,4 +1,18 @@
+import threading
 import swisseph as swe
+import numpy as np
+
+# swe.set_sid_mode is shared mutable state, so it is only ever touched under this lock
+# (once per mode while building the tables, and for out-of-range dates).
+_SWE_SID_LOCK = threading.Lock()
+
+# Precomputed range and step for the ayanamsa-vs-JD tables.
+# The (mean) ayanamsa is a smooth precession curve: linear interpolation at a
+# 30 day step stays within 1e-10 degrees of swe.get_ayanamsa_ut.
+_TABLE_START_JD = swe.julday(1800, 1, 1, 0.0)
+_TABLE_END_JD = swe.julday(2200, 1, 1, 0.0)
+_TABLE_STEP = 30.0
+
 
 class AyanamsaSystem:
     # Mapping string names to Swiss Ephemeris constants
@@ -9,13 +23,58 @@ class AyanamsaSystem:
         "YUKTESHWAR": swe.SIDM_YUKTESHWAR
     }
 
+    # Short names accepted from the API
+    ALIASES = {
+        "KP": "KRISHNAMURTI",
+    }
+
+    TABLE_JD = np.arange(_TABLE_START_JD, _TABLE_END_JD + _TABLE_STEP, _TABLE_STEP)
+    TABLES = {}
+
+    @staticmethod
+    def normalize(mode_name="LAHIRI"):
+        """
+        Returns the canonical mode name. Unknown modes fall back to LAHIRI.
+        """
+        name = (mode_name or "LAHIRI").upper()
+        name = AyanamsaSystem.ALIASES.get(name, name)
+        return name if name in AyanamsaSystem.MODES else "LAHIRI"
+
+    @staticmethod
+    def _compute_direct(jd, mode):
+        with _SWE_SID_LOCK:
+            # set_sid_mode(mode, t0, ayan_t0) - t0/ayan_t0 are usually 0 for standard predefined modes
+            swe.set_sid_mode(mode, 0, 0)
+            return swe.get_ayanamsa_ut(jd)
+
     @staticmethod
-    def set_mode(mode_name="LAHIRI"):
+    def get_ayanamsa(jd, mode_name="LAHIRI"):
         """
-        Sets the global Sidereal mode for swisseph.
+        Sidereal offset (degrees) for one JD (UT) or an array of JDs.
+        Reads an immutable per-mode table, so it is safe to call from any thread
+        and never changes the global swisseph sidereal mode.
         """
-        mode = AyanamsaSystem.MODES.get(mode_name.upper(), swe.SIDM_LAHIRI)
-        
-        # set_sid_mode(mode, t0, ayan_t0) - t0/ayan_t0 are usually 0 for standard predefined modes
-        swe.set_sid_mode(mode, 0, 0)
-        return mode_name
\ No newline at end of file
+        name = AyanamsaSystem.normalize(mode_name)
+        table = AyanamsaSystem.TABLES[name]
+
+        jd_arr = np.asarray(jd, dtype=np.float64)
+        grid = AyanamsaSystem.TABLE_JD
+        if jd_arr.size and (jd_arr.min() < grid[0] or jd_arr.max() > grid[-1]):
+            mode = AyanamsaSystem.MODES[name]
+            direct = np.vectorize(lambda t: AyanamsaSystem._compute_direct(t, mode))(jd_arr)
+            return float(direct) if direct.ndim == 0 else direct
+
+        value = np.interp(jd_arr, grid, table)
+        return float(value) if value.ndim == 0 else value
+
+
+def _build_tables():
+    for name, mode in AyanamsaSystem.MODES.items():
+        values = np.array([
+            AyanamsaSystem._compute_direct(t, mode) for t in AyanamsaSystem.TABLE_JD
+        ])
+        values.setflags(write=False)
+        AyanamsaSystem.TABLES[name] = values
+
+
+_build_tables()
@@ -0,0 +1,126 @@
+from collections.abc import Mapping
+
+# Fixed planet order used everywhere a chart is indexed by position.
+GRAHA_NAMES = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]
+CHART_POINTS = GRAHA_NAMES + ["Ascendant"]
+POINT_INDEX = {name: i for i, name in enumerate(CHART_POINTS)}
+
+# Planet "enum" for direct indexing: chart[MOON], chart.records[SATURN]
+SUN, MOON, MARS, MERCURY, JUPITER, VENUS, SATURN, RAHU, KETU, ASCENDANT = range(len(CHART_POINTS))
+
+
+class PlanetRecord(Mapping):
+    """
+    One row of a chart. Hot paths read the slots directly (rec.sign_id);
+    the read-only Mapping interface (rec["sign_id"]) is a zero-copy view for
+    JSON serialization and older callers. Fields that are None (e.g. speed
+    and house_number of the Ascendant) are not exposed as keys.
+    """
+
+    FIELDS = (
+        "sign_id", "degree", "is_retrograde", "absolute_longitude", "speed",
+        "house_number", "d9_sign_id", "vargas",
+        "nakshatra_id", "nakshatra", "pada", "nakshatra_lord",
+    )
+    __slots__ = ("name",) + FIELDS
+
+    # __init__ argument order (also used to pickle records for the compute pool)
+    _ARGS = ("name", "sign_id", "degree", "absolute_longitude", "is_retrograde", "speed",
+             "house_number", "d9_sign_id", "vargas",
+             "nakshatra_id", "nakshatra", "pada", "nakshatra_lord")
+
+    def __init__(self, name, sign_id, degree, absolute_longitude, is_retrograde=None, speed=None,
+                 house_number=None, d9_sign_id=None, vargas=None,
+                 nakshatra_id=None, nakshatra=None, pada=None, nakshatra_lord=None):
+        # Records are shared by the chart cache: attributes are set once, here
+        _set = object.__setattr__
+        _set(self, "name", name)
+        _set(self, "sign_id", sign_id)
+        _set(self, "degree", degree)
+        _set(self, "absolute_longitude", absolute_longitude)
+        _set(self, "is_retrograde", is_retrograde)
+        _set(self, "speed", speed)
+        _set(self, "house_number", house_number)
+        _set(self, "d9_sign_id", d9_sign_id)
+        _set(self, "vargas", vargas)
+        _set(self, "nakshatra_id", nakshatra_id)
+        _set(self, "nakshatra", nakshatra)
+        _set(self, "pada", pada)
+        _set(self, "nakshatra_lord", nakshatra_lord)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"PlanetRecord is read-only (cannot set '{key}')")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"PlanetRecord is read-only (cannot delete '{key}')")
+
+    def __reduce__(self):
+        return PlanetRecord, tuple(getattr(self, attr) for attr in PlanetRecord._ARGS)
+
+    def __getitem__(self, key):
+        if key in PlanetRecord.FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+
+    def __iter__(self):
+        return (f for f in PlanetRecord.FIELDS if getattr(self, f) is not None)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"PlanetRecord({self.name}, sign={self.sign_id}, deg={self.degree:.2f})"
+
+
+class Chart(Mapping):
+    """
+    Compact, read-only chart: a fixed-order tuple of PlanetRecords indexed by
+    the planet constants above (Sun..Ketu, Ascendant).
+    Also a Mapping of planet name -> record, so chart["Moon"]["sign_id"] and
+    JSON encoding keep working without building nested dicts.
+    """
+
+    __slots__ = ("records",)
+
+    def __init__(self, records):
+        object.__setattr__(self, "records", tuple(records))
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"Chart is read-only (cannot set '{key}')")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"Chart is read-only (cannot delete '{key}')")
+
+    def __reduce__(self):
+        return Chart, (self.records,)
+
+    @property
+    def ascendant(self):
+        return self.records[ASCENDANT]
+
+    @property
+    def grahas(self):
+        return self.records[:ASCENDANT]
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self.records[key]
+        return self.records[POINT_INDEX[key]]
+
+    def __iter__(self):
+        return iter(CHART_POINTS)
+
+    def __len__(self):
+        return len(CHART_POINTS)
+
+    def __contains__(self, key):
+        return key in POINT_INDEX
+
+    def to_dict(self):
+        """Plain nested dicts (a copy), for callers that need to mutate."""
+        return {rec.name: dict(rec) for rec in self.records}
+
+    def __repr__(self):
+        return f"Chart(asc={self.ascendant.sign_id}, {len(self.records)} points)"
@@ -0,0 +1,96 @@
+import sys
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+from .chart import Chart
+
+
+def freeze_chart(chart):
+    """
+    Read-only view of a chart. Compact Charts are already immutable (a tuple
+    of records whose attributes cannot be set); plain dicts are wrapped
+    (each planet dict inside too).
+    Callers that need to add fields must copy first (Chart.to_dict()).
+    """
+    if isinstance(chart, Chart):
+        return chart
+    return MappingProxyType({p: MappingProxyType(dict(data)) for p, data in chart.items()})
+
+
+def _estimate_size(chart):
+    size = sys.getsizeof(chart)
+    for p, data in chart.items():
+        size += sys.getsizeof(p) + sys.getsizeof(data)
+        for k, v in data.items():
+            size += sys.getsizeof(k) + sys.getsizeof(v)
+    return size
+
+
+class ChartCache:
+    """
+    Bounded, thread-safe LRU cache of computed charts.
+    Keyed on normalized birth inputs; evicts least recently used entries
+    once the estimated memory footprint exceeds max_bytes.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (frozen chart, size)
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(jd, lat, lon, ayanamsa_mode):
+        # JD rounded to the minute; coordinates to ~10 m
+        return (round(jd * 1440), round(lat, 4), round(lon, 4), ayanamsa_mode)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, chart):
+        """Stores a chart and returns the frozen (shared) version of it."""
+        frozen = freeze_chart(chart)
+        size = _estimate_size(chart)
+        if size > self.max_bytes:
+            return frozen
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (frozen, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+        return frozen
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -1,184 +1,382 @@
+import numpy as np
 from datetime import datetime, timedelta
+from .nakshatras import NAKSHATRA_LORDS
+from .dasha_systems import (
+    MAX_DEPTH, LIFESPAN_YEARS, VIMSHOTTARI, SYSTEMS, CHART_SYSTEMS, year_days,
+)
 
-class VimshottariDasha:
-    def __init__(self):
-        # 1. Standard Dasha Durations (Years)
-        self.DASHA_YEARS = {
-            "Ketu": 7, "Venus": 20, "Sun": 6, "Moon": 10, "Mars": 7,
-            "Rahu": 18, "Jupiter": 16, "Saturn": 19, "Mercury": 17
+# Level 0 = Mahadasha ... Level 3 = Sookshma
+LEVEL_NAMES = ["Mahadasha", "Antardasha", "Pratyantardasha", "Sookshmadasha"]
+LEVEL_KEYS = ["mahadasha", "antardasha", "pratyantardasha", "sookshmadasha"]
+
+
+# Julian Day of datetime.min's ordinal 0 (JD 1721424.5 = 0001-01-01 00:00 minus one day)
+_JD_ORDINAL_EPOCH = 1721424.5
+
+
+def datetime_to_jd(dt):
+    """Calendar datetime -> float Julian Day (same clock as the input, no timezone shift)."""
+    seconds = dt.hour * 3600 + dt.minute * 60 + dt.second + dt.microsecond / 1e6
+    return dt.toordinal() + _JD_ORDINAL_EPOCH + seconds / 86400.0
+
+
+def jd_to_datetime(jd):
+    """Inverse of datetime_to_jd, to the nearest second (float JD carries ~40 us of noise)."""
+    jd = float(jd)
+    ordinal = int(jd - _JD_ORDINAL_EPOCH)
+    seconds = round((jd - _JD_ORDINAL_EPOCH - ordinal) * 86400.0)
+    return datetime.fromordinal(ordinal) + timedelta(seconds=seconds)
+
+
+# JD 2440587.5 = 1970-01-01 00:00, the datetime64 epoch
+_JD_UNIX_EPOCH = 2440587.5
+
+
+def jd_to_datetime64(jd):
+    """Vectorized jd_to_datetime: float JD array -> datetime64[s] array."""
+    seconds = np.rint((np.asarray(jd, dtype=np.float64) - _JD_UNIX_EPOCH) * 86400.0)
+    return seconds.astype("int64").astype("datetime64[s]")
+
+
+class DashaPeriod:
+    """
+    One node of the dasha tree, addressed by its index path from the Mahadasha
+    list: (3,) is the 4th Mahadasha, (3, 0, 5) the 6th Pratyantar in its 1st Antar.
+    Boundaries are read from the timeline's boundary array; children are only
+    built when asked for.
+    """
+
+    __slots__ = ("timeline", "path", "lord", "lo", "hi", "start_jd", "end_jd")
+
+    def __init__(self, timeline, path, lord, lo, hi):
+        self.timeline = timeline
+        self.path = path
+        self.lord = lord
+        self.lo, self.hi = lo, hi  # leaf boundary indices
+        self.start_jd = float(timeline.boundaries[lo])
+        self.end_jd = float(timeline.boundaries[hi])
+
+    @property
+    def start(self):
+        return jd_to_datetime(self.start_jd)
+
+    @property
+    def end(self):
+        return jd_to_datetime(self.end_jd)
+
+    @property
+    def duration(self):
+        """Length in dasha years."""
+        return (self.end_jd - self.start_jd) / self.timeline.year_days
+
+    @property
+    def level(self):
+        return len(self.path) - 1
+
+    @property
+    def type(self):
+        if self.level == 0 and self.path[0] == 0 and self.timeline.system.has_balance:
+            return "Mahadasha (Balance)"
+        return LEVEL_NAMES[self.level]
+
+    @property
+    def lineage(self):
+        """Lords from the Mahadasha down to this period."""
+        return [self.timeline._lord(self.path[:k]) for k in range(1, len(self.path) + 1)]
+
+    def children(self):
+        return self.timeline.children(self.path)
+
+    def contains(self, target_date):
+        return self.start_jd <= datetime_to_jd(target_date) < self.end_jd
+
+    def to_dict(self, depth=1, iso_dates=False):
+        """
+        Plain dict of this period; `depth` counts this level, so depth=2 adds one
+        level of sub_periods and depth=1 none.
+        iso_dates: start/end as "YYYY-MM-DD" strings read from the timeline's
+        vectorized date table instead of datetime objects.
+        """
+        if iso_dates:
+            dates = self.timeline.date_strings
+            start, end = dates[self.lo], dates[self.hi]
+        else:
+            start, end = self.start, self.end
+        node = {
+            "lord": self.lord,
+            "start": start,
+            "end": end,
+            "duration": self.duration,
+            "type": self.type,
+            "path": list(self.path),
         }
-        
-        # 2. Fixed Zodiac Sequence
-        self.DASHA_ORDER = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"]
-        
-        # 3. Nakshatra Mapping (1 to 27)
-        self.NAKSHATRA_RULERS = [
-            "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury", # 1-9
-            "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury", # 10-18
-            "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"  # 19-27
-        ]
+        if depth > 1:
+            children = self.children()
+            if children:
+                node["sub_periods"] = [c.to_dict(depth - 1, iso_dates) for c in children]
+        return node
+
+    def __repr__(self):
+        return f"DashaPeriod({self.lord}, {self.path}, {self.start:%Y-%m-%d} -> {self.end:%Y-%m-%d})"
+
+
+class DashaTimeline:
+    """
+    Dasha timeline for one birth as ONE sorted array of Sookshma (leaf)
+    boundaries in float JD: the system's shared template for the starting lord
+    (see DashaSystem.template), scaled to days and shifted to this birth.
+    Any period at any level is a slice of it. With n lords per cycle:
+
+        leaf i*n**3 + a*n**2 + b*n + c    Sookshma c of Pratyantar b of Antar a of Maha i
+
+    The first (balance) Mahadasha is laid out from its virtual full-cycle start
+    (birth minus the portion already elapsed) like any other, then every
+    boundary is clipped at birth: periods that ended before birth have zero
+    length and are skipped in tree views.
+    The current period at all 4 levels is one binary search.
+    """
+
+    def __init__(self, system, birth_date, start_idx, elapsed_fraction, year_days):
+        self.system = system
+        self.birth_date = birth_date
+        self.birth_jd = datetime_to_jd(birth_date)
+        self.year_days = year_days
+        n = system.n
+        self.leaves_per_md = n ** (MAX_DEPTH - 1)
+
+        # 1. Mahadashas: the birth lord's full period (virtual start), then enough
+        # further periods to cover a full cycle and at least LIFESPAN_YEARS after birth
+        template = system.template(start_idx)
+        elapsed_years = system.years[start_idx] * elapsed_fraction
+        md_offsets = template[::self.leaves_per_md]
+        count = max(n + 1, int(np.searchsorted(md_offsets - elapsed_years, LIFESPAN_YEARS)))
+
+        self.md_index = [(start_idx + i) % n for i in range(count)]
+        self.md_lords = [system.lords[i] for i in self.md_index]
+        self.start_lord = self.md_lords[0]
+        self.balance_years = float(system.years[start_idx] - elapsed_years)
+
+        # 2. Scale + shift the shared template, then clip at birth
+        # (the balance period starts at birth)
+        cycle_start = self.birth_jd - elapsed_years * year_days
+        self.boundaries = cycle_start + template[:count * self.leaves_per_md + 1] * year_days
+        np.maximum(self.boundaries, self.birth_jd, out=self.boundaries)
+        self._date_strings = None
+
+    def _leaf_range(self, path):
+        """[first leaf, end leaf) covered by the period at `path`."""
+        lo = path[0] * self.leaves_per_md
+        span = self.leaves_per_md
+        for j in path[1:]:
+            span //= self.system.n
+            lo += j * span
+        return lo, lo + span
+
+    def _lord(self, path):
+        n = self.system.n
+        lord = self.md_index[path[0]]
+        for j in path[1:]:
+            lord = (lord + j) % n
+        return self.system.lords[lord]
+
+    @property
+    def date_strings(self):
+        """Every boundary as "YYYY-MM-DD", converted in one vectorized pass on first use."""
+        if self._date_strings is None:
+            days = np.datetime_as_string(jd_to_datetime64(self.boundaries), unit="D")
+            self._date_strings = days.tolist()
+        return self._date_strings
+
+    def _make(self, path):
+        lo, hi = self._leaf_range(path)
+        return DashaPeriod(self, path, self._lord(path), lo, hi)
+
+    def _leaf_path(self, leaf):
+        # base-n digits below the Mahadasha
+        n = self.system.n
+        return (leaf // n ** 3, (leaf // n ** 2) % n, (leaf // n) % n, leaf % n)
+
+    def node(self, path):
+        path = tuple(path)
+        if not 1 <= len(path) <= MAX_DEPTH:
+            raise ValueError(f"Dasha path must have 1-{MAX_DEPTH} indices")
+        if not 0 <= path[0] < len(self.md_lords) or any(not 0 <= j < self.system.n for j in path[1:]):
+            raise ValueError(f"Dasha path {list(path)} is out of range")
+        period = self._make(path)
+        if period.end_jd <= self.birth_jd:
+            raise ValueError(f"Dasha path {list(path)} ended before birth")
+        return period
+
+    def mahadashas(self):
+        return [self._make((i,)) for i in range(len(self.md_lords))]
+
+    def children(self, path):
+        path = tuple(path)
+        if len(path) >= MAX_DEPTH:
+            return []
+        kids = [self._make(path + (j,)) for j in range(self.system.n)]
+        # Inside the balance period, sub-periods that ended before birth are skipped
+        return [k for k in kids if k.end_jd > self.birth_jd]
+
+    def find(self, target_date):
+        """
+        Chain of periods (Maha first) containing target_date; empty outside the timeline.
+        One bisect over the leaf boundaries, then index arithmetic for the ancestors.
+        """
+        leaf = int(np.searchsorted(self.boundaries, datetime_to_jd(target_date), side="right")) - 1
+        if leaf < 0 or leaf >= len(self.boundaries) - 1:
+            return []
+        path = self._leaf_path(leaf)
+        return [self._make(path[:k]) for k in range(1, len(path) + 1)]
+
+    def periods_between(self, start_date, end_date, level=0):
+        """
+        Periods of one level (0 = Maha ... 3 = Sookshma) overlapping [start_date, end_date),
+        in time order, without building the tree.
+        """
+        step = self.system.n ** (MAX_DEPTH - 1 - level)
+        starts = np.arange(0, len(self.boundaries) - 1, step)
+        ends = starts + step
+
+        # Zero-length (pre-birth) periods end at birth, so they never pass the first cut
+        t1, t2 = datetime_to_jd(start_date), datetime_to_jd(end_date)
+        if t1 <= self.birth_jd:
+            t1 = np.nextafter(self.birth_jd, np.inf)
+        first = int(np.searchsorted(self.boundaries[ends], t1, side="right"))
+        last = int(np.searchsorted(self.boundaries[starts], t2, side="left"))
+        return [self._make(self._leaf_path(int(leaf))[:level + 1]) for leaf in starts[first:last]]
+
+    def walk(self, levels=(0,), start_date=None, end_date=None):
+        """
+        Generator over the periods of the selected levels (0 = Maha ... 3 = Sookshma)
+        overlapping [start_date, end_date), in time order with parents before their
+        sub-periods. Subtrees outside the window are never expanded and nothing is
+        kept once yielded, so memory stays at one branch of the tree.
+        """
+        levels = set(levels)
+        deepest = max(levels)
+        t1 = datetime_to_jd(start_date) if start_date else -np.inf
+        t2 = datetime_to_jd(end_date) if end_date else np.inf
+        t1 = max(t1, self.birth_jd)
+
+        stack = self.mahadashas()[::-1]
+        while stack:
+            period = stack.pop()
+            if period.end_jd <= t1 or period.start_jd >= t2:
+                continue
+            if period.level in levels:
+                yield period
+            if period.level < deepest:
+                stack.extend(period.children()[::-1])
+
+    def to_list(self, depth=MAX_DEPTH, iso_dates=False):
+        """Mahadasha list as dicts, expanded `depth` levels deep."""
+        return [md.to_dict(depth, iso_dates) for md in self.mahadashas()]
+
+    def around(self, target_date, depth=MAX_DEPTH, iso_dates=False):
+        """
+        Mahadasha list where only the periods containing target_date are expanded
+        (down to `depth` levels), i.e. the path to the date plus its siblings.
+        """
+        chain = {p.path for p in self.find(target_date)}
+
+        def expand(period):
+            node = period.to_dict(1, iso_dates)
+            if period.path in chain and period.level + 1 < depth:
+                kids = period.children()
+                if kids:
+                    node["sub_periods"] = [expand(c) for c in kids]
+            return node
+
+        return [expand(md) for md in self.mahadashas()]
+
+
+class DashaEngine:
+    """
+    Table-driven dasha engine: one DashaSystem (see dasha_systems.py) plus the
+    year length used to turn dasha years into calendar time
+    (year_model: GREGORIAN 365.2425, SAVANA 360 or SIDEREAL 365.2564 days).
+    """
+
+    def __init__(self, system=VIMSHOTTARI, year_model="GREGORIAN"):
+        self.system = system
+        self.YEAR_DAYS = year_days(year_model)
+
+    @staticmethod
+    def get_system(name="VIMSHOTTARI", chart=None):
+        """System by name; chart-dependent systems (CHARA) need the natal chart."""
+        key = (name or "VIMSHOTTARI").upper()
+        if key in SYSTEMS:
+            return SYSTEMS[key]
+        if key in CHART_SYSTEMS:
+            if chart is None:
+                raise ValueError(f"{key} dasha needs the natal chart")
+            return CHART_SYSTEMS[key](chart)
+        raise ValueError(
+            f"Unknown dasha system '{name}'. Use one of: " + ", ".join([*SYSTEMS, *CHART_SYSTEMS])
+        )
 
     def add_time(self, start_date, years):
         """
         Precise date addition converting astrological years to calendar time.
-        1 Astro Year = 365.2425 Days (Gregorian Average)
         """
-        total_days = years * 365.2425
+        total_days = years * self.YEAR_DAYS
         return start_date + timedelta(days=total_days)
 
-    def generate_sub_periods(self, start_date, parent_lord, parent_duration_years, level_depth):
-        """
-        Recursive function to generate nested Dasha tree.
-        level_depth: 1=Antar, 2=Pratyantar, 3=Sookshma
-        """
-        # STOP CONDITION: We only want up to Sookshma (Level 3)
-        # Level 0 = Mahadasha (Handled in main loop)
-        # Level 1 = Antar
-        # Level 2 = Pratyantar
-        # Level 3 = Sookshma
-        if level_depth > 3:
-            return None
-
-        sub_periods = []
-        current_date = start_date
-        
-        # Sub-periods always start with the Lord of the Parent Period
-        start_idx = self.DASHA_ORDER.index(parent_lord)
-        
-        for i in range(9):
-            idx = (start_idx + i) % 9
-            planet_name = self.DASHA_ORDER[idx]
-            planet_years = self.DASHA_YEARS[planet_name]
-            
-            # KEY FORMULA: (ParentDuration * PlanetYears) / 120
-            # Example: In Sun Mahadasha (6 yrs), Sun Antar = (6 * 6) / 120 = 0.3 years
-            duration_in_this_level = (parent_duration_years * planet_years) / 120.0
-            
-            end_date = self.add_time(current_date, duration_in_this_level)
-            
-            node = {
-                "lord": planet_name,
-                "start": current_date,
-                "end": end_date,
-                "duration": duration_in_this_level,
-                "type": ["Mahadasha", "Antardasha", "Pratyantardasha", "Sookshmadasha"][level_depth]
-            }
-            
-            # RECURSIVE CALL: Generate children for this node
-            # (e.g., inside this Antardasha, generate Pratyantars)
-            children = self.generate_sub_periods(current_date, planet_name, duration_in_this_level, level_depth + 1)
-            if children:
-                node["sub_periods"] = children
-                
-            sub_periods.append(node)
-            current_date = end_date
-            
-        return sub_periods
-
-    def calculate_dashas(self, moon_long, birth_date):
-        """
-        Generates the full life timeline tree.
-        """
-        # 1. FIND STARTING POINT
-        nakshatra_span = 360.0 / 27.0
-        nakshatra_idx = int(moon_long / nakshatra_span)
-        degree_in_nak = moon_long % nakshatra_span
-        
-        percent_passed = degree_in_nak / nakshatra_span
-        percent_remaining = 1.0 - percent_passed
-        
-        start_lord = self.NAKSHATRA_RULERS[nakshatra_idx]
-        full_years = self.DASHA_YEARS[start_lord]
-        balance_years = full_years * percent_remaining
-        
-        timeline = []
-        current_date = birth_date
-        
-        # 2. FIRST MAHADASHA (The Balance Period)
-        # Note: Calculating accurate sub-periods for the balance period is mathematically complex 
-        # because we are starting in the *middle* of a cycle. 
-        # For V1.0 Simplicity: We calculate the end date, but we don't generate the 
-        # retrospective sub-periods for the past. We generate sub-periods moving forward if possible.
-        
-        end_date = self.add_time(current_date, balance_years)
-        
-        # We skip recursion for the balance dasha in V1 to avoid "negative time" logic complexity
-        # or we treat it as a partial block. Let's add it as a flat block for safety.
-        timeline.append({
-            "lord": start_lord,
-            "start": current_date,
-            "end": end_date,
-            "duration": balance_years,
-            "type": "Mahadasha (Balance)",
-            "sub_periods": [] # Empty for balance to prevent errors
-        })
-        current_date = end_date
-        
-        # 3. GENERATE FULL CYCLES FOR REMAINING PLANETS
-        start_idx = self.DASHA_ORDER.index(start_lord)
-        
-        # Generate next 9 Mahadashas (covering 120 years of life)
-        for i in range(1, 10):
-            idx = (start_idx + i) % 9
-            lord = self.DASHA_ORDER[idx]
-            duration = self.DASHA_YEARS[lord]
-            
-            md_end = self.add_time(current_date, duration)
-            
-            md_node = {
-                "lord": lord,
-                "start": current_date,
-                "end": md_end,
-                "duration": duration,
-                "type": "Mahadasha"
-            }
-            
-            # GENERATE TREE (Antar -> Pratyantar -> Sookshma)
-            # Level 1 call (Antardasha)
-            md_node["sub_periods"] = self.generate_sub_periods(current_date, lord, duration, 1)
-            
-            timeline.append(md_node)
-            current_date = md_end
-            
-        return timeline
+    def get_timeline(self, moon_long, birth_date, nakshatra_idx=None, system=None, year_model=None):
+        """
+        Lazy timeline (see DashaTimeline): nothing below the Mahadashas is built
+        until requested.
+        nakshatra_idx: the Moon's nakshatra_id from the chart (derived from moon_long if omitted).
+        system: a DashaSystem overriding the engine's own.
+        year_model: a year length overriding the engine's own.
+        """
+        system = system or self.system
+        days = year_days(year_model) if year_model else self.YEAR_DAYS
+        start_idx, elapsed = system.starting_point(moon_long, nakshatra_idx)
+        return DashaTimeline(system, birth_date, start_idx, elapsed, days)
+
+    def calculate_dashas(self, moon_long, birth_date, nakshatra_idx=None, depth=MAX_DEPTH):
+        """
+        Generates the life timeline tree as nested dicts, `depth` levels deep
+        (1 = Mahadashas only, 4 = down to Sookshma).
+        """
+        return self.get_timeline(moon_long, birth_date, nakshatra_idx).to_list(depth)
 
     def get_current_dasha_details(self, timeline, target_date=None):
         """
         Navigates the tree to find exactly where we are NOW.
+        Accepts a DashaTimeline (one binary search) or the nested list from calculate_dashas.
         """
         if target_date is None: target_date = datetime.now()
-        
+
+        if isinstance(timeline, DashaTimeline):
+            chain = timeline.find(target_date)
+            if not chain: return None
+            return {LEVEL_KEYS[p.level]: p.to_dict(1) for p in chain}
+
         result = {}
-        
-        # 1. Find Maha
-        curr_md = None
-        for md in timeline:
-            if md['start'] <= target_date < md['end']:
-                curr_md = md
+        periods = timeline
+        for key in LEVEL_KEYS:
+            hit = next((p for p in periods or [] if p['start'] <= target_date < p['end']), None)
+            if hit is None:
                 break
-        
-        if not curr_md: return None
-        result['mahadasha'] = curr_md
-        
-        # 2. Find Antar
-        if 'sub_periods' in curr_md and curr_md['sub_periods']:
-            for ad in curr_md['sub_periods']:
-                if ad['start'] <= target_date < ad['end']:
-                    result['antardasha'] = ad
-                    
-                    # 3. Find Pratyantar
-                    if 'sub_periods' in ad and ad['sub_periods']:
-                        for pd in ad['sub_periods']:
-                            if pd['start'] <= target_date < pd['end']:
-                                result['pratyantardasha'] = pd
-                                
-                                # 4. Find Sookshma
-                                if 'sub_periods' in pd and pd['sub_periods']:
-                                    for sd in pd['sub_periods']:
-                                        if sd['start'] <= target_date < sd['end']:
-                                            result['sookshmadasha'] = sd
-                                            break
-                                break
-                    break
-                    
-        return result
\ No newline at end of file
+            result[key] = hit
+            periods = hit.get('sub_periods')
+
+        return result or None
+
+
+class VimshottariDasha(DashaEngine):
+    def __init__(self):
+        super().__init__(VIMSHOTTARI)
+
+        # 1. Standard Dasha Durations (Years)
+        self.DASHA_YEARS = dict(zip(VIMSHOTTARI.lords, VIMSHOTTARI.years.astype(int).tolist()))
+
+        # 2. Fixed Zodiac Sequence
+        self.DASHA_ORDER = list(VIMSHOTTARI.lords)
+        self.ORDER_INDEX = dict(VIMSHOTTARI.index)
+
+        # 3. Nakshatra Mapping (1 to 27), shared with the chart engine
+        self.NAKSHATRA_RULERS = NAKSHATRA_LORDS
@@ -0,0 +1,241 @@
+import numpy as np
+
+from .nakshatras import NAKSHATRA_SPAN, NAKSHATRA_LORDS
+from .chart import POINT_INDEX, ASCENDANT
+
+# Every system is expanded to the same 4 levels (Maha, Antar, Pratyantar, Sookshma)
+MAX_DEPTH = 4
+
+# Timelines run at least this many years past birth (short cycles such as Yogini repeat)
+LIFESPAN_YEARS = 120
+
+# Days per dasha year
+YEAR_LENGTHS = {
+    "GREGORIAN": 365.2425,   # mean calendar year (default)
+    "SAVANA": 360.0,         # savana year of 12 x 30 civil days
+    "SIDEREAL": 365.256363,  # sidereal year
+}
+
+
+def year_days(model="GREGORIAN"):
+    key = (model or "GREGORIAN").upper()
+    if key not in YEAR_LENGTHS:
+        raise ValueError(f"Unknown year model '{model}'. Use one of: " + ", ".join(YEAR_LENGTHS))
+    return YEAR_LENGTHS[key]
+
+
+SIGN_NAMES = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+              "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
+
+
+class DashaSystem:
+    """
+    Table definition of a dasha system:
+      lords           period lords in cycle order
+      years           Mahadasha length of each lord (same order)
+      start_rule      (moon_long, nakshatra_idx) -> (index of the first lord, fraction
+                      of its Mahadasha already elapsed at birth)
+      equal_sub_periods
+                      sub-periods are equal parts of the parent instead of
+                      proportional to the lords' years
+      has_balance     the first Mahadasha is the balance left at birth of a
+                      nakshatra-based period (False when the dasha starts at birth)
+
+    Sub-periods always run in cycle order starting from the parent's lord, so the
+    normalized Sookshma boundaries of a period only depend on its lord. They are
+    tabulated once per system in LEAF_CUMULATIVE[lord] (n**3 + 1 fractions, 0.0 .. 1.0).
+
+    Likewise a whole timeline only depends on the starting lord: template(start)
+    holds every Sookshma boundary, in years from the start of the first
+    Mahadasha, for max_mahadashas periods. A person's timeline is that array
+    scaled to days and shifted to their virtual cycle start.
+    """
+
+    def __init__(self, name, lords, years, start_rule=None, equal_sub_periods=False, has_balance=True):
+        self.name = name
+        self.lords = list(lords)
+        self.years = np.asarray(years, dtype=np.float64)
+        self.n = len(self.lords)
+        self.index = {lord: i for i, lord in enumerate(self.lords)}
+        self.cycle_years = float(self.years.sum())
+        self.start_rule = start_rule
+        self.equal_sub_periods = equal_sub_periods
+        self.has_balance = has_balance
+
+        # 1. Share of the parent taken by each sub-period lord
+        if equal_sub_periods:
+            shares = np.full(self.n, 1.0 / self.n)
+        else:
+            shares = self.years / self.cycle_years
+        rotations = (np.arange(self.n)[:, None] + np.arange(self.n)[None, :]) % self.n  # [p, j] -> lord
+
+        def leaf_shares(p, depth):
+            if depth == 0:
+                return np.ones(1)
+            return np.concatenate([shares[c] * leaf_shares(c, depth - 1) for c in rotations[p]])
+
+        # 2. Cumulative Sookshma fractions per parent lord
+        self.LEAF_CUMULATIVE = np.zeros((self.n, self.n ** (MAX_DEPTH - 1) + 1))
+        for p in range(self.n):
+            np.cumsum(leaf_shares(p, MAX_DEPTH - 1), out=self.LEAF_CUMULATIVE[p, 1:])
+        self.LEAF_CUMULATIVE[:, -1] = 1.0  # exact end despite float summation
+        self.LEAF_CUMULATIVE.setflags(write=False)
+
+        self._templates = {}
+
+    @property
+    def max_mahadashas(self):
+        # Enough to cover LIFESPAN_YEARS from any point inside the first Mahadasha
+        return self.n * (int(np.ceil(LIFESPAN_YEARS / self.cycle_years)) + 1) + 1
+
+    def template(self, start):
+        """Normalized timeline (years from the first Mahadasha's start) for starting lord index `start`."""
+        cached = self._templates.get(start)
+        if cached is not None:
+            return cached
+
+        order = (start + np.arange(self.max_mahadashas)) % self.n
+        md_years = self.years[order]
+        md_start = np.concatenate(([0.0], np.cumsum(md_years)))
+        leaves = md_start[:-1, None] + md_years[:, None] * self.LEAF_CUMULATIVE[order, :-1]
+        template = np.concatenate((leaves.ravel(), md_start[-1:]))
+        template.setflags(write=False)
+        self._templates[start] = template
+        return template
+
+    def precompute_templates(self):
+        """Builds the template of every starting lord (done at import for the fixed systems)."""
+        for start in range(self.n):
+            self.template(start)
+        return self
+
+    def starting_point(self, moon_long, nakshatra_idx=None):
+        if nakshatra_idx is None:
+            nakshatra_idx = int(moon_long / NAKSHATRA_SPAN)
+        return self.start_rule(moon_long, nakshatra_idx)
+
+    def with_years(self, name, lords, years, start_rule, has_balance=True):
+        """Same sub-period structure, different Mahadasha order/lengths (chart-dependent systems)."""
+        system = DashaSystem.__new__(DashaSystem)
+        system.__dict__.update(self.__dict__)
+        system.name = name
+        system.lords = list(lords)
+        system.index = {lord: i for i, lord in enumerate(system.lords)}
+        system.years = np.asarray(years, dtype=np.float64)
+        system.cycle_years = float(system.years.sum())
+        system.start_rule = start_rule
+        system.has_balance = has_balance
+        system._templates = {}
+        return system
+
+    def __repr__(self):
+        return f"DashaSystem({self.name}, {self.n} lords, {self.cycle_years:g} years)"
+
+
+def _nakshatra_fraction(moon_long, nakshatra_idx):
+    return (moon_long - nakshatra_idx * NAKSHATRA_SPAN) / NAKSHATRA_SPAN
+
+
+# ---------- Vimshottari (120 years) ----------
+
+VIMSHOTTARI_LORDS = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"]
+VIMSHOTTARI_YEARS = [7, 20, 6, 10, 7, 18, 16, 19, 17]
+
+
+def _vimshottari_start(moon_long, nakshatra_idx):
+    # Lord of the Moon's nakshatra; the elapsed part of the nakshatra is elapsed of the dasha
+    return (VIMSHOTTARI_LORDS.index(NAKSHATRA_LORDS[nakshatra_idx]),
+            _nakshatra_fraction(moon_long, nakshatra_idx))
+
+
+# ---------- Yogini (36 years) ----------
+
+YOGINI_LORDS = ["Mangala", "Pingala", "Dhanya", "Bhramari", "Bhadrika", "Ulka", "Siddha", "Sankata"]
+YOGINI_YEARS = [1, 2, 3, 4, 5, 6, 7, 8]
+# Planet behind each Yogini: Moon, Sun, Jupiter, Mars, Mercury, Saturn, Venus, Rahu
+YOGINI_PLANETS = dict(zip(YOGINI_LORDS, ["Moon", "Sun", "Jupiter", "Mars", "Mercury", "Saturn", "Venus", "Rahu"]))
+
+
+def _yogini_start(moon_long, nakshatra_idx):
+    # (nakshatra number + 3) mod 8, 1 = Mangala ... 0 = Sankata
+    return (nakshatra_idx + 3) % 8, _nakshatra_fraction(moon_long, nakshatra_idx)
+
+
+# ---------- Ashtottari (108 years) ----------
+
+ASHTOTTARI_LORDS = ["Sun", "Moon", "Mars", "Mercury", "Saturn", "Jupiter", "Rahu", "Venus"]
+ASHTOTTARI_YEARS = [6, 15, 8, 17, 10, 19, 12, 21]
+# Nakshatras per lord, counted from Ardra (4, 3, 4, 3, ...). Saturn's 4th group
+# member is Abhijit, which the 27-nakshatra zodiac folds into its neighbours.
+_ASHTOTTARI_GROUPS = [4, 3, 4, 3, 3, 3, 4, 3]
+
+
+def _build_ashtottari_groups():
+    # nakshatra -> (lord index, position within the lord's group, group size)
+    table = [None] * 27
+    nak = 5  # Ardra
+    for lord, size in enumerate(_ASHTOTTARI_GROUPS):
+        for pos in range(size):
+            table[nak % 27] = (lord, pos, size)
+            nak += 1
+    return table
+
+
+ASHTOTTARI_NAKSHATRAS = _build_ashtottari_groups()
+
+
+def _ashtottari_start(moon_long, nakshatra_idx):
+    lord, pos, size = ASHTOTTARI_NAKSHATRAS[nakshatra_idx]
+    return lord, (pos + _nakshatra_fraction(moon_long, nakshatra_idx)) / size
+
+
+# Fixed systems: all starting-lord templates are built once at import
+VIMSHOTTARI = DashaSystem("VIMSHOTTARI", VIMSHOTTARI_LORDS, VIMSHOTTARI_YEARS, _vimshottari_start).precompute_templates()
+YOGINI = DashaSystem("YOGINI", YOGINI_LORDS, YOGINI_YEARS, _yogini_start).precompute_templates()
+ASHTOTTARI = DashaSystem("ASHTOTTARI", ASHTOTTARI_LORDS, ASHTOTTARI_YEARS, _ashtottari_start).precompute_templates()
+
+
+# ---------- Jaimini Chara (sign based, chart dependent) ----------
+
+SIGN_LORDS = ["Mars", "Venus", "Mercury", "Moon", "Sun", "Mercury",
+              "Venus", "Mars", "Jupiter", "Saturn", "Saturn", "Jupiter"]
+# Savya (direct) signs are counted forward, the rest backward
+SAVYA_SIGNS = {0, 1, 2, 6, 7, 8}
+
+# Chara sub-periods are twelve equal parts, so one table serves every chart
+_CHARA_BASE = DashaSystem("CHARA", SIGN_NAMES, [1] * 12, equal_sub_periods=True, has_balance=False)
+
+
+def chara_system(chart):
+    """
+    Chara dasha for one chart: Mahadashas run through the signs from the lagna,
+    forward if the 9th from lagna is a savya sign, else backward. Each sign's
+    years = count from the sign to its lord (in the sign's own direction) less
+    one; a lord in its own sign gives 12. Dasha starts at birth (no balance).
+    Scorpio and Aquarius use their primary lords (Mars, Saturn).
+    """
+    asc = chart[ASCENDANT].sign_id
+    step = 1 if (asc + 8) % 12 in SAVYA_SIGNS else -1
+    signs = [(asc + step * i) % 12 for i in range(12)]
+
+    years = []
+    for s in signs:
+        lord_sign = chart[POINT_INDEX[SIGN_LORDS[s]]].sign_id
+        count = (lord_sign - s) % 12 if s in SAVYA_SIGNS else (s - lord_sign) % 12
+        years.append(count or 12)
+
+    return _CHARA_BASE.with_years(
+        "CHARA", [SIGN_NAMES[s] for s in signs], years, lambda moon_long, nak: (0, 0.0),
+        has_balance=False,
+    )
+
+
+SYSTEMS = {
+    "VIMSHOTTARI": VIMSHOTTARI,
+    "YOGINI": YOGINI,
+    "ASHTOTTARI": ASHTOTTARI,
+}
+# Systems built per chart from a factory
+CHART_SYSTEMS = {
+    "CHARA": chara_system,
+}
@@ -1,14 +1,104 @@
 import swisseph as swe
+import numpy as np
 import os
+import time
+import threading
 from datetime import datetime
+from .ayanamsa import AyanamsaSystem
+from .vargas import VARGA_INDEX, calculate_vargas, calculate_varga_sign
+from .nakshatras import NAKSHATRA_NAMES, NAKSHATRA_LORDS, calculate_nakshatras
+from .chart import Chart, PlanetRecord, GRAHA_NAMES, CHART_POINTS, RAHU, ASCENDANT
+
+# Swiss Ephemeris codes in GRAHA_NAMES order (chart.py).
+# Ketu is derived from Rahu, so only the first 8 are sent to Swiss Ephemeris.
+# Mean Node is standard in most Vedic software.
+GRAHA_CODES = [swe.SUN, swe.MOON, swe.MARS, swe.MERCURY, swe.JUPITER, swe.VENUS, swe.SATURN, swe.MEAN_NODE]
+
+
+def ephemeris_candidates():
+    """
+    Ephemeris search order (first directory containing *.se1 files wins):
+    1. $PANDIT_EPHE_PATH  2. $SE_EPHE_PATH  3. backend/data/ephemeris (setup_data.py)  4. <repo>/ephe
+    The environment is read on every call, not frozen at import.
+    """
+    return [
+        os.getenv("PANDIT_EPHE_PATH"),
+        os.getenv("SE_EPHE_PATH"),
+        os.path.join(os.path.dirname(__file__), "../../data/ephemeris"),
+        os.path.join(os.path.dirname(__file__), "../../../ephe"),
+    ]
+
+
+# Swiss Ephemeris keeps its settings in thread-local storage, so the path must be
+# applied in every thread that calls it (FastAPI runs sync endpoints in a thread pool).
+_thread_state = threading.local()
+
+
+def find_ephemeris_path(candidates=None):
+    """
+    Returns the first candidate directory that contains Swiss Ephemeris (.se1) files, or None.
+    """
+    for path in candidates or ephemeris_candidates():
+        if path and os.path.isdir(path) and any(f.endswith(".se1") for f in os.listdir(path)):
+            return os.path.abspath(path)
+    return None
+
 
 class VedicAstroEngine:
-    def __init__(self):
-        # Point to ephemeris files if they exist locally, else let swe use defaults
-        # Usually located in 'ephe' folder relative to project root
-        ephe_path = os.path.join(os.path.dirname(__file__), "../../ephe")
-        if os.path.exists(ephe_path):
-            swe.set_ephe_path(ephe_path)
+    def __init__(self, ephemeris_table=None, chart_cache=None, ephe_path=None):
+        # Optional precomputed EphemerisTable (see ephemeris_table.py).
+        # When set, graha positions inside its range are interpolated instead of calling swe.calc_ut.
+        self.ephemeris_table = ephemeris_table
+        # Optional ChartCache (see chart_cache.py) used by get_chart()
+        self.chart_cache = chart_cache
+        self.warmup_info = None
+
+        # Point to ephemeris files if they exist locally, else swe falls back to
+        # the built-in (less precise) Moshier ephemeris
+        self.ephe_path = find_ephemeris_path([ephe_path] if ephe_path else None)
+        self.use_ephemeris()
+
+    def use_ephemeris(self):
+        """Applies this engine's ephemeris path in the calling thread (no-op if already set)."""
+        if self.ephe_path and getattr(_thread_state, "ephe_path", None) != self.ephe_path:
+            swe.set_ephe_path(self.ephe_path)
+            _thread_state.ephe_path = self.ephe_path
+
+    def warmup(self):
+        """
+        Opens and reads every ephemeris file (filling the OS page cache) and runs a
+        dummy chart so the first real request does not pay file-open/cache-fill latency.
+        Records which backend Swiss Ephemeris actually used.
+        """
+        self.use_ephemeris()
+        t0 = time.perf_counter()
+        files = []
+        if self.ephe_path:
+            for name in sorted(os.listdir(self.ephe_path)):
+                if name.endswith(".se1"):
+                    with open(os.path.join(self.ephe_path, name), "rb") as f:
+                        while f.read(1 << 20):
+                            pass
+                    files.append(name)
+        t1 = time.perf_counter()
+
+        # calc_ut reports the ephemeris it really used in the return flag
+        retflag = swe.calc_ut(swe.julday(2000, 1, 1, 12.0), swe.MOON, swe.FLG_SWIEPH | swe.FLG_SPEED)[1]
+        backend = "swiss_ephemeris_files" if retflag & swe.FLG_SWIEPH else "moshier_fallback"
+
+        self.calculate_chart(2000, 1, 1, 12, 0, 28.61, 77.20, 5.5)
+        t2 = time.perf_counter()
+
+        self.warmup_info = {
+            "backend": backend,
+            "ephe_path": self.ephe_path,
+            "files": files,
+            "ephemeris_table": self.ephemeris_table.path if self.ephemeris_table is not None else None,
+            "file_touch_ms": round((t1 - t0) * 1000, 2),
+            "dummy_chart_ms": round((t2 - t1) * 1000, 2),
+            "total_ms": round((t2 - t0) * 1000, 2),
+        }
+        return self.warmup_info
             
     def get_julian_day(self, year, month, day, hour, minute, tz):
         """
@@ -22,128 +112,203 @@ class VedicAstroEngine:
         """
         Calculates the sign ID for a planet in a divisional chart (Varga).
         Default is D9 (Navamsa), the most critical divisional chart in Vedic Astrology.
+        Supported divisions: 1 and VARGA_DIVISIONS (D2 ... D60), see vargas.py.
         """
-        if division != 9:
-            return sign_id # Only D9 implemented for now
+        return calculate_varga_sign(sign_id * 30 + planet_deg, division)
 
-        # 1. Determine Pada (Part 0-8)
-        # Each Navamsa is 3° 20' = 3.333333 degrees
-        part_size = 30.0 / 9.0
-        pada_index = int(planet_deg / part_size) 
-        
-        # 2. Determine Start Sign based on Element (Tattwa)
-        # Fire Signs (Aries 0, Leo 4, Sag 8) -> Start Counting from Aries (0)
-        # Earth Signs (Taurus 1, Virgo 5, Cap 9) -> Start Counting from Capricorn (9)
-        # Air Signs (Gemini 2, Libra 6, Aqua 10) -> Start Counting from Libra (6)
-        # Water Signs (Cancer 3, Scorpio 7, Pisces 11) -> Start Counting from Cancer (3)
-        
-        element_group = sign_id % 4
-        
-        if element_group == 0:   # Fire
-            start_sign = 0 
-        elif element_group == 1: # Earth
-            start_sign = 9
-        elif element_group == 2: # Air
-            start_sign = 6
-        else:                    # Water
-            start_sign = 3
-            
-        # 3. Final Calculation
-        varga_sign_id = (start_sign + pada_index) % 12
-        return varga_sign_id
+    def get_chart(self, year, month, day, hour, minute, lat, lon, tz, ayanamsa_mode="LAHIRI", compute=None):
+        """
+        Cached calculate_chart. The returned Chart is shared between requests and
+        must be treated as read-only.
+        compute: optional replacement for calculate_chart on a cache miss
+        (e.g. a call that runs on the compute pool).
+        """
+        compute = compute or self.calculate_chart
+        if self.chart_cache is None:
+            return compute(year, month, day, hour, minute, lat, lon, tz, ayanamsa_mode)
+
+        ayanamsa_mode = AyanamsaSystem.normalize(ayanamsa_mode)
+        jd = self.get_julian_day(year, month, day, hour, minute, tz)
+        key = self.chart_cache.make_key(jd, lat, lon, ayanamsa_mode)
+
+        chart = self.chart_cache.get(key)
+        if chart is None:
+            chart = self.chart_cache.put(
+                key, compute(year, month, day, hour, minute, lat, lon, tz, ayanamsa_mode)
+            )
+        return chart
 
     def calculate_chart(self, year, month, day, hour, minute, lat, lon, tz, ayanamsa_mode="LAHIRI"):
         """
         Main function to calculate planetary positions.
-        Returns Dictionary with Planet Data including D1 (Rashi) and D9 (Navamsa).
+        Returns a compact Chart (see chart.py) of PlanetRecords including D1 (Rashi),
+        house_number from the lagna, D9 (Navamsa), "vargas": the sign in every
+        divisional chart, ordered as VARGA_DIVISIONS, and the nakshatra
+        (0-based nakshatra_id, name, pada 1-4, nakshatra_lord).
         """
+        self.use_ephemeris()
         jd = self.get_julian_day(year, month, day, hour, minute, tz)
         
-        # 1. Set Ayanamsa (Sidereal Offset)
-        if ayanamsa_mode == "RAMAN":
-            swe.set_sid_mode(swe.SIDM_RAMAN)
-        elif ayanamsa_mode == "KP":
-            swe.set_sid_mode(swe.SIDM_KRISHNAMURTI)
-        else:
-            swe.set_sid_mode(swe.SIDM_LAHIRI) # Default to Lahiri (Standard Vedic)
-            
-        ayanamsa_val = swe.get_ayanamsa_ut(jd)
-        
-        # 2. Define Planets to Calculate
-        planets = {
-            "Sun": swe.SUN, "Moon": swe.MOON, "Mars": swe.MARS,
-            "Mercury": swe.MERCURY, "Jupiter": swe.JUPITER,
-            "Venus": swe.VENUS, "Saturn": swe.SATURN,
-            "Rahu": swe.MEAN_NODE # Mean Node is standard in most Vedic software
-        }
-        
-        chart_data = {}
-        
-        # 3. Calculate 7 Major Planets + Rahu
-        for p_name, p_code in planets.items():
-            # Calculate Tropical Position
-            # flags: swe.FLG_SWIEPH (use ephemeris), swe.FLG_SPEED (calc speed)
-            res = swe.calc_ut(jd, p_code, swe.FLG_SWIEPH | swe.FLG_SPEED)
-            
-            tropical_lon = res[0][0]
-            speed = res[0][3]
-            
-            # Convert to Sidereal (Nirayana)
-            sidereal_lon = (tropical_lon - ayanamsa_val) % 360
-            
-            sign_id = int(sidereal_lon / 30)
-            degree_in_sign = sidereal_lon % 30
-            is_retrograde = speed < 0
-            
-            # --- NEW: CALCULATE D9 (NAVAMSA) ---
-            d9_sign = self.calculate_varga(degree_in_sign, sign_id, division=9)
-            
-            chart_data[p_name] = {
-                "sign_id": sign_id,
-                "degree": degree_in_sign,
-                "is_retrograde": is_retrograde,
-                "absolute_longitude": sidereal_lon,
-                "speed": speed,
-                "d9_sign_id": d9_sign
-            }
-            
-        # 4. Calculate Ketu (Always exactly 180 degrees from Rahu)
-        rahu = chart_data["Rahu"]
-        ketu_lon = (rahu["absolute_longitude"] + 180) % 360
-        ketu_sign = int(ketu_lon / 30)
-        ketu_deg = ketu_lon % 30
-        
-        # Ketu's D9
-        ketu_d9 = self.calculate_varga(ketu_deg, ketu_sign, division=9)
-        
-        chart_data["Ketu"] = {
-            "sign_id": ketu_sign,
-            "degree": ketu_deg,
-            "is_retrograde": rahu["is_retrograde"], # Always same motion as Rahu
-            "absolute_longitude": ketu_lon,
-            "speed": rahu["speed"],
-            "d9_sign_id": ketu_d9
-        }
+        # 1. Ayanamsa (Sidereal Offset) - per call, no global swe.set_sid_mode
+        # Unknown modes default to Lahiri (Standard Vedic)
+        ayanamsa_val = AyanamsaSystem.get_ayanamsa(jd, ayanamsa_mode)
         
-        # 5. Calculate Ascendant (Lagna)
+        # 2. Tropical positions of the 7 Major Planets + Rahu (GRAHA_CODES order)
+        table = self.ephemeris_table
+        if table is not None and table.covers(jd):
+            # O(1) lookup from the memory-mapped table
+            tropical, speeds = table.positions(jd)
+            tropical = tropical.tolist()
+            speeds = speeds.tolist()
+        else:
+            tropical = []
+            speeds = []
+            for p_code in GRAHA_CODES:
+                # flags: swe.FLG_SWIEPH (use ephemeris), swe.FLG_SPEED (calc speed)
+                res = swe.calc_ut(jd, p_code, swe.FLG_SWIEPH | swe.FLG_SPEED)[0]
+                tropical.append(res[0])
+                speeds.append(res[3])
+
+        # 3. Ketu (Always exactly 180 degrees from Rahu, same motion)
+        tropical.append(tropical[RAHU] + 180)
+        speeds.append(speeds[RAHU])
+
+        # 4. Ascendant (Lagna)
         # swe.houses_ex returns (cusps, ascmc). ascmc[0] is the Ascendant.
         # We use 'A' (Equal) or 'P' (Placidus) - Ascendant degree is same regardless of house system.
-        houses_res = swe.houses_ex(jd, lat, lon, b'A') 
-        asc_tropical = houses_res[1][0]
-        
-        # Convert Ascendant to Sidereal
-        asc_sidereal = (asc_tropical - ayanamsa_val) % 360
-        asc_sign = int(asc_sidereal / 30)
-        asc_deg = asc_sidereal % 30
-        
-        # Ascendant D9
-        asc_d9 = self.calculate_varga(asc_deg, asc_sign, division=9)
-        
-        chart_data["Ascendant"] = {
-            "sign_id": asc_sign,
-            "degree": asc_deg,
-            "absolute_longitude": asc_sidereal,
-            "d9_sign_id": asc_d9
+        tropical.append(swe.houses_ex(jd, lat, lon, b'A')[1][0])
+
+        # 5. Convert to Sidereal (Nirayana); Divisional Charts (D2-D60) and
+        #    Nakshatra/Pada for all points, each in one vectorized step
+        longitudes = [(t - ayanamsa_val) % 360 for t in tropical]
+        vargas = calculate_vargas(longitudes).tolist()
+        nak_ids, padas = calculate_nakshatras(longitudes)
+        nak_ids = nak_ids.tolist()
+        padas = padas.tolist()
+        d9_col = VARGA_INDEX[9]
+
+        asc_sign = int(longitudes[ASCENDANT] / 30)
+        records = []
+        for i, name in enumerate(CHART_POINTS):
+            sidereal_lon = longitudes[i]
+            sign_id = int(sidereal_lon / 30)
+            is_graha = i != ASCENDANT
+            nak = nak_ids[i]
+            records.append(PlanetRecord(
+                name,
+                sign_id,
+                sidereal_lon % 30,
+                sidereal_lon,
+                is_retrograde=speeds[i] < 0 if is_graha else None,
+                speed=speeds[i] if is_graha else None,
+                house_number=(sign_id - asc_sign) % 12 + 1 if is_graha else None,
+                d9_sign_id=vargas[i][d9_col],
+                vargas=tuple(vargas[i]),
+                nakshatra_id=nak,
+                nakshatra=NAKSHATRA_NAMES[nak],
+                pada=padas[i],
+                nakshatra_lord=NAKSHATRA_LORDS[nak],
+            ))
+
+        return Chart(records)
+
+    def tropical_positions(self, jd, bodies=None):
+        """
+        Tropical longitudes and speeds of the computed grahas (GRAHA_CODES order,
+        or only the indices in `bodies`) for a 1-D array of JDs (UT).
+        Returns (longitude, speed), each of shape (n, len(bodies)).
+        Interpolated from the ephemeris table in one gather when it covers every JD.
+        """
+        jd = np.asarray(jd, dtype=np.float64)
+        bodies = list(range(len(GRAHA_CODES))) if bodies is None else list(bodies)
+        table = self.ephemeris_table
+        if table is not None and jd.size and table.covers(jd.min()) and table.covers(jd.max()):
+            lon, speed = table.positions(jd)
+            return lon[:, bodies], speed[:, bodies]
+
+        self.use_ephemeris()
+        lon = np.empty((jd.size, len(bodies)))
+        speed = np.empty((jd.size, len(bodies)))
+        calc_ut = swe.calc_ut
+        flags = swe.FLG_SWIEPH | swe.FLG_SPEED
+        for i, t in enumerate(jd.tolist()):
+            for j, b in enumerate(bodies):
+                pos = calc_ut(t, GRAHA_CODES[b], flags)[0]
+                lon[i, j] = pos[0]
+                speed[i, j] = pos[3]
+        return lon, speed
+
+    def calculate_charts_batch(self, years, months, days, hours, minutes, lats, lons, tzs, ayanamsa_mode="LAHIRI"):
+        """
+        Columnar version of calculate_chart for bulk jobs.
+        Takes equal-length arrays of birth data and returns a dict of NumPy arrays
+        (one row per chart, one column per graha in GRAHA_NAMES order) instead of nested dicts.
+        "vargas" has a trailing axis ordered as VARGA_DIVISIONS.
+        """
+        years = np.asarray(years, dtype=np.int64)
+        n = len(years)
+        months = np.asarray(months, dtype=np.int64)
+        days = np.asarray(days, dtype=np.int64)
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        # UTC offset adjustment (same as get_julian_day)
+        decimal_hours = (
+            np.asarray(hours, dtype=np.float64)
+            + np.asarray(minutes, dtype=np.float64) / 60.0
+            - np.asarray(tzs, dtype=np.float64)
+        )
+
+        jd = np.empty(n)
+        tropical = np.empty((n, 9))
+        speed = np.empty((n, 9))
+        asc_tropical = np.empty(n)
+
+        # 2. Raw ephemeris calls (the only per-row Python work)
+        self.use_ephemeris()
+        for i in range(n):
+            t = swe.julday(int(years[i]), int(months[i]), int(days[i]), float(decimal_hours[i]))
+            jd[i] = t
+            asc_tropical[i] = swe.houses_ex(t, float(lats[i]), float(lons[i]), b'A')[1][0]
+
+        tropical[:, :8], speed[:, :8] = self.tropical_positions(jd)
+
+        # 3. Vectorized derivations: ayanamsa, Ketu, sidereal conversion, signs and D9
+        ayanamsa = np.asarray(AyanamsaSystem.get_ayanamsa(jd, ayanamsa_mode)).reshape(n)
+        tropical[:, 8] = tropical[:, 7] + 180.0
+        speed[:, 8] = speed[:, 7]
+
+        longitude = (tropical - ayanamsa[:, None]) % 360
+        sign_id = (longitude // 30).astype(np.int8)
+        degree = longitude % 30
+        vargas = calculate_vargas(longitude)
+        d9_sign_id = vargas[..., VARGA_INDEX[9]]
+
+        asc_longitude = (asc_tropical - ayanamsa) % 360
+        asc_sign_id = (asc_longitude // 30).astype(np.int8)
+        asc_degree = asc_longitude % 30
+        asc_vargas = calculate_vargas(asc_longitude)
+
+        nakshatra_id, pada = calculate_nakshatras(longitude)
+        asc_nakshatra_id, asc_pada = calculate_nakshatras(asc_longitude)
+        asc_d9_sign_id = asc_vargas[..., VARGA_INDEX[9]]
+
+        return {
+            "planets": GRAHA_NAMES,
+            "jd": jd,
+            "absolute_longitude": longitude,
+            "degree": degree,
+            "speed": speed,
+            "is_retrograde": speed < 0,
+            "sign_id": sign_id,
+            "d9_sign_id": d9_sign_id,
+            "vargas": vargas,
+            "nakshatra_id": nakshatra_id.astype(np.int8),
+            "pada": pada.astype(np.int8),
+            "asc_absolute_longitude": asc_longitude,
+            "asc_degree": asc_degree,
+            "asc_sign_id": asc_sign_id,
+            "asc_d9_sign_id": asc_d9_sign_id,
+            "asc_vargas": asc_vargas,
+            "asc_nakshatra_id": asc_nakshatra_id.astype(np.int8),
+            "asc_pada": asc_pada.astype(np.int8),
         }
-        
-        return chart_data
\ No newline at end of file
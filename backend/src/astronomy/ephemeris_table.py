@@ -0,0 +1,173 @@
+import os
+import struct
+import swisseph as swe
+import numpy as np
+
+from .engine import GRAHA_NAMES, GRAHA_CODES
+
+# Binary layout:
+#   64-byte header: magic, jd_start, step (days), n_rows, n_bodies
+#   float64 array of shape (n_rows, n_bodies, 2) -> (tropical longitude, speed deg/day)
+# Longitudes are stored TROPICAL so the same table serves every ayanamsa mode.
+MAGIC = b"PANDEPH1"
+HEADER_FORMAT = "<8sddqq"
+HEADER_SIZE = 64
+
+DEFAULT_TABLE_PATH = os.path.join(
+    os.path.dirname(__file__), "../../data/ephemeris/grahas_1900_2100.bin"
+)
+
+# BirthDetails allows 1900-2100; pad by a few days for timezone offsets.
+TABLE_START_JD = swe.julday(1899, 12, 25, 0.0)
+TABLE_END_JD = swe.julday(2101, 1, 7, 0.0)
+
+# Error bound vs swe.calc_ut over 1900-2100 at the default 0.5 day step (cubic
+# Hermite on longitude, linear on speed), from verify_table() plus a 0.0005 day
+# scan around every conjunction of a graha with the Sun:
+#   longitude: < 2e-5 deg for every graha more than 3 deg from the Sun. Within a
+#              few degrees of it, swe's light deflection bends the track within
+#              hours: up to 1.6e-3 deg (~6 arcsec, Jupiter and Saturn)
+#   speed:     < 1e-2 deg/day more than 3 deg from the Sun, up to 0.07 deg/day at
+#              a conjunction (Mercury); only affects is_retrograde near a station
+MAX_LONGITUDE_ERROR_DEG = 2e-3
+MAX_SPEED_ERROR_DEG_PER_DAY = 0.1
+
+
+def build_table(path=DEFAULT_TABLE_PATH, step=0.5, start_jd=TABLE_START_JD, end_jd=TABLE_END_JD):
+    """
+    Offline generator: samples tropical longitude and speed of Sun..Saturn and
+    the Mean Node at a fixed step and writes them as a memory-mappable file.
+    """
+    n_rows = int(np.ceil((end_jd - start_jd) / step)) + 1
+    n_bodies = len(GRAHA_CODES)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    header = struct.pack(HEADER_FORMAT, MAGIC, start_jd, step, n_rows, n_bodies)
+
+    data = np.empty((n_rows, n_bodies, 2))
+    flags = swe.FLG_SWIEPH | swe.FLG_SPEED
+    for i in range(n_rows):
+        jd = start_jd + i * step
+        for j, code in enumerate(GRAHA_CODES):
+            pos = swe.calc_ut(jd, code, flags)[0]
+            data[i, j, 0] = pos[0]
+            data[i, j, 1] = pos[3]
+
+    with open(path, "wb") as f:
+        f.write(header.ljust(HEADER_SIZE, b"\0"))
+        f.write(data.tobytes())
+    return path
+
+
+class EphemerisTable:
+    """
+    Read-only, memory-mapped graha table with cubic Hermite interpolation.
+    Pages are shared between uvicorn workers through the OS page cache.
+    """
+
+    def __init__(self, path=DEFAULT_TABLE_PATH):
+        with open(path, "rb") as f:
+            magic, jd_start, step, n_rows, n_bodies = struct.unpack(
+                HEADER_FORMAT, f.read(struct.calcsize(HEADER_FORMAT))
+            )
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a PanditAI ephemeris table")
+
+        self.path = path
+        self.jd_start = jd_start
+        self.step = step
+        self.n_rows = n_rows
+        self.jd_end = jd_start + (n_rows - 1) * step
+        self.data = np.memmap(
+            path, dtype=np.float64, mode="r", offset=HEADER_SIZE,
+            shape=(n_rows, n_bodies, 2),
+        )
+
+    @classmethod
+    def load_default(cls):
+        """Returns the table at $PANDIT_EPHEMERIS_TABLE (or the default path), or None if absent."""
+        path = os.getenv("PANDIT_EPHEMERIS_TABLE", DEFAULT_TABLE_PATH)
+        if not os.path.exists(path):
+            return None
+        return cls(path)
+
+    def covers(self, jd):
+        return self.jd_start <= jd < self.jd_end
+
+    def positions(self, jd):
+        """
+        Tropical longitudes and speeds of the 8 tabulated bodies at one or many JDs (UT).
+        Returns (longitude, speed) arrays of shape (..., 8).
+        """
+        jd = np.asarray(jd, dtype=np.float64)
+        x = (jd - self.jd_start) / self.step
+        i = np.floor(x).astype(np.int64)
+        if np.any(i < 0) or np.any(i >= self.n_rows - 1):
+            raise ValueError("Julian day outside the ephemeris table range")
+        t = (x - i)[..., None]
+
+        p0 = self.data[i, :, 0]
+        p1 = self.data[i + 1, :, 0]
+        v0 = self.data[i, :, 1] * self.step
+        v1 = self.data[i + 1, :, 1] * self.step
+
+        # Unwrap across 0/360 before interpolating
+        dp = (p1 - p0 + 180.0) % 360.0 - 180.0
+
+        # Cubic Hermite basis (p0 = 0, p1 = dp)
+        t2 = t * t
+        t3 = t2 * t
+        lon = p0 + (-2 * t3 + 3 * t2) * dp + (t3 - 2 * t2 + t) * v0 + (t3 - t2) * v1
+        speed = self.data[i, :, 1] + (self.data[i + 1, :, 1] - self.data[i, :, 1]) * t
+
+        return lon % 360.0, speed
+
+
+def verify_table(table, samples=20000, seed=0):
+    """
+    Compares interpolated positions against swe.calc_ut at random dates.
+    Returns {planet: (max longitude error deg, max speed error deg/day)}.
+    """
+    rng = np.random.default_rng(seed)
+    jds = rng.uniform(table.jd_start, table.jd_end - table.step, samples)
+    lon, speed = table.positions(jds)
+
+    flags = swe.FLG_SWIEPH | swe.FLG_SPEED
+    ref_lon = np.empty_like(lon)
+    ref_speed = np.empty_like(speed)
+    for i, jd in enumerate(jds):
+        for j, code in enumerate(GRAHA_CODES):
+            pos = swe.calc_ut(jd, code, flags)[0]
+            ref_lon[i, j] = pos[0]
+            ref_speed[i, j] = pos[3]
+
+    lon_err = np.abs((lon - ref_lon + 180.0) % 360.0 - 180.0).max(axis=0)
+    speed_err = np.abs(speed - ref_speed).max(axis=0)
+    return {
+        GRAHA_NAMES[j]: (float(lon_err[j]), float(speed_err[j]))
+        for j in range(len(GRAHA_CODES))
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    # Usage: python -m src.astronomy.ephemeris_table [build|verify] [path]
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "verify"
+    target = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_TABLE_PATH
+
+    from .engine import VedicAstroEngine
+    VedicAstroEngine()  # sets the ephemeris path
+
+    if cmd == "build":
+        t0 = time.time()
+        build_table(target)
+        print(f"Built {target} ({os.path.getsize(target) / 1e6:.1f} MB) in {time.time() - t0:.1f}s")
+    else:
+        ok = True
+        for planet, (lon_err, speed_err) in verify_table(EphemerisTable(target)).items():
+            ok &= lon_err < MAX_LONGITUDE_ERROR_DEG and speed_err < MAX_SPEED_ERROR_DEG_PER_DAY
+            print(f"{planet:8s} max |dLon| = {lon_err:.2e} deg   max |dSpeed| = {speed_err:.2e} deg/day")
+        print("PASS" if ok else "FAIL: error bound exceeded")
+        sys.exit(0 if ok else 1)
@@ -0,0 +1,167 @@
+import numpy as np
+
+from .chart import GRAHA_NAMES, SUN, MOON, MERCURY, SATURN, ASCENDANT
+
+# Gochara (transit results counted from the natal Moon), Phaladeepika.
+# Every table is indexed [graha, house - 1] in GRAHA_NAMES order and built once at import.
+
+# Favourable houses from the Moon; Rahu and Ketu follow Saturn
+_FAVOURABLE = {
+    "Sun": [3, 6, 10, 11],
+    "Moon": [1, 3, 6, 7, 10, 11],
+    "Mars": [3, 6, 11],
+    "Mercury": [2, 4, 6, 8, 10, 11],
+    "Jupiter": [2, 5, 7, 9, 11],
+    "Venus": [1, 2, 3, 4, 5, 8, 9, 11, 12],
+    "Saturn": [3, 6, 11],
+    "Rahu": [3, 6, 11],
+    "Ketu": [3, 6, 11],
+}
+
+# Vedha: favourable house -> house whose occupant obstructs it
+_VEDHA = {
+    "Sun": {3: 9, 6: 12, 10: 4, 11: 5},
+    "Moon": {1: 5, 3: 9, 6: 12, 7: 2, 10: 4, 11: 8},
+    "Mars": {3: 12, 6: 9, 11: 5},
+    "Mercury": {2: 5, 4: 3, 6: 9, 8: 1, 10: 8, 11: 12},
+    "Jupiter": {2: 12, 5: 4, 7: 3, 9: 10, 11: 8},
+    "Venus": {1: 8, 2: 7, 3: 1, 4: 10, 5: 9, 8: 5, 9: 11, 11: 6, 12: 3},
+    "Saturn": {3: 12, 6: 9, 11: 5},
+    "Rahu": {3: 12, 6: 9, 11: 5},
+    "Ketu": {3: 12, 6: 9, 11: 5},
+}
+
+# Only the seven grahas cause vedha, and never between father and son
+VEDHA_CASTERS = range(SATURN + 1)
+_NO_VEDHA = {SUN: SATURN, SATURN: SUN, MOON: MERCURY, MERCURY: MOON}
+
+# Bhinnashtakavarga (BPHS): for each graha Sun..Saturn, the houses counted from
+# each contributor (Sun..Saturn, Lagna) in which that contributor gives a bindu
+_BINDUS = {
+    "Sun": [[1, 2, 4, 7, 8, 9, 10, 11], [3, 6, 10, 11], [1, 2, 4, 7, 8, 9, 10, 11],
+            [3, 5, 6, 9, 10, 11, 12], [5, 6, 9, 11], [6, 7, 12],
+            [1, 2, 4, 7, 8, 9, 10, 11], [3, 4, 6, 10, 11, 12]],
+    "Moon": [[3, 6, 7, 8, 10, 11], [1, 3, 6, 7, 10, 11], [2, 3, 5, 6, 9, 10, 11],
+             [1, 3, 4, 5, 7, 8, 10, 11], [1, 4, 7, 8, 10, 11, 12], [3, 4, 5, 7, 9, 10, 11],
+             [3, 5, 6, 11], [3, 6, 10, 11]],
+    "Mars": [[3, 5, 6, 10, 11], [3, 6, 11], [1, 2, 4, 7, 8, 10, 11],
+             [3, 5, 6, 11], [6, 10, 11, 12], [6, 8, 11, 12],
+             [1, 4, 7, 8, 9, 10, 11], [1, 3, 6, 10, 11]],
+    "Mercury": [[5, 6, 9, 11, 12], [2, 4, 6, 8, 10, 11], [1, 2, 4, 7, 8, 9, 10, 11],
+                [1, 3, 5, 6, 9, 10, 11, 12], [6, 8, 11, 12], [1, 2, 3, 4, 5, 8, 9, 11],
+                [1, 2, 4, 7, 8, 9, 10, 11], [1, 2, 4, 6, 8, 10, 11]],
+    "Jupiter": [[1, 2, 3, 4, 7, 8, 9, 10, 11], [2, 5, 7, 9, 11], [1, 2, 4, 7, 8, 10, 11],
+                [1, 2, 4, 5, 6, 9, 10, 11], [1, 2, 3, 4, 7, 8, 10, 11], [2, 5, 6, 9, 10, 11],
+                [3, 5, 6, 12], [1, 2, 4, 5, 6, 7, 9, 10, 11]],
+    "Venus": [[8, 11, 12], [1, 2, 3, 4, 5, 8, 9, 11, 12], [3, 5, 6, 9, 11, 12],
+              [3, 5, 6, 9, 11], [5, 8, 9, 10, 11], [1, 2, 3, 4, 5, 8, 9, 10, 11],
+              [3, 4, 5, 8, 9, 10, 11], [1, 2, 3, 4, 5, 8, 9, 11]],
+    "Saturn": [[1, 2, 4, 7, 8, 10, 11], [3, 6, 11], [3, 5, 6, 10, 11, 12],
+               [6, 8, 9, 10, 11, 12], [5, 6, 11, 12], [6, 11, 12],
+               [3, 5, 6, 11], [1, 3, 4, 6, 10, 11]],
+}
+
+# Bindu contributors in BINDU_MATRIX order: the seven grahas and the lagna
+CONTRIBUTORS = list(range(SATURN + 1)) + [ASCENDANT]
+
+
+def _house_table(rows, dtype=np.int8):
+    table = np.zeros((len(rows), 12), dtype=dtype)
+    for i, houses in enumerate(rows):
+        for h in houses:
+            table[i, h - 1] = 1
+    return table
+
+
+# FAVOURABLE[g, h - 1] = 1 if house h from the Moon is good for transiting graha g
+FAVOURABLE = _house_table([_FAVOURABLE[g] for g in GRAHA_NAMES])
+# VEDHA_HOUSE[g, h - 1] = house (1-12) that obstructs g's favourable house h, 0 = none
+VEDHA_HOUSE = np.zeros((len(GRAHA_NAMES), 12), dtype=np.int8)
+for _g, _name in enumerate(GRAHA_NAMES):
+    for _h, _v in _VEDHA[_name].items():
+        VEDHA_HOUSE[_g, _h - 1] = _v
+# VEDHA_CASTER[g, c] = 1 if graha c in g's vedha house obstructs g
+VEDHA_CASTER = np.array([
+    [c != g and _NO_VEDHA.get(g) != c for c in VEDHA_CASTERS] for g in range(len(GRAHA_NAMES))
+], dtype=bool)
+# BINDU_MATRIX[g, c, h - 1] = 1 if contributor c gives graha g a bindu in house h from c
+BINDU_MATRIX = np.stack([_house_table(_BINDUS[GRAHA_NAMES[g]]) for g in range(SATURN + 1)])
+
+for _table in (FAVOURABLE, VEDHA_HOUSE, VEDHA_CASTER, BINDU_MATRIX):
+    _table.setflags(write=False)
+
+
+def ashtakavarga(natal_signs):
+    """
+    Bhinnashtakavarga of the seven grahas from the signs of the contributors
+    (array [..., 8] in CONTRIBUTORS order). Returns bindus [..., 7, 12] by sign;
+    the Sarvashtakavarga is its sum over axis -2.
+    """
+    natal_signs = np.asarray(natal_signs, dtype=np.int64)
+    # House of every sign counted from each contributor: [..., 8, 12]
+    house = (np.arange(12) - natal_signs[..., None]) % 12
+    contributions = BINDU_MATRIX[
+        np.arange(SATURN + 1)[:, None, None], np.arange(len(CONTRIBUTORS))[:, None], house[..., None, :, :]
+    ]
+    return contributions.sum(axis=-2)
+
+
+def transit_bindus(natal_signs, transit_signs):
+    """
+    Ashtakavarga bindus of the signs being transited, without the full table:
+    natal_signs [..., 8] in CONTRIBUTORS order, transit_signs [9].
+    Returns (bhinna [..., 7]: each of Sun..Saturn in its own transit sign,
+             sarva [..., 9]: Sarvashtakavarga of each graha's transit sign).
+    """
+    natal_signs = np.asarray(natal_signs, dtype=np.int64)
+    house = (np.asarray(transit_signs, dtype=np.int64) - natal_signs[..., None]) % 12  # [..., 8, 9]
+    by_sign = BINDU_MATRIX[
+        np.arange(SATURN + 1)[:, None, None], np.arange(len(CONTRIBUTORS))[:, None], house[..., None, :, :]
+    ].sum(axis=-2, dtype=np.int16)  # [..., 7 grahas, 9 transit signs]
+    bhinna = by_sign[..., np.arange(SATURN + 1), np.arange(SATURN + 1)]
+    return bhinna, by_sign.sum(axis=-2)
+
+
+def chart_contributor_signs(chart):
+    """Natal signs of Sun..Saturn and the lagna, the ashtakavarga contributors."""
+    return np.array([chart[c].sign_id for c in CONTRIBUTORS], dtype=np.int64)
+
+
+def gochara(moon_sign, transit_signs):
+    """
+    Moon-based gochara for one or many natal Moons (array [...]) against one
+    sky (transit signs of the nine grahas, [9] or [..., 9]).
+    Returns (house_from_moon, favourable, vedha_by), each [..., 9]; vedha_by is
+    the index of the graha obstructing a favourable transit, -1 if none.
+    """
+    moon_sign = np.asarray(moon_sign, dtype=np.int64)
+    transit_signs = np.asarray(transit_signs, dtype=np.int64)
+    grahas = np.arange(len(GRAHA_NAMES))
+
+    # 1. House of every transit from the Moon, and the table verdict
+    house = (transit_signs - moon_sign[..., None]) % 12 + 1
+    favourable = FAVOURABLE[grahas, house - 1].astype(bool)
+
+    # 2. A favourable transit is obstructed by an allowed graha standing in its vedha house
+    vedha_house = VEDHA_HOUSE[grahas, house - 1]
+    in_vedha = house[..., None, :SATURN + 1] == vedha_house[..., :, None]  # [..., graha, caster]
+    blocked = in_vedha & VEDHA_CASTER & (favourable & (vedha_house > 0))[..., None]
+    vedha_by = np.where(blocked.any(axis=-1), blocked.argmax(axis=-1), -1)
+    return house, favourable, vedha_by
+
+
+def transit_scores(favourable, vedha_by, bindus):
+    """
+    Score in [-1, 1] per transit: half from the gochara verdict (+1 favourable,
+    0 if obstructed by vedha, -1 unfavourable), half from the bindus of the
+    transited sign (4 of 8 is neutral).
+    """
+    verdict = np.where(favourable, np.where(vedha_by >= 0, 0.0, 1.0), -1.0)
+    weight = np.clip((np.asarray(bindus, dtype=np.float64) - 4.0) / 4.0, -1.0, 1.0)
+    return np.round(0.5 * verdict + 0.5 * weight, 2)
+
+
+def node_bindus(sarva_bindus):
+    """Rahu/Ketu have no Bhinnashtakavarga: scale the sign's Sarvashtakavarga (28 = average) to 0-8."""
+    return np.clip(np.asarray(sarva_bindus) * 4.0 / 28.0, 0.0, 8.0)
+
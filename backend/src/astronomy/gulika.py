@@ -1,6 +1,12 @@
-import ephem
-import math
-from datetime import datetime, timedelta
+import calendar
+import threading
+import swisseph as swe
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+from .engine import VedicAstroEngine
+from .ayanamsa import AyanamsaSystem
+
 
 def decimal_to_dms(deg):
     """Helper to convert decimal degrees to Degrees:Minutes:Seconds"""
@@ -11,174 +17,195 @@ def decimal_to_dms(deg):
 
 def get_zodiac_sign(lon_degrees):
     """Returns the Vedic Zodiac sign based on longitude."""
-    signs = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", 
+    signs = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
              "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
     # Normalize to 0-360
     lon_degrees = lon_degrees % 360
     index = int(lon_degrees / 30)
     return signs[index]
 
-def calculate_gulika(lat, lon, year, month, day, hour, minute):
+
+def jd_to_local_str(jd, tz):
+    """UT Julian Day -> local "YYYY-MM-DD HH:MM"."""
+    y, m, d, h = swe.revjul(jd + tz / 24.0)
+    return (datetime(y, m, d) + timedelta(hours=h)).strftime("%Y-%m-%d %H:%M")
+
+
+# Weekday lords in order: Sun(0), Moon(1), Mars(2), Mercury(3), Jupiter(4), Venus(5), Saturn(6)
+# Each Upagraha rises in the 1/8th part of the day/night ruled by its planet.
+UPAGRAHA_LORDS = {
+    "Kaala": 0,          # Sun
+    "Mrityu": 2,         # Mars
+    "Ardhaprahara": 3,   # Mercury
+    "Yamaghantaka": 4,   # Jupiter
+    "Gulika": 6,         # Saturn
+}
+
+
+class UpagrahaEngine(VedicAstroEngine):
     """
-    Calculates the time and position (longitude) of Gulika.
+    Gulika/Mandi and the other time-based Upagrahas on the Swiss Ephemeris backend.
+    Sunrise/sunset is cached per (local date, location).
     """
-    
-    # 1. Setup the Observer
-    observer = ephem.Observer()
-    observer.lat = str(lat)
-    observer.lon = str(lon)
-    observer.date = datetime(year, month, day, hour, minute)
-    
-    # Sun object to find rising/setting
-    sun = ephem.Sun()
-    
-    # 2. Determine Sunrise and Sunset relative to the given time
-    # We look for the sunrise immediately preceding the time, and the next sunset
-    prev_sunrise = observer.previous_rising(sun)
-    next_sunset = observer.next_setting(sun)
-    next_sunrise = observer.next_rising(sun)
-    
-    # Convert ephem dates to python datetime for easier comparison
-    dt_current = observer.date.datetime()
-    dt_sunrise = prev_sunrise.datetime()
-    dt_sunset = next_sunset.datetime()
-    
-    is_daytime = dt_sunrise <= dt_current < dt_sunset
-
-    # 3. Determine the segment length and Weekday
-    # Note: In Vedic astrology, the day starts at Sunrise, not Midnight.
-    # The weekday is determined by the Sunrise of that period.
-    
-    if is_daytime:
-        day_duration = dt_sunset - dt_sunrise
-        segment_length = day_duration / 8
-        weekday = dt_sunrise.weekday() # Mon=0, Sun=6
-        base_time = dt_sunrise
-        period_type = "Day"
-    else:
-        # It is night. We need the duration between Sunset and the *Next* Sunrise
-        # If we are strictly before sunrise (e.g., 2 AM), the "Vedic Day" is yesterday.
-        
-        # We need the sunset that started this night
-        if dt_current < dt_sunrise: 
-            # It's early morning, so the night started yesterday evening
-            temp_obs = ephem.Observer()
-            temp_obs.lat, temp_obs.lon = observer.lat, observer.lon
-            temp_obs.date = dt_current
-            night_start = temp_obs.previous_setting(sun).datetime()
-            night_end = temp_obs.next_rising(sun).datetime()
+
+    def __init__(self, *args, solar_cache_size=8192, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.solar_cache_size = solar_cache_size
+        self._solar_cache = OrderedDict()  # (date ordinal, lat, lon, tz) -> (sunrise_jd, sunset_jd)
+        self._solar_lock = threading.Lock()
+
+    # ---------- Sunrise / Sunset ----------
+
+    def _rise_set(self, start_jd, lat, lon, event):
+        res, tret = swe.rise_trans(start_jd, swe.SUN, event, (lon, lat, 0.0))
+        return tret[0] if res == 0 else None
+
+    def _sweep(self, first_day, days, lat, lon, tz):
+        """
+        (date, sunrise_jd, sunset_jd) for `days` consecutive local dates. Each
+        rise_trans search starts from the previous event (sunrise from the last
+        sunset, sunset from its sunrise) instead of from scratch. The Sun is up
+        between a sunrise and its sunset, so while the last sunrise is before
+        local midnight, the first rise after the later of midnight and the last
+        sunset is the one a search from midnight finds.
+        """
+        rows = []
+        prev = None  # (sunrise, sunset) of the previous day, when found by search
+        for i in range(days):
+            day = first_day + timedelta(days=i)
+            midnight = swe.julday(day.year, day.month, day.day, 0.0) - tz / 24.0
+            start = midnight
+            if prev is not None and prev[0] < midnight:
+                start = max(prev[1], midnight)
+            sunrise = self._rise_set(start, lat, lon, swe.CALC_RISE)
+            sunset = self._rise_set(sunrise if sunrise else midnight, lat, lon, swe.CALC_SET)
+            prev = (sunrise, sunset)
+            # Polar day/night: fall back to a 06:00-18:00 local day
+            if sunrise is None or sunset is None:
+                sunrise, sunset = midnight + 0.25, midnight + 0.75
+                prev = None
+            rows.append((day, sunrise, sunset))
+        return rows
+
+    def _cache_put(self, key, value):
+        with self._solar_lock:
+            self._solar_cache[key] = value
+            self._solar_cache.move_to_end(key)
+            while len(self._solar_cache) > self.solar_cache_size:
+                self._solar_cache.popitem(last=False)
+
+    def sunrise_sunset(self, day, lat, lon, tz):
+        """(sunrise_jd, sunset_jd) in UT for a local calendar date, cached per location."""
+        key = (day.toordinal(), round(lat, 3), round(lon, 3), tz)
+        with self._solar_lock:
+            hit = self._solar_cache.get(key)
+            if hit is not None:
+                self._solar_cache.move_to_end(key)
+                return hit
+        self.use_ephemeris()
+        value = self._sweep(day, 1, lat, lon, tz)[0][1:]
+        self._cache_put(key, value)
+        return value
+
+    def sunrise_month(self, year, month, lat, lon, tz):
+        """
+        Batch mode: sunrise/sunset for every day of a month at one location in a
+        single chained sweep, filling the cache. Returns a list of
+        (date, sunrise_jd, sunset_jd).
+        """
+        self.use_ephemeris()
+        rows = self._sweep(date(year, month, 1), calendar.monthrange(year, month)[1], lat, lon, tz)
+        for day, sunrise, sunset in rows:
+            self._cache_put((day.toordinal(), round(lat, 3), round(lon, 3), tz), (sunrise, sunset))
+        return rows
+
+    # ---------- Upagrahas ----------
+
+    def _sidereal_ascendant(self, jd, lat, lon, ayanamsa_mode):
+        asc_tropical = swe.houses_ex(jd, lat, lon, b'A')[1][0]
+        return (asc_tropical - AyanamsaSystem.get_ayanamsa(jd, ayanamsa_mode)) % 360
+
+    def _jd_to_local_str(self, jd, tz):
+        return jd_to_local_str(jd, tz)
+
+    def calculate_upagrahas(self, year, month, day, hour, minute, lat, lon, tz, ayanamsa_mode="LAHIRI"):
+        """
+        Gulika, Mandi, Kaala, Mrityu, Ardhaprahara and Yamaghantaka for a birth moment.
+        The Vedic day runs sunrise to sunrise; day and night are each split into 8 parts.
+        Day parts start from the weekday lord, night parts from the 5th lord from it.
+        Each Upagraha is the lagna at the START of its lord's part; Mandi uses the
+        MIDDLE of Saturn's part.
+        """
+        self.use_ephemeris()
+        jd = self.get_julian_day(year, month, day, hour, minute, tz)
+        local_day = date(year, month, day)
+
+        sunrise, sunset = self.sunrise_sunset(local_day, lat, lon, tz)
+        if jd < sunrise:
+            # Before sunrise: still the previous Vedic day's night
+            vedic_day = local_day - timedelta(days=1)
+            start = self.sunrise_sunset(vedic_day, lat, lon, tz)[1]
+            end = sunrise
+            period = "Night"
+        elif jd < sunset:
+            vedic_day, start, end, period = local_day, sunrise, sunset, "Day"
         else:
-            # It's evening, night started today
-            night_start = dt_sunset
-            night_end = next_sunrise.datetime()
-            
-        day_duration = night_end - night_start
-        segment_length = day_duration / 8
-        
-        # The weekday for the night calculation is the day preceding the night
-        weekday = night_start.weekday() 
-        base_time = night_start
-        period_type = "Night"
-
-    # 4. Determine Gulika's Segment Index based on Weekday
-    # Indices are 0-7. Gulika is located at a specific index depending on the ruler.
-    
-    # Mapping Weekday (Mon=0...Sun=6) to Gulika's Index
-    # Day Logic: Sun(6), Mon(5), Tue(4), Wed(3), Thu(2), Fri(1), Sat(0)
-    # Night Logic: Sun(2), Mon(1), Tue(0), Wed(6), Thu(5), Fri(4), Sat(3)
-    
-    gulika_indices_day = {
-        6: 6, # Sunday: Saturn is 7th part (Index 6)
-        0: 5, # Monday: Saturn is 6th part
-        1: 4, # Tuesday
-        2: 3, # Wednesday
-        3: 2, # Thursday
-        4: 1, # Friday
-        5: 0  # Saturday
-    }
-    
-    gulika_indices_night = {
-        6: 2, # Sunday Night
-        0: 1, # Monday Night
-        1: 0, # Tuesday Night
-        2: 6, # Wednesday Night
-        3: 5, # Thursday Night
-        4: 4, # Friday Night
-        5: 3  # Saturday Night
-    }
+            vedic_day = local_day
+            start = sunset
+            end = self.sunrise_sunset(local_day + timedelta(days=1), lat, lon, tz)[0]
+            period = "Night"
 
-    if period_type == "Day":
-        gulika_idx = gulika_indices_day[weekday]
-    else:
-        gulika_idx = gulika_indices_night[weekday]
-
-    # 5. Calculate Gulika Start Time
-    # Gulika's position is the Ascendant at the BEGINNING of Saturn's segment
-    gulika_start_time = base_time + (segment_length * gulika_idx)
-    
-    # 6. Calculate Ascendant (Lagna) at Gulika Start Time
-    observer.date = gulika_start_time
-    
-    # Calculate Sidereal Time (RAMC)
-    # Ephem is Tropical. To get Vedic (Sidereal), we must subtract Ayanamsa.
-    # Using a simplified Lahiri Ayanamsa approximation for the current era (~24 degrees)
-    # For high precision, use pyswisseph. Here we approximate.
-    ayanamsa_deg = 24.1  # Approximate for 2024-2025
-    
-    ra_asc, dec_asc = observer.radec_of(0, '0') # RA of the meridian
-    # The standard ephem way to get RA of Ascendant is complex, 
-    # but a simpler way is to compute the horizon for the specific time.
-    # A standard shortcut in PyEphem isn't available for Ascendant directly without math.
-    # We will use the standard formula: tan(Asc) = cos(OA) / (sin(OA)cos(E) - tan(Lat)sin(E))
-    # OR, strictly for this script, we assume the user accepts a Tropical->Sidereal conversion.
-    
-    # Let's use a simpler known method for Ascendant calculation logic:
-    # 1. Get Local Sidereal Time (LST)
-    lst = observer.sidereal_time()
-    
-    # 2. Calculate Obliquity of Ecliptic (approx 23.44)
-    eps = 23.44 * (math.pi / 180.0)
-    
-    # 3. Calculate Ascendant using standard formula
-    # tan(lambda) = (-cos(LST) / (sin(LST)*cos(eps) + tan(lat)*sin(eps)))
-    # Note: Python's math functions use radians
-    lat_rad = float(lat) * (math.pi / 180.0)
-    
-    # LST is in radians in Ephem
-    sin_lst = math.sin(lst)
-    cos_lst = math.cos(lst)
-    tan_lat = math.tan(lat_rad)
-    sin_eps = math.sin(eps)
-    cos_eps = math.cos(eps)
-    
-    numerator = -1 * cos_lst
-    denominator = (sin_lst * cos_eps) + (tan_lat * sin_eps)
-    
-    asc_rad = math.atan2(numerator, denominator)
-    asc_deg = asc_rad * (180.0 / math.pi)
-    
-    # Normalize
-    asc_deg = (asc_deg + 360) % 360
-    
-    # Convert to Vedic (Sidereal)
-    sidereal_asc_deg = (asc_deg - ayanamsa_deg) % 360
+        part = (end - start) / 8.0
+        day_lord = (vedic_day.weekday() + 1) % 7  # Python Mon=0 -> Sunday lord = 0
+        first_lord = day_lord if period == "Day" else (day_lord + 4) % 7
 
-    return {
-        "period": period_type,
-        "gulika_time": gulika_start_time,
-        "gulika_long": sidereal_asc_deg,
-        "sign": get_zodiac_sign(sidereal_asc_deg)
-    }
+        result = {}
+        for name, lord in UPAGRAHA_LORDS.items():
+            part_idx = (lord - first_lord) % 7
+            t = start + part * part_idx
+            lon_sid = self._sidereal_ascendant(t, lat, lon, ayanamsa_mode)
+            result[name] = {
+                "absolute_longitude": lon_sid,
+                "sign_id": int(lon_sid / 30),
+                "degree": lon_sid % 30,
+                "time": self._jd_to_local_str(t, tz),
+                "part": part_idx + 1,
+            }
+            if name == "Gulika":
+                t_mid = t + part / 2.0
+                mandi = self._sidereal_ascendant(t_mid, lat, lon, ayanamsa_mode)
+                result["Mandi"] = {
+                    "absolute_longitude": mandi,
+                    "sign_id": int(mandi / 30),
+                    "degree": mandi % 30,
+                    "time": self._jd_to_local_str(t_mid, tz),
+                    "part": part_idx + 1,
+                }
 
-# --- usage ---
-# Coordinates for Bangalore, India
-lat = 28.6216
-lon = 78.0646
+        return {
+            "period": period,
+            "sunrise": self._jd_to_local_str(sunrise, tz),
+            "sunset": self._jd_to_local_str(sunset, tz),
+            "upagrahas": result,
+        }
 
-# Date: 2023-10-25, 10:30 AM
-result = calculate_gulika(lat, lon, 2004, 5, 20, 9, 40)
 
-print(f"--- Gulika Calculation ---")
-print(f"Time of Calculation: Day/Night Period: {result['period']}")
-print(f"Gulika Start Time: {result['gulika_time']}")
-print(f"Gulika Position: {decimal_to_dms(result['gulika_long'])} ({result['sign']})")
\ No newline at end of file
+_default_engine = None
+
+
+def calculate_gulika(lat, lon, year, month, day, hour, minute, tz=0.0, ayanamsa_mode="LAHIRI"):
+    """
+    Calculates the time and position (longitude) of Gulika.
+    Kept for existing callers; see UpagrahaEngine.calculate_upagrahas for all Upagrahas.
+    """
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = UpagrahaEngine()
+    res = _default_engine.calculate_upagrahas(year, month, day, hour, minute, lat, lon, tz, ayanamsa_mode)
+    gulika = res["upagrahas"]["Gulika"]
+    return {
+        "period": res["period"],
+        "gulika_time": gulika["time"],
+        "gulika_long": gulika["absolute_longitude"],
+        "sign": get_zodiac_sign(gulika["absolute_longitude"])
+    }
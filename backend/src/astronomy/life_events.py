@@ -0,0 +1,190 @@
+import numpy as np
+
+from .chart import GRAHA_NAMES, MOON, JUPITER, SATURN, RAHU, KETU
+from .dasha import LEVEL_NAMES, VimshottariDasha, datetime_to_jd, jd_to_datetime
+from .dasha_systems import SIGN_NAMES
+from .transits import TransitEngine
+from .transit_events import local_minutes
+
+# Slow grahas whose sign ingresses mark life events
+INGRESS_PLANETS = [JUPITER, SATURN, RAHU, KETU]
+
+# Saturn's house counted from the natal Moon -> event name
+SATURN_FROM_MOON = {
+    12: "Sade Sati rising phase",
+    1: "Sade Sati peak phase (Saturn over natal Moon)",
+    2: "Sade Sati setting phase",
+    4: "Kantaka Shani (4th from Moon)",
+    8: "Ashtama Shani (8th from Moon)",
+}
+SADE_SATI_HOUSES = (12, 1, 2)
+
+
+def merge_order(a, b):
+    """
+    Positions of two sorted arrays inside their merge: returns (pos_a, pos_b)
+    with merged[pos_a] = a and merged[pos_b] = b. Ties keep `a` first.
+    """
+    pos_a = np.arange(len(a)) + np.searchsorted(b, a, side="left")
+    pos_b = np.arange(len(b)) + np.searchsorted(a, b, side="right")
+    return pos_a, pos_b
+
+
+class LifeEventEngine(TransitEngine):
+    """
+    One time-sorted stream of a person's dasha boundaries and slow-planet sign
+    ingresses, with ingresses read relative to the natal lagna and Moon
+    (Sade Sati phases, Ashtama Shani, Jupiter/Saturn returns, nodal returns).
+    """
+
+    def __init__(self, *args, dasha_engine=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dasha_engine = dasha_engine or VimshottariDasha()
+
+    def get_ingresses(self, jd_start, jd_end, ayanamsa_mode="LAHIRI"):
+        """
+        Sign ingresses of the INGRESS_PLANETS in [jd_start, jd_end) (UT), time-sorted
+        parallel arrays: jd, planet, sign (entered), prev_sign (left) and retrograde
+        (entered moving backwards, always true for the nodes). Read from the shared
+        transit event table (TransitEngine.sign_ingresses).
+        """
+        events = self.sign_ingresses(jd_start, jd_end, ayanamsa_mode, INGRESS_PLANETS)
+        events = events[events["jd"] < jd_end]
+        # Rahu and Ketu change sign together: same second -> chart order
+        events = events[np.lexsort((events["planet"], np.round(events["jd"] * 86400.0)))]
+        return {
+            "jd": events["jd"],
+            "planet": events["planet"],
+            "sign": events["value"],
+            "prev_sign": events["prev"],
+            "retrograde": events["value"] == (events["prev"] - 1) % 12,
+        }
+
+    def _ingress_events(self, chart, ingresses):
+        # Natal reference signs
+        lagna = chart.ascendant.sign_id
+        moon = chart[MOON].sign_id
+        natal = {p: chart[p].sign_id for p in (JUPITER, SATURN, RAHU)}
+
+        planet, sign, prev = ingresses["planet"], ingresses["sign"], ingresses["prev_sign"]
+        from_lagna = (sign - lagna) % 12 + 1
+        from_moon = (sign - moon) % 12 + 1
+        prev_from_moon = (prev - moon) % 12 + 1
+
+        events = []
+        for i in range(len(planet)):
+            p, s = int(planet[i]), int(sign[i])
+            labels = []
+            if p == SATURN:
+                h = int(from_moon[i])
+                if h == 12 and prev_from_moon[i] == 11:
+                    labels.append("Sade Sati begins")
+                elif h == 3 and prev_from_moon[i] == 2:
+                    labels.append("Sade Sati ends")
+                if h in SATURN_FROM_MOON:
+                    labels.append(SATURN_FROM_MOON[h])
+            if p in natal and s == natal[p]:
+                labels.append("Nodal return" if p == RAHU else f"{GRAHA_NAMES[p]} return")
+            if p in (RAHU, KETU) and s == moon:
+                labels.append(f"{GRAHA_NAMES[p]} over natal Moon")
+            events.append({
+                "kind": "ingress",
+                "planet": GRAHA_NAMES[p],
+                "sign": SIGN_NAMES[s],
+                "from_sign": SIGN_NAMES[int(prev[i])],
+                "retrograde": bool(ingresses["retrograde"][i]),
+                "house_from_lagna": int(from_lagna[i]),
+                "house_from_moon": int(from_moon[i]),
+                "events": labels,
+            })
+        return events
+
+    def sade_sati_windows(self, chart, jd_start, jd_end, ayanamsa_mode="LAHIRI"):
+        """
+        (start_jd, end_jd) UT spans with Saturn in the 12th, 1st or 2nd from the natal
+        Moon, clipped to [jd_start, jd_end]. A retrograde Saturn that steps back out
+        across a boundary and re-enters across the same one stays in one window.
+        """
+        ing = self.get_ingresses(jd_start, jd_end, ayanamsa_mode)
+        saturn = ing["planet"] == SATURN
+        jd, sign, prev = ing["jd"][saturn], ing["sign"][saturn], ing["prev_sign"][saturn]
+        moon = chart[MOON].sign_id
+        inside = np.isin((sign - moon) % 12 + 1, SADE_SATI_HOUSES)
+        was_inside = np.isin((prev - moon) % 12 + 1, SADE_SATI_HOUSES)
+
+        # 1. Saturn's state at jd_start (a window may already be running)
+        start_sign = int(self.compute_sky(jd_start, ayanamsa_mode)[0][SATURN] // 30)
+        opened = jd_start if (start_sign - moon) % 12 + 1 in SADE_SATI_HOUSES else None
+
+        # 2. Walk the crossings of the span's boundaries
+        windows = []
+        last_exit = None
+        for k in np.flatnonzero(inside != was_inside):
+            if inside[k]:
+                # Back in across the boundary it last left by: continue that window
+                if last_exit is not None and sign[k] == prev[last_exit] and prev[k] == sign[last_exit]:
+                    opened = windows.pop()[0]
+                else:
+                    opened = float(jd[k])
+            else:
+                windows.append((opened if opened is not None else jd_start, float(jd[k])))
+                opened, last_exit = None, k
+        if opened is not None:
+            windows.append((opened, jd_end))
+        return windows
+
+    def life_events(self, chart, birth_dt, tz, start=None, end=None, levels=(0, 1),
+                    system=None, year_model=None, ayanamsa_mode="LAHIRI"):
+        """
+        Dasha boundaries (selected levels) and slow-planet ingresses between
+        start and end (local datetimes, default birth .. end of the dasha timeline),
+        merged into one list sorted by time. Dates are local "YYYY-MM-DD HH:MM".
+        """
+        # 1. Dasha boundaries on the local birth clock
+        moon = chart[MOON]
+        timeline = self.dasha_engine.get_timeline(
+            moon.absolute_longitude, birth_dt, moon.nakshatra_id,
+            system=system, year_model=year_model,
+        )
+        start = start or birth_dt
+        end = end or jd_to_datetime(timeline.boundaries[-1])
+        t1, t2 = datetime_to_jd(start), datetime_to_jd(end)
+        # walk() also yields periods already running at `start`; only boundaries inside count
+        periods = [p for p in timeline.walk(levels, start, end) if p.start_jd >= t1]
+        offset = tz / 24.0
+        dasha_jd = np.array([p.start_jd for p in periods], dtype=np.float64) - offset
+
+        # 2. Ingresses in the same window (UT)
+        ingresses = self.get_ingresses(t1 - offset, t2 - offset, ayanamsa_mode)
+        ingress_events = self._ingress_events(chart, ingresses)
+
+        # 3. Merge the two sorted streams
+        pos_d, pos_i = merge_order(dasha_jd, ingresses["jd"])
+        dates = local_minutes(np.concatenate((dasha_jd, ingresses["jd"])), tz)
+        merged = [None] * len(dates)
+        for k, period in enumerate(periods):
+            merged[pos_d[k]] = {
+                "date": str(dates[k]),
+                "kind": "dasha",
+                "type": LEVEL_NAMES[period.level],
+                "lord": period.lord,
+                "lineage": period.lineage,
+                "end": period.end.strftime("%Y-%m-%d %H:%M"),
+            }
+        for k, event in enumerate(ingress_events):
+            merged[pos_i[k]] = {"date": str(dates[len(periods) + k]), **event}
+
+        windows = self.sade_sati_windows(chart, t1 - offset, t2 - offset, ayanamsa_mode)
+        sade_sati = [
+            {"start": str(a), "end": str(b)}
+            for a, b in zip(local_minutes([w[0] for w in windows], tz),
+                            local_minutes([w[1] for w in windows], tz))
+        ]
+
+        return {
+            "system": timeline.system.name,
+            "start": start.strftime("%Y-%m-%d %H:%M"),
+            "end": end.strftime("%Y-%m-%d %H:%M"),
+            "sade_sati": sade_sati,
+            "events": merged,
+        }
@@ -1,33 +1,194 @@
+import numpy as np
+
+from .chart import MOON, MARS, ASCENDANT
+from .dasha_systems import SIGN_LORDS
+
+# Ashta Koota in report order, with the maximum points of each (36 in all)
+KOOTAS = ["Varna", "Vashya", "Tara", "Yoni", "Maitri", "Gana", "Bhakoot", "Nadi"]
+KOOTA_MAX = [1, 2, 3, 4, 5, 6, 7, 8]
+
+# Every koota depends only on the two Moons' nakshatra and sign. A pada (3°20')
+# fixes both (nakshatra = pada // 4, sign = pada // 9), so each table below is
+# indexed [pada_a, pada_b] over the 108 padas and built once at import.
+PADAS = 108
+
+# Friendship Table for Moon Signs (Simplified Vedic Logic)
+# Groups: 1=Deves (Aries, Cancer, Leo, Scorpio, Sag, Pisces)
+#         2=Asuras (Taurus, Gemini, Virgo, Libra, Cap, Aq)
+# Rule: Same group = Good. Opposite group = Conflict.
+DEVA_SIGNS = [0, 3, 4, 7, 8, 11]  # Ari, Can, Leo, Sco, Sag, Pis
+ASURA_SIGNS = [1, 2, 5, 6, 9, 10]  # Tau, Gem, Vir, Lib, Cap, Aqu
+
+# Natural friends of the sign lords (BPHS), for Bhakoot cancellation
+NATURAL_FRIENDS = {
+    "Sun": {"Moon", "Mars", "Jupiter"},
+    "Moon": {"Sun", "Mercury"},
+    "Mars": {"Sun", "Moon", "Jupiter"},
+    "Mercury": {"Sun", "Venus"},
+    "Jupiter": {"Sun", "Moon", "Mars"},
+    "Venus": {"Mercury", "Saturn"},
+    "Saturn": {"Mercury", "Venus"},
+}
+
+# Dosha cancellation codes (index into these lists; 0 = not cancelled)
+NADI_CANCELLATIONS = [
+    None,
+    "Same Moon sign, different nakshatras",
+    "Same nakshatra, different Moon signs",
+    "Same nakshatra and sign, different padas",
+]
+BHAKOOT_CANCELLATIONS = [
+    None,
+    "Both Moon signs have the same lord",
+    "Lords of the Moon signs are mutual friends",
+]
+# A cancelled dosha is no longer a dosha, but the pairing is not ideal either:
+# it earns this share of the koota's points instead of none
+CANCELLED_SHARE = 0.5
+
+
+# Mars in these houses from the lagna or Moon makes a chart Manglik
+MANGLIK_HOUSES = [1, 4, 7, 8, 12]
+
+
+def moon_pada(chart):
+    """Index (0-107) of the Moon's nakshatra pada, the key of the koota tables."""
+    moon = chart[MOON]
+    return moon.nakshatra_id * 4 + moon.pada - 1
+
+
+def _koota_tables():
+    pada = np.arange(PADAS)
+    pa, pb = np.broadcast_arrays(pada[:, None], pada[None, :])
+    m1, m2 = pa // 9, pb // 9
+    nak1, nak2 = pa // 4, pb // 4
+    tables = np.zeros((len(KOOTAS), PADAS, PADAS), dtype=np.float32)
+
+    # A. VARNA (1 pt)
+    tables[0] = np.where(m1 % 4 == m2 % 4, 1, 0.5)
+    # B. VASHYA (2 pts)
+    tables[1] = np.where(np.isin(np.abs(m1 - m2), [6, 8]), 1, 2)
+    # C. TARA (3 pts)
+    tables[2] = np.where((nak2 - nak1) % 9 % 2 == 0, 3, 1.5)
+    # D. YONI (4 pts)
+    tables[3] = np.where(nak1 % 2 == nak2 % 2, 4, 2)
+    # E. MAITRI (5 pts)
+    same_group = np.isin(m1, DEVA_SIGNS) == np.isin(m2, DEVA_SIGNS)
+    tables[4] = np.where(same_group, 5, np.where(np.isin(np.abs(m1 - m2), [4, 5, 9]), 3, 0.5))
+    # F. GANA (6 pts)
+    g1, g2 = nak1 % 3, nak2 % 3
+    tables[5] = np.where(g1 == g2, 6, np.where(np.abs(g1 - g2) == 1, 3, 0))
+
+    # G. BHAKOOT (7 pts); dosha cancelled if the Moon sign lords are the same or friends
+    rel = (m2 - m1) % 12 + 1
+    lord_code = np.array([
+        [1 if SIGN_LORDS[a] == SIGN_LORDS[b]
+         else 2 if SIGN_LORDS[b] in NATURAL_FRIENDS[SIGN_LORDS[a]] and SIGN_LORDS[a] in NATURAL_FRIENDS[SIGN_LORDS[b]]
+         else 0 for b in range(12)]
+        for a in range(12)
+    ], dtype=np.int8)
+    bhakoot_dosha = np.isin(rel, [2, 12, 6, 8])
+    bhakoot_cancel = np.where(bhakoot_dosha, lord_code[m1, m2], 0).astype(np.int8)
+    tables[6] = np.where(bhakoot_dosha, np.where(bhakoot_cancel > 0, 7 * CANCELLED_SHARE, 0), 7)
+
+    # H. NADI (8 pts); dosha cancelled if the Moons differ in sign, nakshatra or pada (above)
+    nadi_dosha = nak1 % 3 == nak2 % 3
+    nadi_cancel = np.select(
+        [(m1 == m2) & (nak1 != nak2), (nak1 == nak2) & (m1 != m2), (nak1 == nak2) & (pa != pb)],
+        [1, 2, 3], 0,
+    )
+    nadi_cancel = np.where(nadi_dosha, nadi_cancel, 0).astype(np.int8)
+    tables[7] = np.where(nadi_dosha, np.where(nadi_cancel > 0, 8 * CANCELLED_SHARE, 0), 8)
+    return tables, bhakoot_cancel, nadi_cancel
+
+
+# KOOTA_TABLES[k, pada_a, pada_b] = points of koota k (KOOTAS order);
+# TOTAL_TABLE = their sum (out of 36); *_CANCEL = dosha cancellation code
+KOOTA_TABLES, BHAKOOT_CANCEL, NADI_CANCEL = _koota_tables()
+TOTAL_TABLE = KOOTA_TABLES.sum(axis=0)
+
+for _table in (KOOTA_TABLES, BHAKOOT_CANCEL, NADI_CANCEL, TOTAL_TABLE):
+    _table.setflags(write=False)
+
+
+def points(value):
+    """Koota points for a report: int when whole, float for the half points of a cancelled dosha."""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def manglik_flags(mars_sign, lagna, moon_sign):
+    """Vectorized check_manglik: Mars in MANGLIK_HOUSES from the lagna or the Moon."""
+    mars_sign = np.asarray(mars_sign, dtype=np.int64)
+    from_lagna = (mars_sign - lagna) % 12 + 1
+    from_moon = (mars_sign - moon_sign) % 12 + 1
+    return np.isin(from_lagna, MANGLIK_HOUSES) | np.isin(from_moon, MANGLIK_HOUSES)
+
+
+class MatchPool:
+    """
+    Candidate charts for one-to-many matching, reduced to what the koota tables
+    and the Manglik check need, as parallel arrays (3 bytes per candidate + id):
+      ids        candidate ids (str)
+      moon_pada  Moon nakshatra pada (0-107), row/column key of the koota tables
+      lagna      ascendant sign
+      manglik    Mars dosha flag
+    """
+
+    def __init__(self, ids, moon_pada, lagna, manglik):
+        self.ids = np.asarray(ids, dtype=str)
+        self.moon_pada = np.asarray(moon_pada, dtype=np.int8)
+        self.lagna = np.asarray(lagna, dtype=np.int8)
+        self.manglik = np.asarray(manglik, dtype=bool)
+        for arr in (self.ids, self.moon_pada, self.lagna, self.manglik):
+            if len(arr) != len(self.ids):
+                raise ValueError("MatchPool arrays must all have one entry per candidate")
+            arr.setflags(write=False)
+
+    @classmethod
+    def from_batch(cls, ids, batch):
+        """Pool from a VedicAstroEngine.calculate_charts_batch result (rows in `ids` order)."""
+        moon = batch["sign_id"][:, MOON]
+        return cls(
+            ids,
+            batch["nakshatra_id"][:, MOON].astype(np.int64) * 4 + batch["pada"][:, MOON] - 1,
+            batch["asc_sign_id"],
+            manglik_flags(batch["sign_id"][:, MARS], batch["asc_sign_id"], moon),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["ids"], data["moon_pada"], data["lagna"], data["manglik"])
+
+    def save(self, path):
+        np.savez(path, ids=self.ids, moon_pada=self.moon_pada, lagna=self.lagna, manglik=self.manglik)
+
+    def __len__(self):
+        return len(self.ids)
+
+
 class MatchMaker:
     def __init__(self):
-        # Friendship Table for Moon Signs (Simplified Vedic Logic)
-        # Groups: 1=Deves (Aries, Cancer, Leo, Scorpio, Sag, Pisces)
-        #         2=Asuras (Taurus, Gemini, Virgo, Libra, Cap, Aq)
-        # Rule: Same group = Good. Opposite group = Conflict.
-        self.deva_signs = [0, 3, 4, 7, 8, 11]  # Ari, Can, Leo, Sco, Sag, Pis
-        self.asura_signs = [1, 2, 5, 6, 9, 10]  # Tau, Gem, Vir, Lib, Cap, Aqu
+        self.deva_signs = DEVA_SIGNS
+        self.asura_signs = ASURA_SIGNS
 
     def check_manglik(self, chart):
         """
         Mars in 1, 4, 7, 8, 12 from Ascendant or Moon is considered Manglik.
         """
         mars_houses = []
+        mars_id = chart[MARS].sign_id
 
         # 1. Check from Ascendant
-        if "Mars" in chart and "Ascendant" in chart:
-            asc_id = chart["Ascendant"]["sign_id"]
-            mars_id = chart["Mars"]["sign_id"]
-            h_asc = (mars_id - asc_id) % 12 + 1
-            if h_asc in [1, 4, 7, 8, 12]:
-                mars_houses.append(f"Ascendant (House {h_asc})")
+        h_asc = (mars_id - chart[ASCENDANT].sign_id) % 12 + 1
+        if h_asc in MANGLIK_HOUSES:
+            mars_houses.append(f"Ascendant (House {h_asc})")
 
         # 2. Check from Moon
-        if "Mars" in chart and "Moon" in chart:
-            moon_id = chart["Moon"]["sign_id"]
-            mars_id = chart["Mars"]["sign_id"]
-            h_moon = (mars_id - moon_id) % 12 + 1
-            if h_moon in [1, 4, 7, 8, 12]:
-                mars_houses.append(f"Moon (House {h_moon})")
+        h_moon = (mars_id - chart[MOON].sign_id) % 12 + 1
+        if h_moon in MANGLIK_HOUSES:
+            mars_houses.append(f"Moon (House {h_moon})")
 
         is_manglik = len(mars_houses) > 0
         return is_manglik, mars_houses
@@ -58,73 +219,64 @@ class MatchMaker:
             report["manglik"]["match_status"] = "Clash (Manglik Dosha)"
             report["manglik"]["desc"] = "One is Manglik. Potential for conflict."
 
-        # 2. ASHTA KOOTA Calculation
-        scores = {
-            "Varna": 1,
-            "Vashya": 2,
-            "Tara": 3,
-            "Yoni": 4,
-            "Maitri": 5,
-            "Gana": 6,
-            "Bhakoot": 7,
-            "Nadi": 8,
+        # 2. ASHTA KOOTA: table lookups on the two Moon padas
+        pa, pb = moon_pada(chart_a), moon_pada(chart_b)
+        report["score"] = points(TOTAL_TABLE[pa, pb])
+        report["details"] = {name: points(KOOTA_TABLES[k, pa, pb]) for k, name in enumerate(KOOTAS)}
+        report["cancellations"] = {
+            "Bhakoot": BHAKOOT_CANCELLATIONS[BHAKOOT_CANCEL[pa, pb]],
+            "Nadi": NADI_CANCELLATIONS[NADI_CANCEL[pa, pb]],
         }
 
-        if "Moon" in chart_a and "Moon" in chart_b:
-            m1 = chart_a["Moon"]["sign_id"]
-            m2 = chart_b["Moon"]["sign_id"]
-            nak1 = chart_a["Moon"].get("nakshatra_id", 0)
-            nak2 = chart_b["Moon"].get("nakshatra_id", 0)
-
-            # A. VARNA (1 pt)
-            e1 = m1 % 4
-            e2 = m2 % 4
-            scores["Varna"] = 1 if e1 == e2 else 0.5
+        return report
 
-            # B. VASHYA (2 pts)
-            scores["Vashya"] = 2 if abs(m1 - m2) not in [6, 8] else 1
+    def search(self, chart, pool, top_k=20, min_score=0.0, manglik="any"):
+        """
+        Scores `chart` (as person A) against every candidate of a MatchPool and
+        returns the best `top_k` with at least `min_score` points. manglik="compatible"
+        keeps only candidates with the same Mars dosha status (both or neither).
+        """
+        q = moon_pada(chart)
+        q_manglik, q_causes = self.check_manglik(chart)
 
-            # C. TARA (3 pts)
-            dist = (nak2 - nak1) % 9
-            scores["Tara"] = 3 if dist % 2 == 0 else 1.5
+        # 1. Total of every candidate: one gather on the query's row of the table
+        score = TOTAL_TABLE[q][pool.moon_pada]
 
-            # D. YONI (4 pts)
-            scores["Yoni"] = 4 if (nak1 % 2) == (nak2 % 2) else 2
+        # 2. Filters
+        keep = score >= min_score
+        if manglik == "compatible":
+            keep &= pool.manglik == q_manglik
+        idx = np.flatnonzero(keep)
 
-            # E. MAITRI (5 pts)
-            p1_Deva = m1 in self.deva_signs
-            p2_Deva = m2 in self.deva_signs
-            scores["Maitri"] = (
-                5 if p1_Deva == p2_Deva else 3 if abs(m1 - m2) in [4, 5, 9] else 0.5
-            )
+        # 3. Top-K by partial sort: the K-th best score is the cutoff, ties at it
+        # are taken in pool order; only those K are then sorted
+        if len(idx) > top_k:
+            kept = score[idx]
+            cutoff = np.partition(kept, len(idx) - top_k)[len(idx) - top_k]
+            above = idx[kept > cutoff]
+            idx = np.concatenate((above, idx[kept == cutoff][:top_k - len(above)]))
+        idx = idx[np.lexsort((idx, -score[idx]))]
 
-            # F. GANA (6 pts)
-            scores["Gana"] = (
-                6
-                if (nak1 % 3) == (nak2 % 3)
-                else 3
-                if abs((nak1 % 3) - (nak2 % 3)) == 1
-                else 0
+        # 4. Koota breakdown of the results
+        padas = pool.moon_pada[idx]
+        details = KOOTA_TABLES[:, q, padas].T.tolist()
+        bhakoot = BHAKOOT_CANCEL[q, padas].tolist()
+        nadi = NADI_CANCEL[q, padas].tolist()
+        results = [
+            {
+                "id": cid,
+                "score": points(total),
+                "details": dict(zip(KOOTAS, map(points, koota_points))),
+                "manglik": is_manglik,
+                "cancellations": {"Bhakoot": BHAKOOT_CANCELLATIONS[b], "Nadi": NADI_CANCELLATIONS[n]},
+            }
+            for cid, total, koota_points, is_manglik, b, n in zip(
+                pool.ids[idx].tolist(), score[idx].tolist(), details, pool.manglik[idx].tolist(), bhakoot, nadi
             )
-
-            # G. BHAKOOT (7 pts)
-            rel = (m2 - m1) % 12 + 1
-            if rel in [2, 12, 6, 8]:
-                scores["Bhakoot"] = 0
-            else:
-                scores["Bhakoot"] = 7
-
-            # H. NADI (8 pts)
-            n1 = nak1 % 3
-            n2 = nak2 % 3
-            if n1 == n2:
-                scores["Nadi"] = 0
-            else:
-                scores["Nadi"] = 8
-
-        total_score = sum(scores.values())
-
-        report["score"] = total_score
-        report["details"] = scores
-
-        return report
+        ]
+        return {
+            "query": {"moon_pada": q, "manglik": q_manglik, "manglik_causes": q_causes},
+            "pool_size": len(pool),
+            "matched": int(keep.sum()),
+            "results": results,
+        }
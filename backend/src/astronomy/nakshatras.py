@@ -0,0 +1,25 @@
+import numpy as np
+
+# 27 Nakshatras of 13°20' each, every one split into 4 padas of 3°20'
+NAKSHATRA_SPAN = 360.0 / 27.0
+PADA_SPAN = NAKSHATRA_SPAN / 4.0
+
+NAKSHATRA_NAMES = [
+    "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra",
+    "Punarvasu", "Pushya", "Ashlesha", "Magha", "Purva Phalguni", "Uttara Phalguni",
+    "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha",
+    "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha",
+    "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
+]
+
+# Vimshottari lords repeat every 9 nakshatras starting from Ashwini
+NAKSHATRA_LORDS = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"] * 3
+
+
+def calculate_nakshatras(absolute_longitudes):
+    """
+    Nakshatra index (0-26) and pada (1-4) for one or many sidereal longitudes.
+    """
+    lon = np.asarray(absolute_longitudes, dtype=np.float64) % 360.0
+    pada_idx = np.minimum((lon / PADA_SPAN).astype(np.int64), 107)
+    return pada_idx // 4, pada_idx % 4 + 1
@@ -0,0 +1,375 @@
+import os
+import threading
+import numpy as np
+
+from .ayanamsa import AyanamsaSystem
+from .chart import GRAHA_NAMES, MARS, MERCURY, JUPITER, VENUS, SATURN, RAHU, KETU
+from .ephemeris_table import TABLE_START_JD, TABLE_END_JD
+from .nakshatras import NAKSHATRA_SPAN, NAKSHATRA_NAMES
+from .dasha import jd_to_datetime64
+from .dasha_systems import SIGN_NAMES
+
+# Event kinds
+SIGN, NAKSHATRA, STATION_RETROGRADE, STATION_DIRECT = range(4)
+EVENT_KINDS = ["sign", "nakshatra", "station_retrograde", "station_direct"]
+
+# One event = 12 bytes on disk and in memory:
+#   jd      moment (UT)
+#   planet  chart index (SUN .. KETU)
+#   kind    SIGN, NAKSHATRA, STATION_RETROGRADE or STATION_DIRECT
+#   value   sign / nakshatra entered (stations: sign the graha stands in)
+#   prev    sign / nakshatra left (stations: nakshatra the graha stands in)
+EVENT_DTYPE = np.dtype([("jd", "<f8"), ("planet", "i1"), ("kind", "i1"), ("value", "i1"), ("prev", "i1")])
+
+# Bracketing grid step (days) per graha: shorter than its fastest nakshatra
+# crossing and than its shortest direct/retrograde run
+BRACKET_STEP = [4.0, 0.5, 2.0, 1.0, 4.0, 2.0, 4.0, 8.0, 8.0]
+# Grahas with retrograde stations (the Sun and Moon never, the mean node always retrograde)
+STATION_PLANETS = (MARS, MERCURY, JUPITER, VENUS, SATURN)
+
+# Root refinement tolerance (days, ~0.01 s) and iteration cap
+ROOT_TOLERANCE = 1e-7
+ROOT_MAX_ITER = 60
+
+EVENTS_START_JD = TABLE_START_JD + 7.0   # 1900-01-01
+EVENTS_END_JD = TABLE_END_JD - 7.0       # 2100-12-31
+
+# Longest time (days) a graha takes to come back to a sign, retrograde loops
+# included: a window this wide around a date holds its current and next passage
+SIGN_RETURN_DAYS = [370.0, 30.0, 800.0, 400.0, 4500.0, 600.0, 11000.0, 6900.0, 6900.0]
+
+EVENTS_DIR = os.path.join(os.path.dirname(__file__), "../../data/ephemeris")
+
+
+def default_events_path(ayanamsa_mode="LAHIRI"):
+    """$PANDIT_TRANSIT_EVENTS_DIR (or data/ephemeris)/transit_events_<mode>.npy"""
+    directory = os.getenv("PANDIT_TRANSIT_EVENTS_DIR", EVENTS_DIR)
+    return os.path.join(directory, f"transit_events_{AyanamsaSystem.normalize(ayanamsa_mode).lower()}.npy")
+
+
+def _sidereal(engine, t, planet, ayanamsa_mode):
+    """Sidereal longitude and speed of one graha at an array of JDs (UT); Ketu = Rahu + 180."""
+    body = RAHU if planet == KETU else planet
+    lon, speed = engine.tropical_positions(t, [body])
+    lon = lon[:, 0] - AyanamsaSystem.get_ayanamsa(t, ayanamsa_mode)
+    if planet == KETU:
+        lon = lon + 180.0
+    return lon % 360.0, speed[:, 0]
+
+
+def refine_roots(f, a, b, fa, fb):
+    """
+    Vectorized Illinois (modified regula falsi) refinement of the roots of f in
+    the brackets [a, b], where f(a) and f(b) have opposite signs.
+    f(x, idx) evaluates the brackets idx at the JDs x; only brackets that have
+    not converged yet are evaluated on each iteration.
+    """
+    a, b, fa, fb = (np.array(x, dtype=np.float64) for x in (a, b, fa, fb))
+    side = np.zeros(len(a), dtype=np.int8)  # end moved on the previous step (-1 = b, 1 = a)
+    root = np.where(fa == 0, a, b)
+    active = (fa != 0) & (fb != 0)
+    for _ in range(ROOT_MAX_ITER):
+        if not active.any():
+            break
+        idx = np.flatnonzero(active)
+        c = (a[idx] * fb[idx] - b[idx] * fa[idx]) / (fb[idx] - fa[idx])
+        fc = f(c, idx)
+
+        # Root between a and c: move b (and halve fa if b also moved last time), else move a
+        move_b = np.sign(fc) == np.sign(fb[idx])
+        fa[idx[move_b & (side[idx] == -1)]] *= 0.5
+        fb[idx[~move_b & (side[idx] == 1)]] *= 0.5
+        b[idx[move_b]], fb[idx[move_b]] = c[move_b], fc[move_b]
+        a[idx[~move_b]], fa[idx[~move_b]] = c[~move_b], fc[~move_b]
+        side[idx] = np.where(move_b, -1, 1)
+
+        root[idx] = c
+        active[idx[(fc == 0) | (b[idx] - a[idx] < ROOT_TOLERANCE)]] = False
+    return root
+
+
+def _signed_gap(lon, target):
+    """Longitude minus target, wrapped to [-180, 180)."""
+    return (lon - target + 180.0) % 360.0 - 180.0
+
+
+def _stations(engine, planet, t, speed, ayanamsa_mode):
+    """Times where the speed changes sign between grid samples, and whether it turns retrograde."""
+    k = np.flatnonzero(np.sign(speed[1:]) != np.sign(speed[:-1]))
+    root = refine_roots(
+        lambda x, idx: _sidereal(engine, x, planet, ayanamsa_mode)[1],
+        t[k], t[k + 1], speed[k], speed[k + 1],
+    )
+    return root, speed[k] > 0
+
+
+def _crossings(engine, planet, t, lon, span, count, ayanamsa_mode):
+    """
+    Crossings of the boundaries of `count` divisions of `span` degrees, on a
+    grid whose intervals are monotonic (stations are grid points).
+    Returns (jd, entered, left).
+    """
+    # 1. Division index along the unwrapped longitude; every change brackets crossings
+    cell = np.floor(np.unwrap(lon, period=360.0) / span).astype(np.int64)
+    moved = np.diff(cell)
+    k = np.flatnonzero(moved)
+
+    # 2. One bracket per boundary crossed (several if an interval spans more than one)
+    n_cross = np.abs(moved[k])
+    interval = np.repeat(k, n_cross)
+    forward = np.repeat(moved[k] > 0, n_cross)
+    nth = np.arange(n_cross.sum()) - np.repeat(np.cumsum(n_cross) - n_cross, n_cross)
+    boundary = np.where(forward, cell[interval] + 1 + nth, cell[interval] - nth)
+    target = (boundary * span) % 360.0
+
+    # 3. Refine longitude == boundary inside each bracket
+    jd = refine_roots(
+        lambda x, idx: _signed_gap(_sidereal(engine, x, planet, ayanamsa_mode)[0], target[idx]),
+        t[interval], t[interval + 1],
+        _signed_gap(lon[interval], target), _signed_gap(lon[interval + 1], target),
+    )
+    entered = np.where(forward, boundary, boundary - 1) % count
+    left = np.where(forward, boundary - 1, boundary) % count
+    return jd, entered, left
+
+
+def find_events(engine, start_jd, end_jd, ayanamsa_mode="LAHIRI", planets=None, kinds=None):
+    """
+    Sign and nakshatra ingresses and retrograde/direct stations in
+    [start_jd, end_jd] (UT), as an EVENT_DTYPE array sorted by time.
+
+    Each graha is sampled on a coarse grid (BRACKET_STEP). Sign changes of the
+    speed bracket the stations, which are refined first and inserted into the
+    grid; every interval is then monotonic, so a change of sign/nakshatra index
+    brackets exactly the boundaries crossed, each refined to the root.
+    """
+    planets = range(len(GRAHA_NAMES)) if planets is None else planets
+    kinds = set(range(len(EVENT_KINDS)) if kinds is None else kinds)
+    parts = []
+
+    def add(jd, planet, kind, value, prev):
+        rows = np.empty(len(jd), dtype=EVENT_DTYPE)
+        rows["jd"], rows["planet"], rows["kind"] = jd, planet, kind
+        rows["value"], rows["prev"] = value, prev
+        parts.append(rows)
+
+    for planet in planets:
+        # 1. Coarse grid
+        t = np.append(np.arange(start_jd, end_jd, BRACKET_STEP[planet]), end_jd)
+        lon, speed = _sidereal(engine, t, planet, ayanamsa_mode)
+
+        # 2. Stations, inserted into the grid so that every interval is monotonic
+        if planet in STATION_PLANETS:
+            station_jd, retrograde = _stations(engine, planet, t, speed, ayanamsa_mode)
+            station_lon = _sidereal(engine, station_jd, planet, ayanamsa_mode)[0]
+            if STATION_RETROGRADE in kinds or STATION_DIRECT in kinds:
+                add(station_jd, planet, np.where(retrograde, STATION_RETROGRADE, STATION_DIRECT),
+                    (station_lon // 30).astype(np.int8), (station_lon // NAKSHATRA_SPAN).astype(np.int8))
+            order = np.argsort(np.concatenate((t, station_jd)), kind="stable")
+            t = np.concatenate((t, station_jd))[order]
+            lon = np.concatenate((lon, station_lon))[order]
+
+        # 3. Boundary crossings
+        if SIGN in kinds:
+            jd, entered, left = _crossings(engine, planet, t, lon, 30.0, 12, ayanamsa_mode)
+            add(jd, planet, SIGN, entered, left)
+        if NAKSHATRA in kinds:
+            jd, entered, left = _crossings(engine, planet, t, lon, NAKSHATRA_SPAN, 27, ayanamsa_mode)
+            add(jd, planet, NAKSHATRA, entered, left)
+
+    events = np.concatenate(parts) if parts else np.empty(0, dtype=EVENT_DTYPE)
+    events = events[(events["jd"] >= start_jd) & (events["jd"] <= end_jd) & np.isin(events["kind"], list(kinds))]
+    return events[np.lexsort((events["kind"], events["planet"], events["jd"]))]
+
+
+def local_minutes(jd_ut, tz=0.0):
+    """UT JDs -> local "YYYY-MM-DD HH:MM" strings (vectorized)."""
+    local = jd_to_datetime64(np.asarray(jd_ut, dtype=np.float64) + tz / 24.0)
+    return np.char.replace(np.datetime_as_string(local, unit="m"), "T", " ")
+
+
+def events_to_dicts(events, tz=0.0):
+    """EVENT_DTYPE rows -> JSON-ready dicts with local "YYYY-MM-DD HH:MM" dates."""
+    dates = local_minutes(events["jd"], tz).tolist()
+    out = []
+    for date, planet, kind, value, prev in zip(dates, events["planet"].tolist(), events["kind"].tolist(),
+                                               events["value"].tolist(), events["prev"].tolist()):
+        row = {"date": date, "planet": GRAHA_NAMES[planet], "kind": EVENT_KINDS[kind]}
+        if kind == SIGN:
+            row["sign"], row["from"] = SIGN_NAMES[value], SIGN_NAMES[prev]
+        elif kind == NAKSHATRA:
+            row["nakshatra"], row["from"] = NAKSHATRA_NAMES[value], NAKSHATRA_NAMES[prev]
+        else:
+            row["sign"], row["nakshatra"] = SIGN_NAMES[value], NAKSHATRA_NAMES[prev]
+        out.append(row)
+    return out
+
+
+class TransitEventTable:
+    """
+    Time-sorted EVENT_DTYPE array of transit events with per-(planet, kind)
+    indexes, so that range, next-event and current-sign queries are binary
+    searches. The 1900-2100 table of each ayanamsa is built once
+    (setup_data.py) and memory-mapped from a .npy file; without it, tables of
+    just the window a request needs are computed (for_window).
+    """
+
+    _cache = {}
+    _lock = threading.Lock()
+
+    def __init__(self, events, ayanamsa_mode="LAHIRI"):
+        self.events = events
+        self.ayanamsa_mode = AyanamsaSystem.normalize(ayanamsa_mode)
+        self.jd = events["jd"]
+        self.start_jd = float(self.jd[0]) if len(events) else 0.0
+        self.end_jd = float(self.jd[-1]) if len(events) else 0.0
+
+        # Rows of each (planet, kind), in time order
+        group = events["planet"].astype(np.int64) * len(EVENT_KINDS) + events["kind"]
+        order = np.argsort(group, kind="stable")
+        bounds = np.searchsorted(group[order], np.arange(len(GRAHA_NAMES) * len(EVENT_KINDS) + 1))
+        self._groups = {}
+        for planet in range(len(GRAHA_NAMES)):
+            for kind in range(len(EVENT_KINDS)):
+                g = planet * len(EVENT_KINDS) + kind
+                rows = order[bounds[g]:bounds[g + 1]]
+                self._groups[(planet, kind)] = (rows, self.jd[rows])
+
+        # Positions (within a planet's sign ingresses) of the entries into / exits from each sign
+        self._sign_rows = {}
+        for planet in range(len(GRAHA_NAMES)):
+            rows = self._groups[(planet, SIGN)][0]
+            value, prev = events["value"][rows], events["prev"][rows]
+            for sign in range(12):
+                self._sign_rows[(planet, sign)] = (np.flatnonzero(value == sign), np.flatnonzero(prev == sign))
+
+    @classmethod
+    def build(cls, engine, start_jd=EVENTS_START_JD, end_jd=EVENTS_END_JD, ayanamsa_mode="LAHIRI"):
+        return cls(find_events(engine, start_jd, end_jd, ayanamsa_mode), ayanamsa_mode)
+
+    @classmethod
+    def load(cls, path, ayanamsa_mode="LAHIRI"):
+        events = np.load(path, mmap_mode="r")
+        if events.dtype != EVENT_DTYPE:
+            raise ValueError(f"{path} is not a PanditAI transit event table")
+        return cls(events, ayanamsa_mode)
+
+    def save(self, path):
+        np.save(path, np.ascontiguousarray(self.events))
+
+    @classmethod
+    def for_window(cls, engine, jd_start, jd_end, ayanamsa_mode="LAHIRI", planets=None, kinds=None):
+        """
+        Events covering [jd_start, jd_end] (UT): the shared 1900-2100 table when it
+        is loaded or on disk, else a table of just this window (find_events, not
+        cached). Parts of the window outside the shared table are computed and
+        joined to it. The full table is only ever built offline (setup_data.py).
+        """
+        table = cls.cached(ayanamsa_mode)
+        if table is None or len(table) == 0 or jd_end < table.start_jd or jd_start > table.end_jd:
+            return cls(find_events(engine, jd_start, jd_end, ayanamsa_mode, planets, kinds), ayanamsa_mode)
+        if table.covers(jd_start, jd_end):
+            return table
+
+        parts = []
+        if jd_start < table.start_jd:
+            before = find_events(engine, jd_start, table.start_jd, ayanamsa_mode, planets, kinds)
+            parts.append(before[before["jd"] < table.start_jd])
+        parts.append(table.between(max(jd_start, table.start_jd), table.end_jd, planets, kinds))
+        if jd_end >= table.end_jd:
+            parts.append(find_events(engine, table.end_jd, jd_end, ayanamsa_mode, planets, kinds))
+        return cls(np.concatenate(parts), ayanamsa_mode)
+
+    @classmethod
+    def cached(cls, ayanamsa_mode="LAHIRI"):
+        """The shared table of one ayanamsa if it is in memory or on disk, else None (never builds)."""
+        mode = AyanamsaSystem.normalize(ayanamsa_mode)
+        with cls._lock:
+            table = cls._cache.get(mode)
+            if table is None and os.path.exists(default_events_path(mode)):
+                table = cls.load(default_events_path(mode), mode)
+                cls._cache[mode] = table
+        return table
+
+    def covers(self, jd_start, jd_end):
+        return self.start_jd <= jd_start and jd_end <= self.end_jd
+
+    def __len__(self):
+        return len(self.events)
+
+    def between(self, jd_start, jd_end, planets=None, kinds=None):
+        """Events in [jd_start, jd_end) (UT), optionally only some planets/kinds."""
+        lo, hi = np.searchsorted(self.jd, [jd_start, jd_end], side="left")
+        rows = self.events[lo:hi]
+        if planets is not None:
+            rows = rows[np.isin(rows["planet"], list(planets))]
+        if kinds is not None:
+            rows = rows[np.isin(rows["kind"], list(kinds))]
+        return rows
+
+    def next_event(self, jd, planet, kind, value=None, prev=None):
+        """First event of a planet/kind strictly after jd (matching value/prev if given), or None."""
+        rows, times = self._groups[(planet, kind)]
+        pos = int(np.searchsorted(times, jd, side="right"))
+        candidates = self.events[rows[pos:]]
+        if value is not None or prev is not None:
+            match = np.ones(len(candidates), dtype=bool)
+            if value is not None:
+                match &= candidates["value"] == value
+            if prev is not None:
+                match &= candidates["prev"] == prev
+            hits = np.flatnonzero(match)
+            return candidates[hits[0]] if len(hits) else None
+        return candidates[0] if len(candidates) else None
+
+    def last_event(self, jd, planet, kind):
+        """Latest event of a planet/kind at or before jd, or None."""
+        rows, times = self._groups[(planet, kind)]
+        pos = int(np.searchsorted(times, jd, side="right"))
+        return self.events[rows[pos - 1]] if pos else None
+
+    def sign_at(self, jd, planet):
+        """Sidereal sign of a graha at jd, read from its last sign ingress."""
+        last = self.last_event(jd, planet, SIGN)
+        if last is not None:
+            return int(last["value"])
+        first = self.next_event(jd, planet, SIGN)
+        return int(first["prev"]) if first is not None else None
+
+    def stay(self, jd, planet, sign):
+        """
+        The graha's passage through `sign` that is current at jd, or the next one:
+        (entered, next_exit, final_exit) JDs. A retrograde graha may step back out
+        and re-enter; a passage runs from the first entry to the exit after which
+        it does not come straight back. Values are None outside the table.
+        """
+        rows, times = self._groups[(planet, SIGN)]
+        value = self.events["value"][rows]
+        prev = self.events["prev"][rows]
+        entries, exits = self._sign_rows[(planet, sign)]
+        pos = int(np.searchsorted(times, jd, side="right"))
+
+        # 1. Entry: the last ingress into the sign if the graha is there now, else the next one
+        if self.sign_at(jd, planet) == sign:
+            k = int(np.searchsorted(entries, pos)) - 1
+            # A re-entry (the ingress before it left the sign for the same neighbour)
+            # continues an earlier passage
+            while k > 0 and prev[entries[k] - 1] == sign and value[entries[k] - 1] == prev[entries[k]]:
+                k -= 1
+            entered = float(times[entries[k]]) if k >= 0 else None
+        else:
+            k = int(np.searchsorted(entries, pos))
+            if k == len(entries):
+                return None, None, None
+            entered = float(times[entries[k]])
+            pos = int(entries[k]) + 1
+
+        # 2. Exits: the next one, and the first one not followed straight away by a re-entry
+        k = int(np.searchsorted(exits, pos))
+        if k == len(exits):
+            return entered, None, None
+        next_exit = float(times[exits[k]])
+        while k < len(exits) and exits[k] + 1 < len(value) and value[exits[k] + 1] == sign:
+            k += 1
+        final_exit = float(times[exits[k]]) if k < len(exits) and exits[k] + 1 < len(value) else None
+        return entered, next_exit, final_exit
@@ -1,180 +1,425 @@
+import os
+import tempfile
+import threading
+import time
+import numpy as np
 import swisseph as swe
-from datetime import datetime
+from datetime import datetime, timezone
 from .engine import VedicAstroEngine
+from .ayanamsa import AyanamsaSystem
+from .chart import GRAHA_NAMES, POINT_INDEX, MOON, SATURN, RAHU, KETU
+from .gochara import chart_contributor_signs, gochara, node_bindus, transit_bindus, transit_scores
+from .transit_events import SIGN, TransitEventTable, local_minutes
+
+# The shared current-sky snapshot is recomputed once per bucket of this many seconds
+SKY_BUCKET_SECONDS = float(os.getenv("PANDIT_SKY_BUCKET_SECONDS", "60"))
+# Worker processes share it through a small .npy file per ayanamsa mode in this directory
+SKY_DIR = os.path.join(tempfile.gettempdir(), "pandit_sky")
+
+ZODIAC = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+          "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
+
+
+_KETU_DEFAULT = "A period of detachment and internal searching."
+
+# BPHS-based transit results by house from the natal lagna, one list per graha (houses 1-12)
+TRANSIT_RESULTS = {
+    "Sun": [
+        "Fatigue, irritability, and difficult journeys.",
+        "Loss of wealth, eye strain, and family disputes.",
+        "Acquisition of wealth, health, and victory over enemies.",
+        "Mental distress, domestic disturbances, and lack of comfort.",
+        "Anxiety regarding children, mental confusion, and illness.",
+        "Success in all undertakings, health, and joy.",
+        "Fatiguing travel, stomach issues, and marital tension.",
+        "Fear, excessive heat in body, and fear of authority.",
+        "Loss of prestige, mental anguish, and obstacles.",
+        "Success in profession, new honors, and accomplishment.",
+        "New position, honor, and financial prosperity.",
+        "Heavy expenses and physical exhaustion.",
+    ],
+    "Moon": [
+        "Arrival of good food, garments, and physical joy.",
+        "Obstacles in work and financial instability.",
+        "Gains from siblings, courage, and success.",
+        "Lack of mental peace and issues with home/mother.",
+        "Sorrow, mental instability, and indigestion.",
+        "Victory over enemies, health, and profit.",
+        "Comforts, vehicles, and social success.",
+        "Danger to health and mental distress.",
+        "Fear of debt and lack of fortune.",
+        "Fulfillment of desires and professional rise.",
+        "Acquisition of wealth and meeting with friends.",
+        "Expenditure, losses, and fatigue.",
+    ],
+    "Mars": [
+        "Heat-related ailments and mental agitation.",
+        "Harsh speech and financial losses.",
+        "Great success, courage, and gain of property.",
+        "Conflict with relatives and domestic stress.",
+        "Anger, issues with children, and fever.",
+        "Destruction of enemies and victory in disputes.",
+        "Quarrels with spouse and eye trouble.",
+        "Physical injuries or sudden health issues.",
+        "Humiliation and loss of vitality.",
+        "Irregular behavior but professional activity.",
+        "Gain of gold, property, and happiness.",
+        "Loss of wealth and excessive anger.",
+    ],
+    "Mercury": [
+        "Loss of wealth through harsh speech.",
+        "Financial gains and increase in knowledge.",
+        "Fear of enemies and mental instability.",
+        "Happiness from family and success in education.",
+        "Discord with wife and children.",
+        "Success, fame, and victory in debates.",
+        "Domestic arguments and lack of peace.",
+        "Happiness and increase in wealth.",
+        "Obstacles in work and mental fatigue.",
+        "Mental peace, wealth, and success.",
+        "Gains from various sources and social happiness.",
+        "Fear of failure and unnecessary expenses.",
+    ],
+    "Jupiter": [
+        "Relocation, loss of wealth, and fatigue.",
+        "Financial prosperity and family happiness.",
+        "Loss of position and obstacles in work.",
+        "Sorrow regarding relatives and home life.",
+        "Birth of children, gain of knowledge, and joy.",
+        "Health issues and disputes with enemies.",
+        "Marriage, travel, and physical comforts.",
+        "Fatigue, illness, and unsuccessful journeys.",
+        "Spiritual growth, luck, and prosperity.",
+        "Obstacles in profession and lack of recognition.",
+        "Great wealth, new opportunities, and honors.",
+        "Mental grief and spiritual detachment.",
+    ],
+    "Venus": [
+        "Sensual pleasures, luxury, and happiness.",
+        "Financial gains and birth of a child.",
+        "Prosperity, influence, and social success.",
+        "New vehicles, house, and domestic joy.",
+        "Happiness from children and romance.",
+        "Conflict with women and health issues.",
+        "Success in marriage and partnerships.",
+        "Unexpected wealth and luxury items.",
+        "Religious deeds and general prosperity.",
+        "Recognition and professional success.",
+        "Gains from friends and liquid cash.",
+        "Gains of comfort and luxury, but high spending.",
+    ],
+    "Saturn": [
+        "Heavy responsibilities, fatigue, and delays.",
+        "Loss of wealth and family friction.",
+        "Destruction of enemies and gain of power.",
+        "Separation from home and mental distress.",
+        "Loss of intelligence and worry for children.",
+        "Total success and physical strength.",
+        "Wearisome journeys and relationship stress.",
+        "Accidents or chronic health issues.",
+        "Poverty and lack of focus.",
+        "Hard work with slow rewards.",
+        "Sudden wealth and high status.",
+        "Excessive expenditure and mental agony.",
+    ],
+    "Rahu": [
+        "Confusion and health concerns.",
+        "Loss of wealth and harsh speech.",
+        "Unexpected gains and victory over rivals.",
+        "Fear and domestic instability.",
+        "Anxiety and speculative losses.",
+        "Physical health and defeat of enemies.",
+        "Conflict in partnerships.",
+        "Sudden obstacles and danger.",
+        "Confusion in belief systems.",
+        "Professional change or success through shortcuts.",
+        "Massive gains and influential contacts.",
+        "Secret expenses and insomnia.",
+    ],
+    # Ketu mirrors Rahu but with a spiritual/detachment twist
+    "Ketu": [
+        _KETU_DEFAULT,
+        _KETU_DEFAULT,
+        "Spiritual courage and victory.",
+        _KETU_DEFAULT,
+        _KETU_DEFAULT,
+        "Freedom from debt and enemies.",
+        _KETU_DEFAULT,
+        _KETU_DEFAULT,
+        _KETU_DEFAULT,
+        _KETU_DEFAULT,
+        "Inward gains and intuitive success.",
+        _KETU_DEFAULT,
+    ],
+}
+
+# Distinct texts, and PREDICTION_INDEX[graha, house - 1] -> index into them
+TRANSIT_TEXTS = tuple(dict.fromkeys(t for g in GRAHA_NAMES for t in TRANSIT_RESULTS[g]))
+PREDICTION_INDEX = np.array(
+    [[TRANSIT_TEXTS.index(t) for t in TRANSIT_RESULTS[g]] for g in GRAHA_NAMES], dtype=np.int16
+)
+PREDICTION_INDEX.setflags(write=False)
+
+class SkySnapshot:
+    """
+    Sidereal positions of the 9 grahas at one moment, identical for every user
+    (only the ascendant depends on location, and transit reports do not use it).
+    Arrays are in GRAHA_NAMES order.
+    """
+
+    __slots__ = ("bucket", "jd", "ayanamsa_mode", "longitude", "sign_id", "speed", "is_retrograde")
+
+    def __init__(self, bucket, jd, ayanamsa_mode, longitude, speed):
+        self.bucket = bucket
+        self.jd = jd
+        self.ayanamsa_mode = ayanamsa_mode
+        self.longitude = longitude
+        self.sign_id = (longitude // 30).astype(np.int8)
+        self.speed = speed
+        self.is_retrograde = speed < 0
+        for arr in (self.longitude, self.sign_id, self.speed, self.is_retrograde):
+            arr.setflags(write=False)
+
+    def houses_from(self, sign_id):
+        """House (1-12) of every graha counted from `sign_id` (e.g. the natal lagna)."""
+        return (self.sign_id - sign_id) % 12 + 1
+
+
+def default_sky_path(ayanamsa_mode="LAHIRI"):
+    """$PANDIT_SKY_DIR (or <tmp>/pandit_sky)/sky_<mode>.npy; None if PANDIT_SKY_DIR is empty."""
+    directory = os.getenv("PANDIT_SKY_DIR", SKY_DIR)
+    if not directory:
+        return None
+    return os.path.join(directory, f"sky_{AyanamsaSystem.normalize(ayanamsa_mode).lower()}.npy")
+
+
+def load_sky(path, ayanamsa_mode, bucket):
+    """The snapshot stored at `path` if it is for `bucket`, else None."""
+    try:
+        row = np.load(path)
+    except (OSError, ValueError):
+        return None
+    n = len(GRAHA_NAMES)
+    if row.shape != (2 + 2 * n,) or row[0] != bucket:
+        return None
+    return SkySnapshot(bucket, float(row[1]), ayanamsa_mode, row[2:2 + n].copy(), row[2 + n:].copy())
+
+
+def save_sky(path, snapshot):
+    """Writes the snapshot as one float64 row [bucket, jd, longitude.., speed..], atomically."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "wb") as f:
+            np.save(f, np.concatenate(([snapshot.bucket, snapshot.jd], snapshot.longitude, snapshot.speed)))
+        os.replace(tmp, path)
+    except OSError:
+        # Sharing is an optimization: a worker that cannot write just keeps its own copy
+        pass
+
+
+GOCHARA_VERDICTS = ["unfavourable", "favourable", "obstructed"]
+
+
+def forecast_arrays(transit_signs, lagna, moon, contributors):
+    """
+    Transit forecast of one sky against one or many natal charts, as arrays [..., 9]:
+      house            house from the natal lagna
+                       Formula: (TransitSign - BirthAsc + 12) % 12 + 1
+      text             index into TRANSIT_TEXTS (BPHS result for that house)
+      house_from_moon  house from the natal Moon
+      verdict          index into GOCHARA_VERDICTS (vedha turns favourable into obstructed)
+      vedha_by         graha obstructing a favourable transit, -1 if none
+      bindus           Bhinnashtakavarga bindus of the transited sign (Rahu/Ketu:
+                       Sarvashtakavarga scaled to 0-8, they have no Bhinnashtakavarga)
+      sarva            Sarvashtakavarga of the transited sign
+      score            transit_scores(), -1 .. 1
+    lagna, moon: natal sign ids [...]; contributors: natal signs [..., 8] (gochara.CONTRIBUTORS).
+    """
+    transit_signs = np.asarray(transit_signs, dtype=np.int64)
+    lagna = np.asarray(lagna, dtype=np.int64)
+    grahas = np.arange(len(GRAHA_NAMES))
+
+    house = (transit_signs - lagna[..., None]) % 12 + 1
+    house_moon, favourable, vedha_by = gochara(moon, transit_signs)
+    bhinna, sarva = transit_bindus(contributors, transit_signs)
+    bindus = np.concatenate((bhinna, node_bindus(sarva[..., RAHU:])), axis=-1)
+    return {
+        "house": house,
+        "text": PREDICTION_INDEX[grahas, house - 1],
+        "house_from_moon": house_moon,
+        "verdict": np.where(vedha_by >= 0, 2, favourable.astype(np.int64)),
+        "vedha_by": vedha_by,
+        "bindus": bindus,
+        "sarva": sarva,
+        "score": transit_scores(favourable, vedha_by, bindus),
+    }
+
+
+def forecast_rows(sky, f):
+    """One natal chart's forecast_arrays (as lists) -> the per-planet report rows."""
+    return [
+        {
+            "planet": name,
+            "current_sign": ZODIAC[int(sky.sign_id[i])],
+            "transiting_house": f["house"][i],
+            "prediction": TRANSIT_TEXTS[f["text"][i]],
+            "is_retrograde": bool(sky.is_retrograde[i]),
+            "house_from_moon": f["house_from_moon"][i],
+            "gochara": GOCHARA_VERDICTS[f["verdict"][i]],
+            "vedha_by": GRAHA_NAMES[f["vedha_by"][i]] if f["vedha_by"][i] >= 0 else None,
+            "bindus": int(f["bindus"][i]) if i <= SATURN else None,
+            "sarvashtakavarga": f["sarva"][i],
+            "score": f["score"][i],
+        }
+        for i, name in enumerate(GRAHA_NAMES)
+    ]
 
 class TransitEngine(VedicAstroEngine):
-    def calculate_current_transits(self, birth_chart, location_data):
+    # Process-wide snapshot per ayanamsa mode, shared by every TransitEngine and request thread,
+    # and across worker processes through default_sky_path()
+    _sky = {}
+    _sky_lock = threading.Lock()
+    sky_stats = {"hits": 0, "refreshes": 0, "shared": 0}
+    _stats_lock = threading.Lock()  # counters only, so a hit never waits on a refresh
+
+    def compute_sky(self, jd, ayanamsa_mode="LAHIRI"):
+        """Sidereal graha longitudes and speeds at `jd` (UT), as two (9,) arrays."""
+        lon = np.empty(len(GRAHA_NAMES))
+        speed = np.empty(len(GRAHA_NAMES))
+        tropical, spd = self.tropical_positions([jd])
+        lon[:RAHU + 1], speed[:RAHU + 1] = tropical[0], spd[0]
+        lon[KETU], speed[KETU] = lon[RAHU] + 180.0, speed[RAHU]
+        lon = (lon - AyanamsaSystem.get_ayanamsa(jd, ayanamsa_mode)) % 360
+        return lon, speed
+
+    def current_sky(self, ayanamsa_mode="LAHIRI", now=None):
+        """
+        Shared snapshot of the sky for the current time bucket (SKY_BUCKET_SECONDS).
+        Computed by the first request of a bucket in any worker process and
+        written to default_sky_path(); every other request reads it.
+        """
+        mode = AyanamsaSystem.normalize(ayanamsa_mode)
+        now = time.time() if now is None else now
+        bucket = int(now // SKY_BUCKET_SECONDS)
+
+        snapshot = self._sky.get(mode)
+        if snapshot is not None and snapshot.bucket == bucket:
+            self._count("hits")
+            return snapshot
+
+        with self._sky_lock:
+            snapshot = self._sky.get(mode)
+            if snapshot is None or snapshot.bucket != bucket:
+                path = default_sky_path(mode)
+                snapshot = load_sky(path, mode, bucket) if path else None
+                if snapshot is not None:
+                    self._count("shared")
+                else:
+                    # Positions at the middle of the bucket
+                    moment = datetime.fromtimestamp((bucket + 0.5) * SKY_BUCKET_SECONDS, tz=timezone.utc)
+                    jd = swe.julday(moment.year, moment.month, moment.day,
+                                    moment.hour + moment.minute / 60.0 + moment.second / 3600.0)
+                    snapshot = SkySnapshot(bucket, jd, mode, *self.compute_sky(jd, mode))
+                    if path:
+                        save_sky(path, snapshot)
+                    self._count("refreshes")
+                TransitEngine._sky[mode] = snapshot
+            else:
+                self._count("hits")
+        return snapshot
+
+    @classmethod
+    def _count(cls, stat):
+        with cls._stats_lock:
+            cls.sky_stats[stat] += 1
+
+    @classmethod
+    def sky_cache_stats(cls):
+        with cls._stats_lock:
+            return dict(cls.sky_stats)
+
+    def calculate_current_transits(self, birth_chart, location_data=None, ayanamsa_mode="LAHIRI"):
         """
         Compares NOW (Current Sky) vs BIRTH (User's Chart).
+        The sky comes from the shared snapshot, so a forecast is only the
+        offset of each graha's sign from the natal ascendant and Moon plus
+        a few table lookups. location_data is accepted for compatibility;
+        transits do not depend on it.
         """
-        now = datetime.now()
-        
-        # 1. Calculate Current Planetary Positions (The Sky Right Now)
-        transit_chart = self.calculate_chart(
-            now.year, now.month, now.day, 
-            now.hour, now.minute, 
-            location_data['lat'], location_data['lon'], location_data['tz']
+        # 1. Current Planetary Positions (shared for everyone this bucket)
+        sky = self.current_sky(ayanamsa_mode)
+
+        # 2. Houses from the Birth Ascendant and Moon, gochara and bindus
+        f = forecast_arrays(
+            sky.sign_id, birth_chart.ascendant.sign_id, birth_chart[MOON].sign_id,
+            chart_contributor_signs(birth_chart),
         )
-        
-        # 2. Get User's Birth Ascendant
-        if "Ascendant" not in birth_chart:
-            return []
-            
-        asc_sign_id = birth_chart['Ascendant']['sign_id']
-        transit_report = []
-        
-        zodiac = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", 
-                  "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
-        
-        # 3. Compare Transit Planet vs Birth Ascendant
-        for p_name, p_data in transit_chart.items():
-            if p_name == "Ascendant": continue
-            
-            # Current Sign of the Planet
-            transit_sign_id = p_data['sign_id']
-            
-            # Calculate House relative to Birth Ascendant
-            # Formula: (TransitSign - BirthAsc + 12) % 12 + 1
-            transit_house = (transit_sign_id - asc_sign_id) % 12 + 1
-            
-            # Get Prediction using your dictionary
-            prediction = self.get_transit_prediction(p_name, transit_house)
-            
-            transit_report.append({
-                "planet": p_name,
-                "current_sign": zodiac[transit_sign_id],
-                "transiting_house": transit_house,
-                "prediction": prediction,
-                "is_retrograde": p_data['is_retrograde']
-            })
-            
-        return transit_report
+        return forecast_rows(sky, {k: v.tolist() for k, v in f.items()})
 
     def get_transit_prediction(self, planet, house):
         """
         Comprehensive BPHS-based transit results for all 9 Grahas.
         """
-        predictions = {
-            "Sun": {
-                1: "Fatigue, irritability, and difficult journeys.",
-                2: "Loss of wealth, eye strain, and family disputes.",
-                3: "Acquisition of wealth, health, and victory over enemies.",
-                4: "Mental distress, domestic disturbances, and lack of comfort.",
-                5: "Anxiety regarding children, mental confusion, and illness.",
-                6: "Success in all undertakings, health, and joy.",
-                7: "Fatiguing travel, stomach issues, and marital tension.",
-                8: "Fear, excessive heat in body, and fear of authority.",
-                9: "Loss of prestige, mental anguish, and obstacles.",
-                10: "Success in profession, new honors, and accomplishment.",
-                11: "New position, honor, and financial prosperity.",
-                12: "Heavy expenses and physical exhaustion."
-            },
-            "Moon": {
-                1: "Arrival of good food, garments, and physical joy.",
-                2: "Obstacles in work and financial instability.",
-                3: "Gains from siblings, courage, and success.",
-                4: "Lack of mental peace and issues with home/mother.",
-                5: "Sorrow, mental instability, and indigestion.",
-                6: "Victory over enemies, health, and profit.",
-                7: "Comforts, vehicles, and social success.",
-                8: "Danger to health and mental distress.",
-                9: "Fear of debt and lack of fortune.",
-                10: "Fulfillment of desires and professional rise.",
-                11: "Acquisition of wealth and meeting with friends.",
-                12: "Expenditure, losses, and fatigue."
-            },
-            "Mars": {
-                1: "Heat-related ailments and mental agitation.",
-                2: "Harsh speech and financial losses.",
-                3: "Great success, courage, and gain of property.",
-                4: "Conflict with relatives and domestic stress.",
-                5: "Anger, issues with children, and fever.",
-                6: "Destruction of enemies and victory in disputes.",
-                7: "Quarrels with spouse and eye trouble.",
-                8: "Physical injuries or sudden health issues.",
-                9: "Humiliation and loss of vitality.",
-                10: "Irregular behavior but professional activity.",
-                11: "Gain of gold, property, and happiness.",
-                12: "Loss of wealth and excessive anger."
-            },
-            "Mercury": {
-                1: "Loss of wealth through harsh speech.",
-                2: "Financial gains and increase in knowledge.",
-                3: "Fear of enemies and mental instability.",
-                4: "Happiness from family and success in education.",
-                5: "Discord with wife and children.",
-                6: "Success, fame, and victory in debates.",
-                7: "Domestic arguments and lack of peace.",
-                8: "Happiness and increase in wealth.",
-                9: "Obstacles in work and mental fatigue.",
-                10: "Mental peace, wealth, and success.",
-                11: "Gains from various sources and social happiness.",
-                12: "Fear of failure and unnecessary expenses."
-            },
-            "Jupiter": {
-                1: "Relocation, loss of wealth, and fatigue.",
-                2: "Financial prosperity and family happiness.",
-                3: "Loss of position and obstacles in work.",
-                4: "Sorrow regarding relatives and home life.",
-                5: "Birth of children, gain of knowledge, and joy.",
-                6: "Health issues and disputes with enemies.",
-                7: "Marriage, travel, and physical comforts.",
-                8: "Fatigue, illness, and unsuccessful journeys.",
-                9: "Spiritual growth, luck, and prosperity.",
-                10: "Obstacles in profession and lack of recognition.",
-                11: "Great wealth, new opportunities, and honors.",
-                12: "Mental grief and spiritual detachment."
-            },
-            "Venus": {
-                1: "Sensual pleasures, luxury, and happiness.",
-                2: "Financial gains and birth of a child.",
-                3: "Prosperity, influence, and social success.",
-                4: "New vehicles, house, and domestic joy.",
-                5: "Happiness from children and romance.",
-                6: "Conflict with women and health issues.",
-                7: "Success in marriage and partnerships.",
-                8: "Unexpected wealth and luxury items.",
-                9: "Religious deeds and general prosperity.",
-                10: "Recognition and professional success.",
-                11: "Gains from friends and liquid cash.",
-                12: "Gains of comfort and luxury, but high spending."
-            },
-            "Saturn": {
-                1: "Heavy responsibilities, fatigue, and delays.",
-                2: "Loss of wealth and family friction.",
-                3: "Destruction of enemies and gain of power.",
-                4: "Separation from home and mental distress.",
-                5: "Loss of intelligence and worry for children.",
-                6: "Total success and physical strength.",
-                7: "Wearisome journeys and relationship stress.",
-                8: "Accidents or chronic health issues.",
-                9: "Poverty and lack of focus.",
-                10: "Hard work with slow rewards.",
-                11: "Sudden wealth and high status.",
-                12: "Excessive expenditure and mental agony."
-            },
-            "Rahu": {
-                1: "Confusion and health concerns.",
-                2: "Loss of wealth and harsh speech.",
-                3: "Unexpected gains and victory over rivals.",
-                4: "Fear and domestic instability.",
-                5: "Anxiety and speculative losses.",
-                6: "Physical health and defeat of enemies.",
-                7: "Conflict in partnerships.",
-                8: "Sudden obstacles and danger.",
-                9: "Confusion in belief systems.",
-                10: "Professional change or success through shortcuts.",
-                11: "Massive gains and influential contacts.",
-                12: "Secret expenses and insomnia."
-            },
-            "Ketu": {
-                # Ketu mirrors Rahu but with a spiritual/detachment twist
-                3: "Spiritual courage and victory.",
-                6: "Freedom from debt and enemies.",
-                11: "Inward gains and intuitive success.",
-                "default": "A period of detachment and internal searching."
-            }
-        }
+        g = POINT_INDEX.get(planet)
+        if g is None or g >= len(GRAHA_NAMES) or not 1 <= house <= 12:
+            return "Mixed results according to planetary strength."
+        return TRANSIT_TEXTS[PREDICTION_INDEX[g, house - 1]]
+
+    def sign_ingresses(self, jd_start, jd_end, ayanamsa_mode="LAHIRI", planets=None):
+        """
+        Sidereal sign ingresses (EVENT_DTYPE rows, time order) in [jd_start, jd_end] (UT).
+        Read from the precomputed event table when it is available and covers the
+        range; otherwise found by bracketed refinement over just this range.
+        """
+        planets = range(len(GRAHA_NAMES)) if planets is None else planets
+        table = TransitEventTable.for_window(self, jd_start, jd_end, ayanamsa_mode, planets, (SIGN,))
+        return table.between(jd_start, np.nextafter(jd_end, np.inf), planets, (SIGN,))
+
+    def transit_timeline(self, birth_chart, jd_start, jd_end, tz=0.0, ayanamsa_mode="LAHIRI", planets=None):
+        """
+        House occupancy of each transiting graha over [jd_start, jd_end] (UT):
+        one interval per sign it stands in, bounded by its ingresses, with the
+        house from the natal lagna and Moon. Costs one sky computation plus the
+        ingresses, whatever the length of the range. Dates are local "YYYY-MM-DD HH:MM".
+        """
+        planets = list(range(len(GRAHA_NAMES)) if planets is None else planets)
+        lagna = birth_chart.ascendant.sign_id
+        moon = birth_chart[MOON].sign_id
+
+        # 1. Signs at the start of the range, and every ingress after it
+        start_signs = (self.compute_sky(jd_start, ayanamsa_mode)[0] // 30).astype(np.int64)
+        events = self.sign_ingresses(jd_start, jd_end, ayanamsa_mode, planets)
+        events = events[events["jd"] > jd_start]
+        events = events[np.argsort(events["planet"], kind="stable")]
+        bounds = np.searchsorted(events["planet"], [planets, np.add(planets, 1)])
+
+        timeline = {}
+        for k, p in enumerate(planets):
+            ev = events[bounds[0][k]:bounds[1][k]]
+            # 2. Intervals between consecutive ingresses, clipped to the range
+            starts = np.concatenate(([jd_start], ev["jd"]))
+            ends = np.concatenate((ev["jd"], [jd_end]))
+            signs = np.concatenate(([start_signs[p]], ev["value"].astype(np.int64)))
+            from_lagna = (signs - lagna) % 12 + 1
+            from_moon = (signs - moon) % 12 + 1
+            # The first interval was entered before the range: direction unknown (None)
+            retrograde = [None] + (ev["value"] == (ev["prev"] - 1) % 12).tolist()
 
-        planet_dict = predictions.get(planet, {})
-        return planet_dict.get(house, planet_dict.get("default", "Mixed results according to planetary strength."))
\ No newline at end of file
+            # 3. JSON-ready rows
+            dates = local_minutes(np.concatenate((starts, ends)), tz).tolist()
+            n = len(signs)
+            timeline[GRAHA_NAMES[p]] = [
+                {
+                    "start": dates[i],
+                    "end": dates[n + i],
+                    "sign": ZODIAC[s],
+                    "house_from_lagna": h,
+                    "house_from_moon": m,
+                    "entered_retrograde": r,
+                    "prediction": TRANSIT_TEXTS[PREDICTION_INDEX[p, h - 1]],
+                }
+                for i, (s, h, m, r) in enumerate(zip(signs.tolist(), from_lagna.tolist(),
+                                                     from_moon.tolist(), retrograde))
+            ]
+        return timeline
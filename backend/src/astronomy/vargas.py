@@ -1,39 +1,99 @@
+import numpy as np
+
+# Shodashavarga divisions served by the engine (D1 is the rashi sign itself).
+# Every chart carries one small int array per graha in exactly this order.
+VARGA_DIVISIONS = (2, 3, 4, 7, 9, 10, 12, 16, 20, 24, 27, 30, 40, 45, 60)
+VARGA_INDEX = {d: i for i, d in enumerate(VARGA_DIVISIONS)}
+
+# Trimsamsa (D30) uses unequal parts, so it is tabulated per whole degree:
+# (end degree, varga sign) for odd and even signs.
+_D30_ODD = [(5, 0), (10, 10), (18, 8), (25, 2), (30, 6)]   # Mars, Saturn, Jupiter, Mercury, Venus
+_D30_EVEN = [(5, 1), (12, 5), (20, 11), (25, 9), (30, 7)]  # Venus, Mercury, Jupiter, Saturn, Mars
+
+
+def _varga_sign(division, sign, seg):
+    """
+    Parashara (BPHS) rule for the varga sign of segment `seg` of rashi `sign`.
+    Only used to build VARGA_TABLE at import.
+    """
+    is_odd = sign % 2 == 0        # Aries (0) is an odd sign
+    quality = sign % 3            # 0 = Movable, 1 = Fixed, 2 = Dual
+    element = sign % 4            # 0 = Fire, 1 = Earth, 2 = Air, 3 = Water
+
+    if division == 2:    # Hora: odd -> Leo then Cancer, even -> Cancer then Leo
+        return (4, 3)[seg] if is_odd else (3, 4)[seg]
+    if division == 3:    # Drekkana: 1st, 5th, 9th from sign
+        return (sign + 4 * seg) % 12
+    if division == 4:    # Chaturthamsa: 1st, 4th, 7th, 10th from sign
+        return (sign + 3 * seg) % 12
+    if division == 7:    # Saptamsa: odd from sign, even from 7th
+        return (sign + seg + (0 if is_odd else 6)) % 12
+    if division == 9:    # Navamsa: Fire->Aries, Earth->Capricorn, Air->Libra, Water->Cancer
+        return ((0, 9, 6, 3)[element] + seg) % 12
+    if division == 10:   # Dasamsa: odd from sign, even from 9th
+        return (sign + seg + (0 if is_odd else 8)) % 12
+    if division == 12:   # Dwadasamsa: from sign
+        return (sign + seg) % 12
+    if division == 16:   # Shodasamsa: Movable->Aries, Fixed->Leo, Dual->Sagittarius
+        return ((0, 4, 8)[quality] + seg) % 12
+    if division == 20:   # Vimsamsa: Movable->Aries, Fixed->Sagittarius, Dual->Leo
+        return ((0, 8, 4)[quality] + seg) % 12
+    if division == 24:   # Chaturvimsamsa: odd from Leo, even from Cancer
+        return ((4 if is_odd else 3) + seg) % 12
+    if division == 27:   # Bhamsa: Fire->Aries, Earth->Cancer, Air->Libra, Water->Capricorn
+        return ((0, 3, 6, 9)[element] + seg) % 12
+    if division == 30:   # Trimsamsa: seg is the whole degree (0-29)
+        for end, varga in (_D30_ODD if is_odd else _D30_EVEN):
+            if seg < end:
+                return varga
+    if division == 40:   # Khavedamsa: odd from Aries, even from Libra
+        return ((0 if is_odd else 6) + seg) % 12
+    if division == 45:   # Akshavedamsa: Movable->Aries, Fixed->Leo, Dual->Sagittarius
+        return ((0, 4, 8)[quality] + seg) % 12
+    if division == 60:   # Shashtiamsa: from sign
+        return (sign + seg) % 12
+    raise ValueError(f"Unsupported divisional chart D{division}")
+
+
+def _build_table():
+    table = np.full((len(VARGA_DIVISIONS), 12, max(VARGA_DIVISIONS)), -1, dtype=np.int8)
+    for v, division in enumerate(VARGA_DIVISIONS):
+        for sign in range(12):
+            for seg in range(division):
+                table[v, sign, seg] = _varga_sign(division, sign, seg)
+    table.setflags(write=False)
+    return table
+
+
+# (varga, rashi sign, segment) -> varga sign. D30 segments are whole degrees.
+VARGA_TABLE = _build_table()
+_DIVS = np.array(VARGA_DIVISIONS, dtype=np.float64)
+_DIV_MAX_SEG = np.array(VARGA_DIVISIONS, dtype=np.int64) - 1
+_V_IDX = np.arange(len(VARGA_DIVISIONS))
+
+
+def calculate_vargas(absolute_longitudes):
+    """
+    All 15 divisional signs for one or many bodies in a single pass.
+    Returns an int8 array of shape (..., len(VARGA_DIVISIONS)).
+    """
+    lon = np.asarray(absolute_longitudes, dtype=np.float64) % 360.0
+    sign = (lon // 30).astype(np.int64)
+    deg = lon - sign * 30.0
+
+    seg = np.minimum((deg[..., None] * _DIVS / 30.0).astype(np.int64), _DIV_MAX_SEG)
+    return VARGA_TABLE[_V_IDX, sign[..., None], seg]
+
+
+def calculate_varga_sign(absolute_longitude, division):
+    """Sign ID (0-11) of a longitude in divisional chart D<division>."""
+    if division == 1:
+        return int(absolute_longitude % 360 // 30)
+    return int(calculate_vargas(absolute_longitude)[VARGA_INDEX[division]])
+
+
 def calculate_d9_navamsa(absolute_longitude):
     """
     Calculates the Sign ID (0-11) of a planet in the Navamsa (D-9) chart.
-    
-    Algorithm:
-    1. A sign is 30 degrees. D-9 divides it into 9 parts of 3deg 20min (3.333 deg).
-    2. The mapping depends on the element of the Rashi sign (Fire, Earth, Air, Water).
     """
-    
-    rashi_sign_id = int(absolute_longitude // 30)
-    degree_in_sign = absolute_longitude % 30
-    
-    # 1. Determine the 'pada' (segment 0-8)
-    # 30 degrees / 9 segments = 3.33333 degrees per segment
-    pada_length = 30.0 / 9.0
-    pada = int(degree_in_sign / pada_length)
-    
-    # 2. Determine start sign based on Element of Rashi
-    # Fire (Aries, Leo, Sag) -> Starts from Aries (0)
-    # Earth (Taurus, Virgo, Cap) -> Starts from Capricorn (9)
-    # Air (Gemini, Libra, Aq) -> Starts from Libra (6)
-    # Water (Cancer, Scorpio, Pisces) -> Starts from Cancer (3)
-    
-    element_remainder = rashi_sign_id % 4
-    start_sign = 0
-    
-    if element_remainder == 0:   # Fire
-        start_sign = 0 
-    elif element_remainder == 1: # Earth
-        start_sign = 9
-    elif element_remainder == 2: # Air
-        start_sign = 6
-    elif element_remainder == 3: # Water
-        start_sign = 3
-        
-    # 3. Calculate Final D9 Sign
-    d9_sign_id = (start_sign + pada) % 12
-    
-    return d9_sign_id
\ No newline at end of file
+    return calculate_varga_sign(absolute_longitude, 9)
@@ -32,33 +32,19 @@ class YogaEngine:
         asc_sign_id: 0 to 11
         """
         # Formula: (Asc + House - 1) % 12
-        sign_in_house = (int(asc_sign_id) + int(house_num_from_asc) - 1) % 12
+        sign_in_house = (asc_sign_id + house_num_from_asc - 1) % 12
         return self.SIGN_LORDS[sign_in_house]
 
     def check_yogas(self, chart):
         yogas_found = []
         
-        # Safety Check
-        if "Ascendant" not in chart: return []
-        asc_sign = int(chart["Ascendant"]["sign_id"])
+        # Chart is the compact engine Chart (see chart.py): read the records directly
+        asc_sign = chart.ascendant.sign_id
         
-        # Helper: Get Sanitized Planet Data
+        # Helper: Get Planet Data (house_number is precomputed from the lagna)
         def get_p_data(planet):
-            if planet in chart and chart[planet]:
-                d = chart[planet]
-                
-                # 1. Get Sign ID (Force Int)
-                s_id = int(d.get("sign_id", 0))
-                
-                # 2. Get House Number (Force Int, Calculate if missing)
-                if "house_number" in d:
-                    h_num = int(d["house_number"])
-                else:
-                    # Fallback Calc: (Sign - Asc) % 12 + 1
-                    h_num = (s_id - asc_sign) % 12 + 1
-                    
-                return s_id, h_num
-            return None, None
+            rec = chart[planet]
+            return rec.sign_id, rec.house_number
 
         # ==========================================
         # 1. PANCHA MAHAPURUSHA YOGAS
@@ -61,6 +61,7 @@ if mode == "👤 Individual Destiny":
                 res = requests.post(f"{BASE}/predict", json=payload)
                 if res.status_code == 200:
                     st.session_state["data"] = res.json()
+                    st.session_state["payload"] = payload
                 else:
                     st.error("Backend Error")
 
@@ -151,6 +152,16 @@ if mode == "👤 Individual Destiny":
                 )
                 curr_ad = ad_list[sel_ad_idx]
 
+                # /predict only returns Maha + Antar; deeper levels are fetched on demand
+                if not curr_ad.get("sub_periods") and "path" in curr_ad:
+                    sub = requests.post(
+                        f"{BASE}/dasha",
+                        params={"path": ".".join(map(str, curr_ad["path"])), "depth": 3},
+                        json=st.session_state.get("payload"),
+                    )
+                    if sub.status_code == 200:
+                        curr_ad = sub.json()["subtree"]
+
                 st.dataframe(
                     pd.DataFrame(ad_list).drop(
                         columns=["sub_periods", "type"], errors="ignore"
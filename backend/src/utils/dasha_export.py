@@ -0,0 +1,68 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+
+from src.astronomy.ayanamsa import AyanamsaSystem
+
+# Streaming serializers for dasha periods. Both take any iterable of
+# DashaPeriod (e.g. DashaTimeline.walk) and yield text chunks, one per period,
+# so a response can be streamed without building the list or the body.
+
+
+def iter_ndjson(periods):
+    """One JSON object per line (application/x-ndjson)."""
+    for p in periods:
+        yield json.dumps({
+            "lord": p.lord,
+            "type": p.type,
+            "level": p.level,
+            "start": p.start.isoformat(timespec="minutes"),
+            "end": p.end.isoformat(timespec="minutes"),
+            "lineage": p.lineage,
+            "path": list(p.path),
+        }) + "\n"
+
+
+def _ics_text(value):
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def ics_uid_prefix(system_name, birth_dt, latitude, longitude, tz, ayanamsa_mode, year_days):
+    """
+    UID prefix of one export: system and birth minute, plus a short hash of the
+    other inputs that change the periods (place, timezone, ayanamsa, year length).
+    Two people born in the same minute, or one person exported with two year
+    models, never share UIDs, so calendar clients keep both exports.
+    """
+    key = (f"{latitude:.4f},{longitude:.4f},{tz:g},"
+           f"{AyanamsaSystem.normalize(ayanamsa_mode)},{year_days:.6f}")
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+    return f"{system_name.lower()}-{birth_dt:%Y%m%d%H%M}-{digest}"
+
+
+def iter_ics(periods, calendar_name="Dasha Periods", uid_prefix="dasha"):
+    """
+    iCalendar (RFC 5545) feed, one VEVENT per period. Times are floating
+    (the birth's local clock), which is how the periods are defined.
+    """
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield (
+        "BEGIN:VCALENDAR\r\n"
+        "VERSION:2.0\r\n"
+        "PRODID:-//PanditAI//Dasha Export//EN\r\n"
+        "CALSCALE:GREGORIAN\r\n"
+        f"X-WR-CALNAME:{_ics_text(calendar_name)}\r\n"
+    )
+    for p in periods:
+        summary = "-".join(p.lineage) + f" {p.type}"
+        yield (
+            "BEGIN:VEVENT\r\n"
+            f"UID:{uid_prefix}-{'.'.join(map(str, p.path))}@panditai\r\n"
+            f"DTSTAMP:{stamp}\r\n"
+            f"DTSTART:{p.start:%Y%m%dT%H%M%S}\r\n"
+            f"DTEND:{p.end:%Y%m%dT%H%M%S}\r\n"
+            f"SUMMARY:{_ics_text(summary)}\r\n"
+            "TRANSP:TRANSPARENT\r\n"
+            "END:VEVENT\r\n"
+        )
+    yield "END:VCALENDAR\r\n"
@@ -0,0 +1,183 @@
+"""
+Batch transit fan-out: today's forecast for every stored natal chart.
+
+The sky is computed once; each chunk of charts is then a handful of array
+operations (houses from lagna and Moon, gochara, vedha, ashtakavarga bindus)
+and the results stream out as NDJSON, one line per chart.
+
+Input (file or "-" for stdin), NDJSON or CSV, one chart per record:
+  id + signs       stored chart: 10 sign ids in chart order (Sun .. Ketu, Ascendant);
+                   CSV columns id,Sun,Moon,...,Ketu,Ascendant
+  id + birth data  year, month, day, hour, minute, timezone, latitude, longitude;
+                   computed per chunk with VedicAstroEngine.calculate_charts_batch
+
+Usage:
+  python -m src.utils.transit_fanout charts.ndjson -o forecasts.ndjson
+"""
+import argparse
+import csv
+import json
+import resource
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import swisseph as swe
+
+from src.astronomy.ayanamsa import AyanamsaSystem
+from src.astronomy.chart import CHART_POINTS, GRAHA_NAMES, MOON, SATURN, ASCENDANT
+from src.astronomy.ephemeris_table import EphemerisTable
+from src.astronomy.gochara import CONTRIBUTORS
+from src.astronomy.transits import (
+    TransitEngine, SkySnapshot, ZODIAC, TRANSIT_TEXTS, GOCHARA_VERDICTS, forecast_arrays,
+)
+
+BIRTH_FIELDS = ["year", "month", "day", "hour", "minute", "timezone", "latitude", "longitude"]
+CHUNK_SIZE = 20000
+
+
+def read_records(stream, fmt="ndjson"):
+    """Yields one dict per chart from an NDJSON or CSV text stream."""
+    if fmt == "csv":
+        for row in csv.DictReader(stream):
+            if "Sun" in row:
+                yield {"id": row.get("id"), "signs": [int(row[p]) for p in CHART_POINTS]}
+            else:
+                yield row
+        return
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _chunks(records, size):
+    chunk = []
+    for rec in records:
+        chunk.append(rec)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def natal_signs(chunk, engine, ayanamsa_mode="LAHIRI"):
+    """
+    Sign ids [n, 10] (chart order) of a chunk of records: stored signs are used
+    as they are, birth data is computed in one columnar batch.
+    """
+    signs = np.empty((len(chunk), len(CHART_POINTS)), dtype=np.int64)
+    births = []
+    for i, rec in enumerate(chunk):
+        if rec.get("signs") is not None:
+            signs[i] = rec["signs"]
+        else:
+            births.append(i)
+    if births:
+        cols = {f: [float(chunk[i][f]) for i in births] for f in BIRTH_FIELDS}
+        res = engine.calculate_charts_batch(
+            cols["year"], cols["month"], cols["day"], cols["hour"], cols["minute"],
+            cols["latitude"], cols["longitude"], cols["timezone"], ayanamsa_mode,
+        )
+        signs[births, :ASCENDANT] = res["sign_id"]
+        signs[births, ASCENDANT] = res["asc_sign_id"]
+    return signs
+
+
+def sky_at(engine, ayanamsa_mode="LAHIRI", moment=None):
+    """Shared current-sky snapshot, or the sky at a given UTC datetime."""
+    if moment is None:
+        return engine.current_sky(ayanamsa_mode)
+    jd = swe.julday(moment.year, moment.month, moment.day,
+                    moment.hour + moment.minute / 60.0 + moment.second / 3600.0)
+    mode = AyanamsaSystem.normalize(ayanamsa_mode)
+    return SkySnapshot(None, jd, mode, *engine.compute_sky(jd, mode))
+
+
+def forecast_lines(sky, ids, signs):
+    """NDJSON lines for a chunk: per chart, one entry per graha in each field."""
+    f = forecast_arrays(sky.sign_id, signs[:, ASCENDANT], signs[:, MOON], signs[:, CONTRIBUTORS])
+    cols = {k: v.tolist() for k, v in f.items()}
+    texts, verdicts = TRANSIT_TEXTS, GOCHARA_VERDICTS
+    for i, chart_id in enumerate(ids):
+        vedha = cols["vedha_by"][i]
+        yield json.dumps({
+            "id": chart_id,
+            "house": cols["house"][i],
+            "house_from_moon": cols["house_from_moon"][i],
+            "gochara": [verdicts[v] for v in cols["verdict"][i]],
+            "vedha_by": [GRAHA_NAMES[v] if v >= 0 else None for v in vedha],
+            "bindus": [int(b) for b in cols["bindus"][i][:SATURN + 1]] + [None, None],
+            "sarvashtakavarga": cols["sarva"][i],
+            "score": cols["score"][i],
+            "prediction": [texts[t] for t in cols["text"][i]],
+        }, separators=(",", ":")) + "\n"
+
+
+def run(inp, out, ayanamsa_mode="LAHIRI", fmt="ndjson", chunk_size=CHUNK_SIZE, moment=None, engine=None):
+    """
+    Streams forecasts for every chart in `inp` to `out`. Writes a header line
+    with the sky first. Returns throughput and memory stats.
+    """
+    engine = engine or TransitEngine(ephemeris_table=EphemerisTable.load_default())
+    t0 = time.perf_counter()
+    sky = sky_at(engine, ayanamsa_mode, moment)
+    out.write(json.dumps({
+        "sky": {
+            "jd": sky.jd,
+            "ayanamsa": sky.ayanamsa_mode,
+            "planets": GRAHA_NAMES,
+            "signs": [ZODIAC[s] for s in sky.sign_id.tolist()],
+            "is_retrograde": sky.is_retrograde.tolist(),
+        }
+    }) + "\n")
+
+    total = 0
+    compute_s = 0.0
+    for chunk in _chunks(read_records(inp, fmt), chunk_size):
+        c0 = time.perf_counter()
+        signs = natal_signs(chunk, engine, ayanamsa_mode)
+        compute_s += time.perf_counter() - c0
+        out.writelines(forecast_lines(sky, [rec.get("id") for rec in chunk], signs))
+        total += len(chunk)
+
+    elapsed = time.perf_counter() - t0
+    return {
+        "charts": total,
+        "seconds": round(elapsed, 3),
+        "charts_per_second": round(total / elapsed, 1) if elapsed else None,
+        "natal_compute_seconds": round(compute_s, 3),
+        "chunk_size": chunk_size,
+        # ru_maxrss is in KB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Daily transit forecast for a file of natal charts.")
+    parser.add_argument("input", help="NDJSON or CSV file of charts, '-' for stdin")
+    parser.add_argument("-o", "--output", default="-", help="NDJSON output file (default stdout)")
+    parser.add_argument("--format", choices=["ndjson", "csv"], help="Input format (default: from extension)")
+    parser.add_argument("--ayanamsa", default="LAHIRI")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--at", help="UTC moment 'YYYY-MM-DDTHH:MM' instead of now")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.input.endswith(".csv") else "ndjson")
+    moment = datetime.fromisoformat(args.at).replace(tzinfo=timezone.utc) if args.at else None
+    inp = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8", newline="")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        stats = run(inp, out, args.ayanamsa, fmt, args.chunk_size, moment)
+    finally:
+        if inp is not sys.stdin:
+            inp.close()
+        if out is not sys.stdout:
+            out.close()
+    print(json.dumps(stats), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
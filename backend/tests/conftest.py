@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the backend as `src.*`, the same way the API and scripts do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,27 @@
+import pytest
+
+pytest.importorskip("torch")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import src.api.main as api  # noqa: E402
+
+BIRTH = dict(year=1990, month=5, day=25, hour=14, minute=30, timezone=5.5, latitude=28.61, longitude=77.2)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(api, "RATE_LIMIT_DELAY", 0)
+    return TestClient(api.app)
+
+
+@pytest.mark.parametrize("query", ["start=2020-01-01", "end=2030-01-01", "start=2030-01-01&end=2020-01-01"])
+def test_dasha_window_needs_both_bounds(client, query):
+    assert client.post(f"/dasha?{query}", json=BIRTH).status_code == 422
+
+
+def test_dasha_window(client):
+    r = client.post("/dasha?start=2020-01-01&end=2030-01-01&level=1", json=BIRTH)
+    assert r.status_code == 200
+    periods = r.json()["periods"]
+    assert periods and periods[0]["start"] <= "2020-01-01" < periods[0]["end"]
@@ -0,0 +1,51 @@
+import os
+import pytest
+
+pytest.importorskip("torch")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import src.api.main as api  # noqa: E402
+from src.astronomy.match import MatchPool  # noqa: E402
+
+BIRTH = dict(year=1990, month=5, day=25, hour=14, minute=30, timezone=5.5, latitude=28.61, longitude=77.2)
+CHARTS = dict(
+    year=[1991, 1993], month=[2, 7], day=[14, 9], hour=[8, 21], minute=[0, 15],
+    timezone=[5.5, 5.5], latitude=[19.07, 13.08], longitude=[72.88, 80.27],
+)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(api, "RATE_LIMIT_DELAY", 0)
+    monkeypatch.setattr(api, "MATCH_POOL_DIR", str(tmp_path))
+    monkeypatch.setattr(api, "match_pools", {})
+    return TestClient(api.app)
+
+
+def search_ids(client):
+    r = client.post("/match/search", json={"query": BIRTH, "pool": "brides"})
+    assert r.status_code == 200
+    return {res["id"] for res in r.json()["results"]}
+
+
+def test_pool_is_shared_through_its_file(client, tmp_path):
+    assert client.put("/match/pool/brides", json={"ids": ["a", "b"], "charts": CHARTS}).status_code == 200
+    assert (tmp_path / "brides.npz").exists()
+
+    # A fresh worker loads the pool from disk
+    api.match_pools.clear()
+    assert search_ids(client) == {"a", "b"}
+
+    # A replacement uploaded by another worker is picked up on the next search
+    pool = MatchPool(["c"], [5], [0], [False])
+    with open(tmp_path / "brides.npz", "wb") as f:
+        pool.save(f)
+    mtime = api.match_pools["brides"][0] + 10**9
+    os.utime(tmp_path / "brides.npz", ns=(mtime, mtime))
+    assert search_ids(client) == {"c"}
+
+
+def test_unknown_pool(client):
+    r = client.post("/match/search", json={"query": BIRTH, "pool": "nobody"})
+    assert r.status_code == 404
@@ -0,0 +1,16 @@
+import pytest
+
+pytest.importorskip("torch")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import src.api.main as api  # noqa: E402
+
+
+def test_sunrise_month(monkeypatch):
+    monkeypatch.setattr(api, "RATE_LIMIT_DELAY", 0)
+    r = TestClient(api.app).get("/sunrise?year=2024&month=1&latitude=28.61&longitude=77.2&timezone=5.5")
+    assert r.status_code == 200
+    days = r.json()["days"]
+    assert len(days) == 31 and days[0]["date"] == "2024-01-01"
+    assert days[0]["sunrise"].startswith("2024-01-01 07:1")
@@ -0,0 +1,26 @@
+import pytest
+
+pytest.importorskip("torch")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import src.api.main as api  # noqa: E402
+
+BIRTH = dict(year=1990, month=5, day=25, hour=14, minute=30, timezone=5.5, latitude=28.61, longitude=77.2)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(api, "RATE_LIMIT_DELAY", 0)
+    return TestClient(api.app)
+
+
+@pytest.mark.parametrize("start,end", [
+    ("2025-01-31", "2026-01-31"),
+    ("2025-12-30", "2026-12-30"),
+    ("2024-02-29", "2025-02-28"),
+])
+def test_timeline_default_end_is_one_year(client, start, end):
+    r = client.post(f"/transits/timeline?start={start}&planet=Sun", json=BIRTH)
+    assert r.status_code == 200
+    assert (r.json()["start"], r.json()["end"]) == (start, end)
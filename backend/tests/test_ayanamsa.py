@@ -0,0 +1,45 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+import swisseph as swe
+
+from src.astronomy.ayanamsa import AyanamsaSystem
+
+
+def direct(jd, name):
+    """swe.get_ayanamsa_ut for one mode, as the engine called it before the tables."""
+    return AyanamsaSystem._compute_direct(jd, AyanamsaSystem.MODES[name])
+
+
+@pytest.mark.parametrize("name", sorted(AyanamsaSystem.MODES))
+def test_table_matches_swe(name):
+    jds = np.random.default_rng(0).uniform(AyanamsaSystem.TABLE_JD[0], AyanamsaSystem.TABLE_JD[-1], 500)
+    expected = np.array([direct(jd, name) for jd in jds])
+    assert np.abs(AyanamsaSystem.get_ayanamsa(jds, name) - expected).max() < 1e-10
+
+
+def test_outside_table_falls_back_to_swe():
+    jd = swe.julday(1700, 6, 1, 0.0)
+    assert AyanamsaSystem.get_ayanamsa(jd, "RAMAN") == direct(jd, "RAMAN")
+    mixed = AyanamsaSystem.get_ayanamsa([jd, swe.julday(2000, 1, 1, 12.0)], "RAMAN")
+    assert mixed.shape == (2,)
+
+
+def test_scalar_and_aliases():
+    jd = swe.julday(2000, 1, 1, 12.0)
+    value = AyanamsaSystem.get_ayanamsa(jd, "kp")
+    assert isinstance(value, float)
+    assert value == AyanamsaSystem.get_ayanamsa(jd, "KRISHNAMURTI")
+    assert AyanamsaSystem.get_ayanamsa(jd, "unknown") == AyanamsaSystem.get_ayanamsa(jd, None)
+    assert AyanamsaSystem.get_ayanamsa(jd, None) == AyanamsaSystem.get_ayanamsa(jd, "LAHIRI")
+
+
+def test_modes_do_not_interfere_across_threads():
+    jd = swe.julday(1990, 5, 15, 5.0)
+    expected = {name: direct(jd, name) for name in AyanamsaSystem.MODES}
+    names = sorted(AyanamsaSystem.MODES) * 500
+    with ThreadPoolExecutor(8) as pool:
+        values = list(pool.map(lambda name: AyanamsaSystem.get_ayanamsa(jd, name), names))
+    for name, value in zip(names, values):
+        assert value == pytest.approx(expected[name], abs=1e-10)
@@ -0,0 +1,67 @@
+import pytest
+from pydantic import ValidationError
+
+from src.api.schemas import BirthDetailsBatch
+from src.astronomy.engine import GRAHA_NAMES, VedicAstroEngine
+
+# (year, month, day, hour, minute, lat, lon, tz): Delhi, Sydney, New York
+CHARTS = [
+    (1990, 5, 25, 14, 30, 28.61, 77.20, 5.5),
+    (1975, 12, 3, 2, 5, -33.87, 151.21, 10.0),
+    (2012, 7, 16, 23, 59, 40.71, -74.01, -4.0),
+]
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return VedicAstroEngine()
+
+
+def test_batch_matches_calculate_chart(engine):
+    batch = engine.calculate_charts_batch(*(list(col) for col in zip(*CHARTS)))
+    for i, args in enumerate(CHARTS):
+        chart = engine.calculate_chart(*args)
+        for j, name in enumerate(GRAHA_NAMES):
+            p = chart[name]
+            assert batch["absolute_longitude"][i, j] == pytest.approx(p["absolute_longitude"], abs=1e-9)
+            assert batch["degree"][i, j] == pytest.approx(p["degree"], abs=1e-9)
+            assert batch["speed"][i, j] == pytest.approx(p["speed"], abs=1e-9)
+            assert bool(batch["is_retrograde"][i, j]) == p["is_retrograde"]
+            assert batch["sign_id"][i, j] == p["sign_id"]
+            assert batch["d9_sign_id"][i, j] == p["d9_sign_id"]
+        asc = chart["Ascendant"]
+        assert batch["asc_absolute_longitude"][i] == pytest.approx(asc["absolute_longitude"], abs=1e-9)
+        assert batch["asc_sign_id"][i] == asc["sign_id"]
+        assert batch["asc_d9_sign_id"][i] == asc["d9_sign_id"]
+
+
+def columns(**overrides):
+    cols = dict(zip(("year", "month", "day", "hour", "minute", "latitude", "longitude", "timezone"),
+                    (list(col) for col in zip(*CHARTS))))
+    cols.update(overrides)
+    return cols
+
+
+@pytest.mark.parametrize("overrides", [
+    {"year": [1990, 1899, 2012]},
+    {"year": [1990, 1975, 2101]},
+    {"month": [5, 13, 7]},
+    {"minute": [30, 5, 60]},
+    {"hour": [14, 2]},
+])
+def test_batch_rows_are_validated(overrides):
+    with pytest.raises(ValidationError):
+        BirthDetailsBatch(**columns(**overrides))
+
+
+def test_predict_batch_rejects_out_of_range_year(monkeypatch):
+    pytest.importorskip("torch")
+    from fastapi.testclient import TestClient
+    import src.api.main as api
+
+    monkeypatch.setattr(api, "RATE_LIMIT_DELAY", 0)
+    client = TestClient(api.app)
+    assert client.post("/predict/batch", json=columns(year=[1990, 1800, 2012])).status_code == 422
+    r = client.post("/predict/batch", json=columns())
+    assert r.status_code == 200
+    assert len(r.json()["sign_id"]) == len(CHARTS)
@@ -0,0 +1,46 @@
+import pickle
+
+import pytest
+
+from src.astronomy.chart import SUN, MOON
+from src.astronomy.chart_cache import ChartCache
+from src.astronomy.engine import VedicAstroEngine
+
+BIRTH = (1990, 5, 15, 10, 30, 28.61, 77.20, 5.5)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return VedicAstroEngine(chart_cache=ChartCache())
+
+
+def test_cached_chart_is_shared(engine):
+    assert engine.get_chart(*BIRTH) is engine.get_chart(*BIRTH)
+
+
+def test_cached_chart_cannot_be_mutated(engine):
+    chart = engine.get_chart(*BIRTH)
+    house = chart["Sun"].house_number
+
+    with pytest.raises(AttributeError):
+        chart["Sun"].house_number = 99
+    with pytest.raises(AttributeError):
+        del chart[MOON].sign_id
+    with pytest.raises(TypeError):
+        chart.records[MOON] = None
+    with pytest.raises(AttributeError):
+        chart.records = ()
+    with pytest.raises(TypeError):
+        chart["Sun"]["house_number"] = 99
+
+    again = engine.get_chart(*BIRTH)
+    assert again["Sun"].house_number == house
+    assert again.records[MOON] is not None
+
+
+def test_chart_pickles_for_the_compute_pool(engine):
+    chart = engine.get_chart(*BIRTH)
+    copy = pickle.loads(pickle.dumps(chart))
+    assert copy.to_dict() == chart.to_dict()
+    with pytest.raises(AttributeError):
+        copy[SUN].degree = 0.0
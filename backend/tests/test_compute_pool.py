@@ -0,0 +1,91 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+from src.api import tasks
+from src.api.compute_pool import ComputePool, PoolSaturated
+from src.astronomy.engine import VedicAstroEngine
+
+BIRTH = (1990, 5, 15, 10, 30, 28.61, 77.20, 5.5)
+
+
+def hold(pool):
+    """Occupies one slot of `pool` until the returned event is set."""
+    release, started = threading.Event(), threading.Event()
+
+    def blocked():
+        started.set()
+        release.wait(5)
+
+    thread = threading.Thread(target=pool.run, args=(blocked,))
+    thread.start()
+    started.wait(5)
+    return release, thread
+
+
+def test_saturation_raises_and_is_counted():
+    pool = ComputePool(workers=0, max_queue=0, queue_timeout=0.05)
+    release, thread = hold(pool)
+    try:
+        stats = pool.stats()
+        assert (stats["mode"], stats["in_flight"], stats["capacity"]) == ("inline", 1, 1)
+        with pytest.raises(PoolSaturated):
+            pool.run(int, "1")
+    finally:
+        release.set()
+        thread.join()
+
+    assert pool.run(int, "7") == 7
+    stats = pool.stats()
+    assert stats["in_flight"] == 0
+    assert (stats["submitted"], stats["completed"], stats["rejected"]) == (2, 2, 1)
+
+
+def test_failed_task_frees_its_slot():
+    pool = ComputePool(workers=0, max_queue=0, queue_timeout=0.05)
+    with pytest.raises(ValueError):
+        pool.run(int, "x")
+    assert pool.run(int, "3") == 3
+    assert pool.stats()["failed"] == 1
+
+
+def test_spawned_workers_round_trip_chart_and_dasha():
+    pool = ComputePool(workers=2, max_queue=4, initializer=tasks.init_worker)
+    try:
+        chart = pool.run(tasks.compute_chart, *BIRTH)
+        assert chart == VedicAstroEngine().calculate_chart(*BIRTH)
+
+        birth_dt = datetime(*BIRTH[:5])
+        assert pool.run(tasks.build_dasha, chart, birth_dt, 2) == tasks.build_dasha(chart, birth_dt, 2)
+        stats = pool.stats()
+        assert (stats["mode"], stats["completed"], stats["capacity"]) == ("process", 2, 6)
+    finally:
+        pool.shutdown()
+
+
+@pytest.fixture
+def busy_api(monkeypatch):
+    """TestClient for the API with its compute pool's single slot taken by a running task."""
+    pytest.importorskip("torch")
+    from fastapi.testclient import TestClient
+    import src.api.main as api
+
+    pool = ComputePool(workers=0, max_queue=0, queue_timeout=0.05)
+    monkeypatch.setattr(api, "RATE_LIMIT_DELAY", 0)
+    monkeypatch.setattr(api, "compute_pool", pool)
+    release, thread = hold(pool)
+    yield TestClient(api.app)
+    release.set()
+    thread.join()
+
+
+def test_saturated_pool_returns_503(busy_api):
+    birth = dict(zip(("year", "month", "day", "hour", "minute", "latitude", "longitude", "timezone"), BIRTH))
+    assert busy_api.post("/dasha", json=birth).status_code == 503
+
+
+def test_pool_stats_endpoint(busy_api):
+    stats = busy_api.get("/pool-stats").json()
+    assert (stats["in_flight"], stats["capacity"], stats["queue_depth"]) == (1, 1, 0)
+    assert busy_api.get("/health").json()["compute_pool"]["in_flight"] == 1
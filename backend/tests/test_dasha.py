@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.astronomy.dasha import LEVEL_KEYS, VimshottariDasha, datetime_to_jd, jd_to_datetime
+from src.astronomy.engine import VedicAstroEngine
+
+BIRTH = datetime(1990, 5, 15, 10, 30)
+YEAR_DAYS = 365.2425
+SECOND = timedelta(seconds=1)
+
+
+def reference_sub_periods(dasha, start, lord, years, level=1):
+    """The recursive Antar/Pratyantar/Sookshma generator used before the template."""
+    if level > 3:
+        return None
+    periods = []
+    first = dasha.DASHA_ORDER.index(lord)
+    for i in range(9):
+        sub_lord = dasha.DASHA_ORDER[(first + i) % 9]
+        sub_years = years * dasha.DASHA_YEARS[sub_lord] / 120.0
+        end = start + timedelta(days=sub_years * YEAR_DAYS)
+        node = {"lord": sub_lord, "start": start, "end": end, "duration": sub_years}
+        children = reference_sub_periods(dasha, start, sub_lord, sub_years, level + 1)
+        if children:
+            node["sub_periods"] = children
+        periods.append(node)
+        start = end
+    return periods
+
+
+def reference_timeline(dasha, moon_long):
+    """The old calculate_dashas: flat balance Mahadasha, then 9 full ones with the recursive tree."""
+    span = 360.0 / 27.0
+    lord = dasha.NAKSHATRA_RULERS[int(moon_long / span)]
+    balance = dasha.DASHA_YEARS[lord] * (1.0 - moon_long % span / span)
+    end = BIRTH + timedelta(days=balance * YEAR_DAYS)
+    timeline = [{"lord": lord, "start": BIRTH, "end": end, "duration": balance, "sub_periods": []}]
+    first = dasha.DASHA_ORDER.index(lord)
+    for i in range(1, 10):
+        md_lord = dasha.DASHA_ORDER[(first + i) % 9]
+        years = dasha.DASHA_YEARS[md_lord]
+        start, end = end, end + timedelta(days=years * YEAR_DAYS)
+        timeline.append({
+            "lord": md_lord, "start": start, "end": end, "duration": years,
+            "sub_periods": reference_sub_periods(dasha, start, md_lord, years),
+        })
+    return timeline
+
+
+@pytest.fixture(scope="module")
+def dasha():
+    return VimshottariDasha()
+
+
+@pytest.fixture(scope="module")
+def moon():
+    return VedicAstroEngine().calculate_chart(1990, 5, 15, 10, 30, 28.6, 77.2, 5.5)["Moon"]
+
+
+@pytest.fixture(scope="module")
+def timeline(dasha, moon):
+    return dasha.get_timeline(moon.absolute_longitude, BIRTH, moon.nakshatra_id)
+
+
+def assert_same_tree(period, ref):
+    assert period.lord == ref["lord"]
+    assert abs(period.start - ref["start"]) <= SECOND and abs(period.end - ref["end"]) <= SECOND
+    assert period.duration == pytest.approx(ref["duration"], rel=1e-9, abs=1e-9)
+    kids = period.children()
+    assert len(kids) == len(ref.get("sub_periods") or [])
+    for kid, ref_kid in zip(kids, ref.get("sub_periods") or []):
+        assert_same_tree(kid, ref_kid)
+
+
+def test_template_matches_recursive_tree(dasha, moon, timeline):
+    reference = reference_timeline(dasha, moon.absolute_longitude)
+    mahadashas = timeline.mahadashas()
+    assert len(mahadashas) >= len(reference)
+
+    # Balance period: same lord and end; the full tree after it, at every level
+    balance = mahadashas[0]
+    assert balance.lord == reference[0]["lord"] and balance.start == BIRTH
+    assert abs(balance.end - reference[0]["end"]) <= SECOND
+    for period, ref in zip(mahadashas[1:], reference[1:]):
+        assert_same_tree(period, ref)
+
+
+def test_balance_sub_periods_are_the_tail_of_a_full_mahadasha(dasha, timeline):
+    balance = timeline.mahadashas()[0]
+    full_years = dasha.DASHA_YEARS[balance.lord]
+    virtual_start = balance.end - timedelta(days=full_years * YEAR_DAYS)
+    full = reference_sub_periods(dasha, virtual_start, balance.lord, full_years)
+
+    kids = balance.children()
+    assert kids[0].start == BIRTH and kids[-1].end == balance.end
+    tail = [ref for ref in full if ref["end"] > BIRTH + SECOND]
+    assert [k.lord for k in kids] == [ref["lord"] for ref in tail]
+    for kid, ref in zip(kids[1:], tail[1:]):
+        assert_same_tree(kid, ref)
+
+
+def test_find_matches_tree_search(dasha, moon, timeline):
+    nested = timeline.to_list(depth=4)
+    for days in np.random.default_rng(0).uniform(0, 110 * YEAR_DAYS, 200):
+        target = BIRTH + timedelta(days=float(days))
+        lazy = dasha.get_current_dasha_details(timeline, target)
+        tree = dasha.get_current_dasha_details(nested, target)
+        assert list(lazy) == list(tree) == LEVEL_KEYS
+        for key in LEVEL_KEYS:
+            assert lazy[key]["path"] == tree[key]["path"]
+
+
+@pytest.mark.parametrize("level", range(4))
+def test_periods_between_matches_walk(timeline, level):
+    start, end = datetime(2020, 3, 1), datetime(2023, 9, 1)
+    fast = [p.path for p in timeline.periods_between(start, end, level)]
+    assert fast == [p.path for p in timeline.walk((level,), start, end)]
+    assert fast and all(p.start < end and p.end > start for p in timeline.periods_between(start, end, level))
+
+
+def test_jd_round_trip():
+    for dt in (BIRTH, datetime(1900, 1, 1), datetime(2099, 12, 31, 23, 59, 59)):
+        assert jd_to_datetime(datetime_to_jd(dt)) == dt
+
+
+def test_node_paths(timeline):
+    assert timeline.node((3, 2)).lineage == [timeline.md_lords[3], timeline.node((3, 2)).lord]
+    with pytest.raises(ValueError):
+        timeline.node((3, 9))
+    with pytest.raises(ValueError):
+        timeline.node((0, 0, 0, 0, 0))
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from src.utils.dasha_export import ics_uid_prefix
+
+BIRTH = datetime(1990, 5, 15, 10, 30)
+
+
+def test_uid_prefix_depends_on_every_input():
+    base = ("VIMSHOTTARI", BIRTH, 28.61, 77.2, 5.5, "LAHIRI", 365.2425)
+    variants = [
+        ("VIMSHOTTARI", BIRTH, 19.07, 72.88, 5.5, "LAHIRI", 365.2425),   # same minute, elsewhere
+        ("VIMSHOTTARI", BIRTH, 28.61, 77.2, 5.0, "LAHIRI", 365.2425),
+        ("VIMSHOTTARI", BIRTH, 28.61, 77.2, 5.5, "RAMAN", 365.2425),
+        ("VIMSHOTTARI", BIRTH, 28.61, 77.2, 5.5, "LAHIRI", 360.0),       # other year model
+        ("YOGINI", BIRTH, 28.61, 77.2, 5.5, "LAHIRI", 365.2425),
+    ]
+    prefixes = {ics_uid_prefix(*v) for v in [base] + variants}
+    assert len(prefixes) == len(variants) + 1
+
+
+def test_uid_prefix_is_stable():
+    args = ("VIMSHOTTARI", BIRTH, 28.61, 77.2, 5.5, "lahiri", 365.2425)
+    assert ics_uid_prefix(*args) == ics_uid_prefix(*args[:5], "LAHIRI", 365.2425)
+    assert ics_uid_prefix(*args).startswith("vimshottari-199005151030-")
@@ -0,0 +1,127 @@
+from datetime import datetime
+
+import pytest
+
+from src.astronomy.dasha import VimshottariDasha
+from src.astronomy.dasha_systems import (
+    ASHTOTTARI, LIFESPAN_YEARS, SIGN_NAMES, SYSTEMS, YOGINI, chara_system,
+)
+from src.astronomy.engine import VedicAstroEngine
+from src.astronomy.nakshatras import NAKSHATRA_SPAN
+
+BIRTH = datetime(1990, 5, 15, 10, 30)
+
+
+@pytest.fixture(scope="module")
+def chart():
+    return VedicAstroEngine().calculate_chart(1990, 5, 15, 10, 30, 28.6, 77.2, 5.5)
+
+
+@pytest.fixture(scope="module")
+def dasha():
+    return VimshottariDasha()
+
+
+def timeline(dasha, chart, name):
+    moon = chart["Moon"]
+    return dasha.get_timeline(
+        moon.absolute_longitude, BIRTH, moon.nakshatra_id, system=dasha.get_system(name, chart)
+    )
+
+
+@pytest.mark.parametrize("name, first", [
+    ("VIMSHOTTARI", "Mahadasha (Balance)"),
+    ("YOGINI", "Mahadasha (Balance)"),
+    ("ASHTOTTARI", "Mahadasha (Balance)"),
+    ("CHARA", "Mahadasha"),
+])
+def test_balance_label_only_for_nakshatra_systems(dasha, chart, name, first):
+    periods = timeline(dasha, chart, name).mahadashas()
+    assert periods[0].type == first
+    assert periods[1].type == "Mahadasha"
+
+
+def test_cycle_lengths():
+    assert [SYSTEMS[name].cycle_years for name in ("VIMSHOTTARI", "YOGINI", "ASHTOTTARI")] == [120, 36, 108]
+
+
+@pytest.mark.parametrize("nakshatra, yogini", [
+    (0, "Bhramari"),   # Ashwini: (1 + 3) mod 8 = 4
+    (5, "Mangala"),    # Ardra: (6 + 3) mod 8 = 1
+    (7, "Dhanya"),     # Pushya: (8 + 3) mod 8 = 3
+    (12, "Sankata"),   # Hasta: (13 + 3) mod 8 = 0
+])
+def test_yogini_starting_lord(nakshatra, yogini):
+    start, elapsed = YOGINI.starting_point((nakshatra + 0.25) * NAKSHATRA_SPAN)
+    assert YOGINI.lords[start] == yogini
+    assert elapsed == pytest.approx(0.25)
+
+
+def test_ashtottari_groups():
+    groups = {
+        "Sun": [5, 6, 7, 8], "Moon": [9, 10, 11], "Mars": [12, 13, 14, 15], "Mercury": [16, 17, 18],
+        "Saturn": [19, 20, 21], "Jupiter": [22, 23, 24], "Rahu": [25, 26, 0, 1], "Venus": [2, 3, 4],
+    }
+    for lord, naks in groups.items():
+        for pos, nak in enumerate(naks):
+            start, elapsed = ASHTOTTARI.starting_point((nak + 0.5) * NAKSHATRA_SPAN)
+            assert ASHTOTTARI.lords[start] == lord
+            # The whole group of nakshatras spans the lord's Mahadasha
+            assert elapsed == pytest.approx((pos + 0.5) / len(naks))
+
+
+@pytest.mark.parametrize("name", ["YOGINI", "ASHTOTTARI"])
+def test_sub_periods_are_proportional(dasha, chart, name):
+    system = SYSTEMS[name]
+    line = timeline(dasha, chart, name)
+    md = line.mahadashas()[1]
+    kids = md.children()
+    assert [k.lord for k in kids] == system.lords[system.index[md.lord]:] + system.lords[:system.index[md.lord]]
+    expected = [md.duration * system.years[system.index[k.lord]] / system.cycle_years for k in kids]
+    assert [k.duration for k in kids] == pytest.approx(expected, rel=1e-9)
+    assert kids[0].start == md.start and kids[-1].end == md.end
+
+
+def test_yogini_repeats_to_cover_lifespan(dasha, chart):
+    line = timeline(dasha, chart, "YOGINI")
+    mds = line.mahadashas()
+    assert (mds[-1].end_jd - line.birth_jd) / line.year_days >= LIFESPAN_YEARS
+    assert all(a.end_jd == b.start_jd for a, b in zip(mds, mds[1:]))
+    assert mds[0].lord == mds[YOGINI.n].lord
+
+
+def test_chara_from_the_lagna(dasha, chart):
+    system = dasha.get_system("CHARA", chart)
+    asc = chart["Ascendant"].sign_id
+    signs = [SIGN_NAMES.index(s) for s in system.lords]
+    step = (signs[1] - signs[0]) % 12
+    assert signs[0] == asc and step in (1, 11)
+    assert signs == [(asc + step * i) % 12 for i in range(12)]
+    assert all(1 <= y <= 12 for y in system.years)
+
+    line = timeline(dasha, chart, "CHARA")
+    first = line.mahadashas()[0]
+    assert first.start == BIRTH and first.duration == pytest.approx(system.years[0])
+    # Twelve equal sub-periods, starting from the Mahadasha sign
+    kids = first.children()
+    assert kids[0].lord == first.lord and len(kids) == 12
+    assert [k.duration for k in kids] == pytest.approx([first.duration / 12] * 12, rel=1e-9)
+
+
+def test_chara_years_count_to_the_sign_lord():
+    # Lagna Aries, 9th Sagittarius is savya, so the dasha runs forward from Aries.
+    # Every graha in Aries: savya signs count forward to Aries, the rest backward.
+    class Record:
+        sign_id = 0
+
+    class Chart:
+        def __getitem__(self, key):
+            return Record()
+
+    system = chara_system(Chart())
+    assert system.lords[:3] == ["Aries", "Taurus", "Gemini"]
+    expected = {
+        "Aries": 12, "Taurus": 11, "Gemini": 10, "Cancer": 3, "Leo": 4, "Virgo": 5,
+        "Libra": 6, "Scorpio": 5, "Sagittarius": 4, "Capricorn": 9, "Aquarius": 10, "Pisces": 11,
+    }
+    assert dict(zip(system.lords, system.years.tolist())) == expected
@@ -0,0 +1,101 @@
+import os
+import threading
+
+import pytest
+
+from src.astronomy import engine as engine_module
+from src.astronomy.engine import VedicAstroEngine, ephemeris_candidates, find_ephemeris_path
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(engine_module.__file__), "../../data/ephemeris"))
+
+
+def ephe_dir(path, *names):
+    path.mkdir()
+    for name in names:
+        (path / name).write_bytes(b"")
+    return str(path)
+
+
+def in_fresh_thread(fn):
+    """Runs fn in a new thread, where Swiss Ephemeris has no path set yet."""
+    result = {}
+    t = threading.Thread(target=lambda: result.setdefault("value", fn()))
+    t.start()
+    t.join()
+    return result["value"]
+
+
+@pytest.fixture
+def no_env(monkeypatch):
+    monkeypatch.delenv("PANDIT_EPHE_PATH", raising=False)
+    monkeypatch.delenv("SE_EPHE_PATH", raising=False)
+
+
+def test_env_overrides(tmp_path, monkeypatch, no_env):
+    pandit = ephe_dir(tmp_path / "pandit", "sepl_18.se1")
+    se = ephe_dir(tmp_path / "se", "semo_18.se1")
+
+    monkeypatch.setenv("SE_EPHE_PATH", se)
+    assert find_ephemeris_path() == se
+    monkeypatch.setenv("PANDIT_EPHE_PATH", pandit)
+    assert find_ephemeris_path() == pandit
+    assert ephemeris_candidates()[:2] == [pandit, se]
+
+
+def test_search_order(tmp_path):
+    empty = ephe_dir(tmp_path / "empty")
+    other = ephe_dir(tmp_path / "other", "README.txt")
+    first = ephe_dir(tmp_path / "first", "sepl_18.se1")
+    second = ephe_dir(tmp_path / "second", "semo_18.se1")
+    missing = str(tmp_path / "missing")
+
+    assert find_ephemeris_path([None, missing, empty, other, first, second]) == first
+    assert find_ephemeris_path([second, first]) == second
+
+
+def test_bundled_directory_is_the_default(no_env):
+    if not os.path.isdir(DATA_DIR):
+        pytest.skip("run setup_data.py to download the ephemeris files")
+    assert find_ephemeris_path() == DATA_DIR
+
+
+def test_missing_files_fall_back_to_moshier(tmp_path):
+    empty = ephe_dir(tmp_path / "empty", "README.txt")
+    assert find_ephemeris_path([empty, str(tmp_path / "missing")]) is None
+
+    engine = VedicAstroEngine(ephe_path=empty)
+    assert engine.ephe_path is None
+    info = in_fresh_thread(engine.warmup)
+    assert info["backend"] == "moshier_fallback"
+    assert info["ephe_path"] is None and info["files"] == []
+    assert info["ephemeris_table"] is None
+
+
+def test_warmup_reads_ephemeris_files():
+    if not os.path.isdir(DATA_DIR):
+        pytest.skip("run setup_data.py to download the ephemeris files")
+    engine = VedicAstroEngine(ephe_path=DATA_DIR)
+    info = in_fresh_thread(engine.warmup)
+    assert info["backend"] == "swiss_ephemeris_files"
+    assert info["ephe_path"] == DATA_DIR
+    assert info["files"] == sorted(f for f in os.listdir(DATA_DIR) if f.endswith(".se1"))
+    assert info["total_ms"] >= info["dummy_chart_ms"]
+
+
+def test_health_without_ephemeris_files(tmp_path, monkeypatch):
+    pytest.importorskip("torch")
+    from fastapi.testclient import TestClient
+    import src.api.main as api
+
+    engine = VedicAstroEngine(ephe_path=ephe_dir(tmp_path / "empty"))
+    in_fresh_thread(engine.warmup)
+    monkeypatch.setattr(api, "astro_engine", engine)
+    monkeypatch.setattr(api, "RATE_LIMIT_DELAY", 0)
+
+    r = TestClient(api.app).get("/health")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["status"] == "ok"
+    assert body["ephemeris"]["backend"] == "moshier_fallback"
+    assert body["ephemeris"]["ephe_path"] is None
+    assert body["ephemeris"]["files"] == []
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+import swisseph as swe
+
+from src.astronomy.chart import SATURN
+from src.astronomy.engine import GRAHA_CODES, VedicAstroEngine
+from src.astronomy.ephemeris_table import (
+    MAX_LONGITUDE_ERROR_DEG, MAX_SPEED_ERROR_DEG_PER_DAY, EphemerisTable, build_table, verify_table,
+)
+
+# Two years around 2020: Mercury, Venus and Mars retrogrades and several 0/360 wraps
+START_JD = swe.julday(2019, 6, 1, 0.0)
+END_JD = swe.julday(2021, 6, 1, 0.0)
+BIRTH = (2020, 3, 10, 4, 45, 28.61, 77.20, 5.5)
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    VedicAstroEngine().use_ephemeris()
+    path = tmp_path_factory.mktemp("ephemeris") / "grahas.bin"
+    return EphemerisTable(build_table(str(path), start_jd=START_JD, end_jd=END_JD))
+
+
+def test_interpolation_within_documented_bounds(table):
+    for planet, (lon_err, speed_err) in verify_table(table, samples=2000).items():
+        assert lon_err < MAX_LONGITUDE_ERROR_DEG, planet
+        assert speed_err < MAX_SPEED_ERROR_DEG_PER_DAY, planet
+
+
+def test_interpolation_away_from_the_sun(table):
+    jds = np.random.default_rng(1).uniform(table.jd_start, table.jd_end - table.step, 2000)
+    lon, speed = table.positions(jds)
+    flags = swe.FLG_SWIEPH | swe.FLG_SPEED
+    ref = np.array([[swe.calc_ut(jd, code, flags)[0] for code in GRAHA_CODES] for jd in jds])
+
+    far = np.abs((lon - lon[:, :1] + 180) % 360 - 180) > 3
+    far[:, 0] = True
+    assert np.abs((lon - ref[..., 0] + 180) % 360 - 180)[far].max() < 2e-5
+    assert np.abs(speed - ref[..., 3])[far].max() < 1e-2
+
+
+def test_saturn_conjunction_within_bound(table):
+    # Saturn in conjunction with the Sun on 2020-01-13: the light deflection peak
+    jds = np.arange(swe.julday(2020, 1, 12, 0.0), swe.julday(2020, 1, 15, 0.0), 0.01)
+    lon = table.positions(jds)[0][:, SATURN]
+    ref = np.array([swe.calc_ut(jd, swe.SATURN, swe.FLG_SWIEPH)[0][0] for jd in jds])
+    err = np.abs((lon - ref + 180) % 360 - 180)
+    assert 1e-3 < err.max() < MAX_LONGITUDE_ERROR_DEG
+
+
+def test_grid_points_are_exact(table):
+    lon, speed = table.positions(table.jd_start + table.step * np.arange(10))
+    assert np.array_equal(lon, np.asarray(table.data[:10, :, 0]) % 360.0)
+    assert np.array_equal(speed, np.asarray(table.data[:10, :, 1]))
+
+
+def test_outside_range_is_rejected(table):
+    assert not table.covers(END_JD + 1)
+    with pytest.raises(ValueError):
+        table.positions([table.jd_start - 1])
+
+
+def test_engine_chart_agrees_with_and_without_table(table):
+    with_table = VedicAstroEngine(ephemeris_table=table).calculate_chart(*BIRTH)
+    live = VedicAstroEngine().calculate_chart(*BIRTH)
+    for a, b in zip(with_table.records, live.records):
+        assert abs((a.absolute_longitude - b.absolute_longitude + 180) % 360 - 180) < MAX_LONGITUDE_ERROR_DEG
+        assert a.sign_id == b.sign_id
@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+
+from src.astronomy.chart import GRAHA_NAMES, SATURN
+from src.astronomy.engine import VedicAstroEngine
+from src.astronomy.gochara import (
+    BINDU_MATRIX, CONTRIBUTORS, ashtakavarga, chart_contributor_signs, gochara, node_bindus,
+    transit_bindus, transit_scores,
+)
+
+# BPHS Bhinnashtakavarga totals of Sun..Saturn
+BINDU_TOTALS = [48, 49, 39, 54, 56, 52, 39]
+
+# Reference rules as plain dicts: contributor -> houses, counted from the contributor
+BINDUS = {
+    "Sun": {"Sun": [1, 2, 4, 7, 8, 9, 10, 11], "Moon": [3, 6, 10, 11], "Mars": [1, 2, 4, 7, 8, 9, 10, 11],
+            "Mercury": [3, 5, 6, 9, 10, 11, 12], "Jupiter": [5, 6, 9, 11], "Venus": [6, 7, 12],
+            "Saturn": [1, 2, 4, 7, 8, 9, 10, 11], "Lagna": [3, 4, 6, 10, 11, 12]},
+    "Moon": {"Sun": [3, 6, 7, 8, 10, 11], "Moon": [1, 3, 6, 7, 10, 11], "Mars": [2, 3, 5, 6, 9, 10, 11],
+             "Mercury": [1, 3, 4, 5, 7, 8, 10, 11], "Jupiter": [1, 4, 7, 8, 10, 11, 12],
+             "Venus": [3, 4, 5, 7, 9, 10, 11], "Saturn": [3, 5, 6, 11], "Lagna": [3, 6, 10, 11]},
+    "Mars": {"Sun": [3, 5, 6, 10, 11], "Moon": [3, 6, 11], "Mars": [1, 2, 4, 7, 8, 10, 11],
+             "Mercury": [3, 5, 6, 11], "Jupiter": [6, 10, 11, 12], "Venus": [6, 8, 11, 12],
+             "Saturn": [1, 4, 7, 8, 9, 10, 11], "Lagna": [1, 3, 6, 10, 11]},
+    "Mercury": {"Sun": [5, 6, 9, 11, 12], "Moon": [2, 4, 6, 8, 10, 11], "Mars": [1, 2, 4, 7, 8, 9, 10, 11],
+                "Mercury": [1, 3, 5, 6, 9, 10, 11, 12], "Jupiter": [6, 8, 11, 12],
+                "Venus": [1, 2, 3, 4, 5, 8, 9, 11], "Saturn": [1, 2, 4, 7, 8, 9, 10, 11],
+                "Lagna": [1, 2, 4, 6, 8, 10, 11]},
+    "Jupiter": {"Sun": [1, 2, 3, 4, 7, 8, 9, 10, 11], "Moon": [2, 5, 7, 9, 11], "Mars": [1, 2, 4, 7, 8, 10, 11],
+                "Mercury": [1, 2, 4, 5, 6, 9, 10, 11], "Jupiter": [1, 2, 3, 4, 7, 8, 10, 11],
+                "Venus": [2, 5, 6, 9, 10, 11], "Saturn": [3, 5, 6, 12], "Lagna": [1, 2, 4, 5, 6, 7, 9, 10, 11]},
+    "Venus": {"Sun": [8, 11, 12], "Moon": [1, 2, 3, 4, 5, 8, 9, 11, 12], "Mars": [3, 5, 6, 9, 11, 12],
+              "Mercury": [3, 5, 6, 9, 11], "Jupiter": [5, 8, 9, 10, 11], "Venus": [1, 2, 3, 4, 5, 8, 9, 10, 11],
+              "Saturn": [3, 4, 5, 8, 9, 10, 11], "Lagna": [1, 2, 3, 4, 5, 8, 9, 11]},
+    "Saturn": {"Sun": [1, 2, 4, 7, 8, 10, 11], "Moon": [3, 6, 11], "Mars": [3, 5, 6, 10, 11, 12],
+               "Mercury": [6, 8, 9, 10, 11, 12], "Jupiter": [5, 6, 11, 12], "Venus": [6, 11, 12],
+               "Saturn": [3, 5, 6, 11], "Lagna": [1, 3, 4, 6, 10, 11]},
+}
+FAVOURABLE = {
+    "Sun": {3: 9, 6: 12, 10: 4, 11: 5},
+    "Moon": {1: 5, 3: 9, 6: 12, 7: 2, 10: 4, 11: 8},
+    "Mars": {3: 12, 6: 9, 11: 5},
+    "Mercury": {2: 5, 4: 3, 6: 9, 8: 1, 10: 8, 11: 12},
+    "Jupiter": {2: 12, 5: 4, 7: 3, 9: 10, 11: 8},
+    "Venus": {1: 8, 2: 7, 3: 1, 4: 10, 5: 9, 8: 5, 9: 11, 11: 6, 12: 3},
+    "Saturn": {3: 12, 6: 9, 11: 5},
+    "Rahu": {3: 12, 6: 9, 11: 5},
+    "Ketu": {3: 12, 6: 9, 11: 5},
+}
+NO_VEDHA = {("Sun", "Saturn"), ("Saturn", "Sun"), ("Moon", "Mercury"), ("Mercury", "Moon")}
+CONTRIBUTOR_NAMES = GRAHA_NAMES[:SATURN + 1] + ["Lagna"]
+
+
+def reference_ashtakavarga(signs):
+    """Bindus per (graha, sign), one contributor and house at a time."""
+    bindus = {g: [0] * 12 for g in BINDUS}
+    for graha, rules in BINDUS.items():
+        for contributor, sign in zip(CONTRIBUTOR_NAMES, signs):
+            for house in rules[contributor]:
+                bindus[graha][(sign + house - 1) % 12] += 1
+    return bindus
+
+
+def reference_gochara(moon_sign, transit_signs):
+    """(house from Moon, favourable, obstructing graha or None) per transiting graha."""
+    houses = {g: (s - moon_sign) % 12 + 1 for g, s in zip(GRAHA_NAMES, transit_signs)}
+    result = []
+    for graha in GRAHA_NAMES:
+        house = houses[graha]
+        vedha = FAVOURABLE[graha].get(house)
+        blocker = None
+        if vedha:
+            blocker = next((c for c in GRAHA_NAMES[:SATURN + 1]
+                            if c != graha and (graha, c) not in NO_VEDHA and houses[c] == vedha), None)
+        result.append((house, vedha is not None, blocker))
+    return result
+
+
+@pytest.fixture(scope="module")
+def natal_signs():
+    return np.random.default_rng(0).integers(0, 12, (300, len(CONTRIBUTORS)))
+
+
+def test_bindu_totals():
+    assert BINDU_MATRIX.sum(axis=(1, 2)).tolist() == BINDU_TOTALS
+    assert BINDU_MATRIX.sum() == 337
+
+
+def test_ashtakavarga_matches_reference(natal_signs):
+    table = ashtakavarga(natal_signs)
+    assert table.shape == (len(natal_signs), SATURN + 1, 12)
+    for row, signs in zip(table, natal_signs.tolist()):
+        assert row.tolist() == list(reference_ashtakavarga(signs).values())
+    # Bindus only move between signs with the placements
+    assert (table.sum(axis=-1) == BINDU_TOTALS).all()
+    assert (table.sum(axis=(-2, -1)) == 337).all()
+
+
+def test_transit_bindus_match_full_table(natal_signs):
+    sky = np.random.default_rng(1).integers(0, 12, len(GRAHA_NAMES))
+    bhinna, sarva = transit_bindus(natal_signs, sky)
+    table = ashtakavarga(natal_signs)
+    grahas = np.arange(SATURN + 1)
+    assert (bhinna == table[:, grahas, sky[:SATURN + 1]]).all()
+    assert (sarva == table.sum(axis=1)[:, sky]).all()
+
+
+def test_gochara_matches_reference():
+    rng = np.random.default_rng(2)
+    moons = rng.integers(0, 12, 500)
+    skies = rng.integers(0, 12, (500, len(GRAHA_NAMES)))
+    house, favourable, vedha_by = gochara(moons, skies)
+    for i in range(len(moons)):
+        expected = reference_gochara(int(moons[i]), skies[i].tolist())
+        assert house[i].tolist() == [h for h, _, _ in expected]
+        assert favourable[i].tolist() == [f for _, f, _ in expected]
+        assert [GRAHA_NAMES[v] if v >= 0 else None for v in vedha_by[i].tolist()] == [b for _, _, b in expected]
+
+
+def test_no_vedha_between_sun_and_saturn():
+    # Moon in Aries; Sun in the 3rd (favourable, vedha house 9), Saturn in the 9th
+    sky = [2, 0, 0, 0, 0, 0, 8, 0, 6]
+    house, favourable, vedha_by = gochara(0, sky)
+    assert house[0] == 3 and favourable[0] and vedha_by[0] == -1
+    # Mars in the 9th instead does obstruct it
+    sky[2] = 8
+    assert GRAHA_NAMES[gochara(0, sky)[2][0]] == "Mars"
+
+
+def test_scores_and_node_bindus():
+    favourable = np.array([True, True, False])
+    vedha_by = np.array([-1, 3, -1])
+    assert transit_scores(favourable, vedha_by, [8, 4, 0]).tolist() == [1.0, 0.0, -1.0]
+    assert node_bindus([0, 28, 56, 70]).tolist() == [0.0, 4.0, 8.0, 8.0]
+
+
+def test_chart_contributors():
+    chart = VedicAstroEngine().calculate_chart(1990, 5, 15, 10, 30, 28.61, 77.20, 5.5)
+    signs = chart_contributor_signs(chart)
+    assert signs.tolist() == [chart[name].sign_id for name in GRAHA_NAMES[:SATURN + 1]] + [chart.ascendant.sign_id]
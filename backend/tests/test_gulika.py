@@ -0,0 +1,96 @@
+from datetime import date
+
+import pytest
+
+from src.astronomy.gulika import UPAGRAHA_LORDS, UpagrahaEngine, calculate_gulika
+
+DELHI = (28.61, 77.20, 5.5)
+# 2024-03-01 is a Friday: Venus (5) rules the day; its night starts from Mars (5 + 4)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return UpagrahaEngine()
+
+
+def upagrahas(engine, day, hour, minute, place=DELHI):
+    lat, lon, tz = place
+    return engine.calculate_upagrahas(2024, 3, day, hour, minute, lat, lon, tz)
+
+
+@pytest.mark.parametrize("day, hour, period, first_lord", [
+    (1, 10, "Day", 5),     # Friday daytime: parts start from Venus
+    (1, 22, "Night", 2),   # Friday night: from Mars, 5th from Venus
+    (2, 3, "Night", 2),    # Saturday 03:00 is before sunrise: still Friday's night
+])
+def test_part_from_weekday_lord(engine, day, hour, period, first_lord):
+    res = upagrahas(engine, day, hour, 0)
+    assert res["period"] == period
+    for name, lord in UPAGRAHA_LORDS.items():
+        assert res["upagrahas"][name]["part"] == (lord - first_lord) % 7 + 1
+    assert res["upagrahas"]["Mandi"]["part"] == res["upagrahas"]["Gulika"]["part"]
+
+
+def test_gulika_at_start_and_mandi_at_middle_of_saturn_part(engine):
+    lat, lon, tz = DELHI
+    res = upagrahas(engine, 1, 10, 0)
+    sunrise, sunset = engine.sunrise_sunset(date(2024, 3, 1), lat, lon, tz)
+    part = (sunset - sunrise) / 8.0
+    start = sunrise + part * (res["upagrahas"]["Gulika"]["part"] - 1)
+
+    gulika = engine._sidereal_ascendant(start, lat, lon, "LAHIRI")
+    mandi = engine._sidereal_ascendant(start + part / 2.0, lat, lon, "LAHIRI")
+    assert res["upagrahas"]["Gulika"]["absolute_longitude"] == pytest.approx(gulika)
+    assert res["upagrahas"]["Mandi"]["absolute_longitude"] == pytest.approx(mandi)
+    assert res["upagrahas"]["Gulika"]["absolute_longitude"] != pytest.approx(mandi)
+
+
+def test_polar_day_falls_back_to_six_to_six(engine):
+    # Longyearbyen in June: the Sun never sets
+    res = engine.calculate_upagrahas(2024, 6, 21, 12, 0, 78.22, 15.65, 2.0)
+    assert res["period"] == "Day"
+    assert res["sunrise"].endswith("06:00") and res["sunset"].endswith("18:00")
+    assert set(res["upagrahas"]) == set(UPAGRAHA_LORDS) | {"Mandi"}
+
+
+def test_cached_and_uncached_results_match(engine):
+    uncached = UpagrahaEngine(solar_cache_size=0)
+    for day, hour in ((1, 10), (1, 22), (2, 3)):
+        first = upagrahas(engine, day, hour, 15)
+        assert upagrahas(engine, day, hour, 15) == first
+        assert upagrahas(uncached, day, hour, 15) == first
+    assert len(uncached._solar_cache) == 0
+
+
+def test_calculate_gulika_wrapper(engine):
+    lat, lon, tz = DELHI
+    res = calculate_gulika(lat, lon, 2024, 3, 1, 10, 0, tz)
+    gulika = upagrahas(engine, 1, 10, 0)["upagrahas"]["Gulika"]
+    assert res["gulika_long"] == gulika["absolute_longitude"]
+    assert res["gulika_time"] == gulika["time"]
+
+
+@pytest.mark.parametrize("year, month, place", [
+    (2024, 2, DELHI),
+    (2024, 6, (64.15, -21.94, 0.0)),   # Reykjavik: sunsets after local midnight
+    (2024, 12, (-33.87, 151.21, 10.0)),
+])
+def test_month_sweep_matches_per_day_search(year, month, place):
+    lat, lon, tz = place
+    swept = UpagrahaEngine()
+    rows = swept.sunrise_month(year, month, lat, lon, tz)
+    assert [d.day for d, _, _ in rows] == list(range(1, len(rows) + 1))
+    assert len(swept._solar_cache) == len(rows)
+
+    single = UpagrahaEngine(solar_cache_size=0)
+    for day, sunrise, sunset in rows:
+        expected = single.sunrise_sunset(day, lat, lon, tz)
+        # Same events; a search from another start converges to within microseconds
+        assert sunrise == pytest.approx(expected[0], abs=1e-7)
+        assert sunset == pytest.approx(expected[1], abs=1e-7)
+        assert swept.sunrise_sunset(day, lat, lon, tz) == (sunrise, sunset)
+
+
+def test_month_sweep_through_polar_day():
+    rows = UpagrahaEngine().sunrise_month(2024, 6, 78.22, 15.65, 2.0)
+    assert all(sunset - sunrise == pytest.approx(0.5) for _, sunrise, sunset in rows)
@@ -0,0 +1,83 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.astronomy.engine import VedicAstroEngine
+from src.astronomy.match import (
+    BHAKOOT_CANCEL, CANCELLED_SHARE, KOOTA_MAX, KOOTA_TABLES, KOOTAS, NADI_CANCEL, PADAS, TOTAL_TABLE,
+    MatchMaker, MatchPool, moon_pada,
+)
+
+DEVA_SIGNS = [0, 3, 4, 7, 8, 11]
+
+
+def reference_kootas(m1, m2, nak1, nak2):
+    """The per-pair arithmetic MatchMaker used before the tables (no cancellations)."""
+    return {
+        "Varna": 1 if m1 % 4 == m2 % 4 else 0.5,
+        "Vashya": 2 if abs(m1 - m2) not in [6, 8] else 1,
+        "Tara": 3 if (nak2 - nak1) % 9 % 2 == 0 else 1.5,
+        "Yoni": 4 if (nak1 % 2) == (nak2 % 2) else 2,
+        "Maitri": 5 if (m1 in DEVA_SIGNS) == (m2 in DEVA_SIGNS) else 3 if abs(m1 - m2) in [4, 5, 9] else 0.5,
+        "Gana": 6 if nak1 % 3 == nak2 % 3 else 3 if abs(nak1 % 3 - nak2 % 3) == 1 else 0,
+        "Bhakoot": 0 if (m2 - m1) % 12 + 1 in [2, 12, 6, 8] else 7,
+        "Nadi": 0 if nak1 % 3 == nak2 % 3 else 8,
+    }
+
+
+@pytest.fixture(scope="module")
+def reference():
+    ref = np.zeros(KOOTA_TABLES.shape, dtype=np.float64)
+    for a, b in itertools.product(range(PADAS), repeat=2):
+        scores = reference_kootas(a // 9, b // 9, a // 4, b // 4)
+        ref[:, a, b] = [scores[k] for k in KOOTAS]
+    return ref
+
+
+def test_tables_match_reference_outside_cancellations(reference):
+    cancelled = (BHAKOOT_CANCEL > 0) | (NADI_CANCEL > 0)
+    for k, name in enumerate(KOOTAS):
+        if name in ("Bhakoot", "Nadi"):
+            continue
+        np.testing.assert_array_equal(KOOTA_TABLES[k], reference[k], err_msg=name)
+    np.testing.assert_array_equal(TOTAL_TABLE[~cancelled], reference.sum(axis=0)[~cancelled])
+
+
+@pytest.mark.parametrize("name, cancel", [("Bhakoot", BHAKOOT_CANCEL), ("Nadi", NADI_CANCEL)])
+def test_cancelled_cells(reference, name, cancel):
+    k = KOOTAS.index(name)
+    changed = KOOTA_TABLES[k] != reference[k]
+    # Exactly the cancelled doshas change, from 0 to a share of the points (never ideal)
+    np.testing.assert_array_equal(changed, cancel > 0)
+    assert (reference[k][changed] == 0).all()
+    assert (KOOTA_TABLES[k][changed] == KOOTA_MAX[k] * CANCELLED_SHARE).all()
+
+
+def test_changed_cell_count(reference):
+    # 1458 Bhakoot + 324 Nadi cancellations (24 pairs have both)
+    changed = KOOTA_TABLES != reference
+    assert changed.sum() == 1782
+    assert changed.any(axis=0).sum() == 1758
+
+
+def test_same_nakshatra_pairs_are_not_perfect():
+    assert TOTAL_TABLE.max() < 36
+    assert TOTAL_TABLE[NADI_CANCEL == 3].max() < TOTAL_TABLE.max()
+
+
+def test_search_reports_points_like_match():
+    engine = VedicAstroEngine()
+    query = engine.calculate_chart(1990, 5, 15, 10, 30, 28.61, 77.20, 5.5)
+    other = engine.calculate_chart(1992, 8, 3, 6, 45, 19.07, 72.88, 5.5)
+    maker = MatchMaker()
+    pool = MatchPool([str(p) for p in range(PADAS)], np.arange(PADAS), np.zeros(PADAS), np.zeros(PADAS, bool))
+
+    found = {r["id"]: r for r in maker.search(query, pool, top_k=PADAS)["results"]}
+    assert len(found) == PADAS
+    report = maker.calculate_compatibility(query, other)
+    result = found[str(moon_pada(other))]
+    assert result["score"] == report["score"] and type(result["score"]) is type(report["score"])
+    assert result["details"] == report["details"]
+    assert [type(v) for v in result["details"].values()] == [type(v) for v in report["details"].values()]
+    assert {type(r["score"]) for r in found.values()} == {int, float}
@@ -0,0 +1,35 @@
+import pytest
+
+from src.astronomy.chart import SATURN
+from src.astronomy.transit_events import SIGN, TransitEventTable, find_events
+from src.astronomy.transits import TransitEngine
+
+JD_2026 = 2461041.5  # 2026-01-01 00:00 UT
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return TransitEngine()
+
+
+@pytest.fixture
+def no_table(monkeypatch, tmp_path):
+    monkeypatch.setenv("PANDIT_TRANSIT_EVENTS_DIR", str(tmp_path))
+    monkeypatch.setattr(TransitEventTable, "_cache", {})
+
+
+def test_window_is_computed_without_building_the_full_table(engine, no_table):
+    table = TransitEventTable.for_window(engine, JD_2026, JD_2026 + 365)
+    assert TransitEventTable.cached() is None
+    assert table.jd.min() >= JD_2026 and table.jd.max() <= JD_2026 + 365
+    assert len(table.between(JD_2026, JD_2026 + 365, kinds=[SIGN])) > 150
+
+
+def test_sign_ingresses_are_roots(engine):
+    events = find_events(engine, JD_2026, JD_2026 + 3 * 365, planets=[SATURN], kinds=[SIGN])
+    assert len(events) > 0
+    for ev in events:
+        forward = ev["value"] == (ev["prev"] + 1) % 12
+        boundary = 30.0 * (ev["value"] if forward else ev["prev"])
+        lon = engine.compute_sky(ev["jd"])[0][SATURN]
+        assert abs((lon - boundary + 180.0) % 360.0 - 180.0) < 1e-5
@@ -0,0 +1,108 @@
+import io
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+import swisseph as swe
+
+from src.astronomy import transits
+from src.astronomy.chart import CHART_POINTS, GRAHA_NAMES
+from src.astronomy.transits import TransitEngine
+from src.utils import transit_fanout
+
+NOW = 1.7e9  # 2023-11-14 22:13 UTC
+BIRTHS = [
+    dict(year=1990, month=5, day=25, hour=14, minute=30, timezone=5.5, latitude=28.61, longitude=77.2),
+    dict(year=1975, month=12, day=3, hour=2, minute=5, timezone=10.0, latitude=-33.87, longitude=151.21),
+    dict(year=2012, month=7, day=16, hour=23, minute=59, timezone=-4.0, latitude=40.71, longitude=-74.01),
+]
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    # Freeze the clock so the fan-out and the per-chart path share one sky bucket
+    monkeypatch.setattr(transits, "time", SimpleNamespace(time=lambda: NOW))
+    monkeypatch.setenv("PANDIT_SKY_DIR", str(tmp_path))
+    monkeypatch.setattr(TransitEngine, "_sky", {})
+    return TransitEngine()
+
+
+@pytest.fixture
+def charts(engine):
+    return [
+        engine.calculate_chart(b["year"], b["month"], b["day"], b["hour"], b["minute"],
+                               b["latitude"], b["longitude"], b["timezone"])
+        for b in BIRTHS
+    ]
+
+
+def fanout(engine, records, **kwargs):
+    out = io.StringIO()
+    inp = io.StringIO("".join(json.dumps(r) + "\n" for r in records))
+    stats = transit_fanout.run(inp, out, engine=engine, **kwargs)
+    header, *lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert stats["charts"] == len(lines) == len(records)
+    return header, lines
+
+
+def signs_of(chart):
+    return [chart[p]["sign_id"] for p in CHART_POINTS]
+
+
+def test_matches_calculate_current_transits(engine, charts):
+    records = [dict(id=f"b{i}", **b) for i, b in enumerate(BIRTHS)]
+    records += [{"id": f"s{i}", "signs": signs_of(c)} for i, c in enumerate(charts)]
+    header, lines = fanout(engine, records)
+
+    assert header["sky"]["jd"] == engine.current_sky().jd
+    for line, chart in zip(lines, charts + charts):
+        rows = engine.calculate_current_transits(chart)
+        assert [r["current_sign"] for r in rows] == header["sky"]["signs"]
+        assert line["house"] == [r["transiting_house"] for r in rows]
+        assert line["house_from_moon"] == [r["house_from_moon"] for r in rows]
+        assert line["gochara"] == [r["gochara"] for r in rows]
+        assert line["vedha_by"] == [r["vedha_by"] for r in rows]
+        assert line["bindus"] == [r["bindus"] for r in rows]
+        assert line["sarvashtakavarga"] == [r["sarvashtakavarga"] for r in rows]
+        assert line["score"] == [r["score"] for r in rows]
+        assert line["prediction"] == [r["prediction"] for r in rows]
+    assert [line["id"] for line in lines] == [r["id"] for r in records]
+
+
+def test_chunking_does_not_change_results(engine, charts):
+    records = [{"id": i, "signs": signs_of(charts[i % 3])} for i in range(10)]
+    moment = datetime(2025, 3, 29, 10, 30, tzinfo=timezone.utc)
+    _, whole = fanout(engine, records, moment=moment)
+    for chunk_size in (1, 3, 7):
+        assert fanout(engine, records, moment=moment, chunk_size=chunk_size)[1] == whole
+
+
+def test_csv_input(engine, charts):
+    rows = ["id," + ",".join(CHART_POINTS)]
+    rows += [f"c{i}," + ",".join(map(str, signs_of(c))) for i, c in enumerate(charts)]
+    out = io.StringIO()
+    transit_fanout.run(io.StringIO("\n".join(rows) + "\n"), out, fmt="csv", engine=engine)
+    _, ndjson = fanout(engine, [{"id": f"c{i}", "signs": signs_of(c)} for i, c in enumerate(charts)])
+    assert [json.loads(line) for line in out.getvalue().splitlines()[1:]] == ndjson
+
+
+def test_sky_at_moment(engine):
+    moment = datetime(2025, 3, 29, 10, 30, tzinfo=timezone.utc)
+    sky = transit_fanout.sky_at(engine, "LAHIRI", moment)
+    assert sky.jd == pytest.approx(swe.julday(2025, 3, 29, 10.5))
+    assert len(sky.sign_id) == len(GRAHA_NAMES)
+
+
+def test_matches_transit_timeline(engine, charts):
+    moment = datetime(2025, 3, 29, 10, 30, tzinfo=timezone.utc)
+    jd = swe.julday(2025, 3, 29, 10.5)
+    when = moment.strftime("%Y-%m-%d %H:%M")
+    _, lines = fanout(engine, [{"id": i, "signs": signs_of(c)} for i, c in enumerate(charts)], moment=moment)
+
+    for line, chart in zip(lines, charts):
+        timeline = engine.transit_timeline(chart, jd - 40, jd + 40)
+        current = [next(iv for iv in timeline[name] if iv["start"] <= when < iv["end"]) for name in GRAHA_NAMES]
+        assert line["house"] == [iv["house_from_lagna"] for iv in current]
+        assert line["house_from_moon"] == [iv["house_from_moon"] for iv in current]
+        assert line["prediction"] == [iv["prediction"] for iv in current]
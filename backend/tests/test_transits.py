@@ -0,0 +1,80 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.astronomy.transits import TransitEngine, default_sky_path
+
+NOW = 1.7e9
+
+
+@pytest.fixture
+def fresh_sky(tmp_path, monkeypatch):
+    """A new process's view: empty in-memory snapshot and counters, sky files under tmp_path."""
+    monkeypatch.setenv("PANDIT_SKY_DIR", str(tmp_path))
+    monkeypatch.setattr(TransitEngine, "_sky", {})
+    monkeypatch.setattr(TransitEngine, "sky_stats", {"hits": 0, "refreshes": 0, "shared": 0})
+    return tmp_path
+
+
+def restart(monkeypatch):
+    monkeypatch.setattr(TransitEngine, "_sky", {})
+    monkeypatch.setattr(TransitEngine, "sky_stats", {"hits": 0, "refreshes": 0, "shared": 0})
+
+
+def sky_in_worker(now):
+    sky = TransitEngine().current_sky("LAHIRI", now=now)
+    return sky.jd, sky.longitude.tolist(), TransitEngine.sky_cache_stats()
+
+
+def test_sky_stats_count_every_call(fresh_sky):
+    engine = TransitEngine()
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda i: engine.current_sky("LAHIRI", now=NOW), range(4000)))
+
+    assert TransitEngine.sky_cache_stats() == {"hits": 3999, "refreshes": 1, "shared": 0}
+
+
+def test_snapshot_is_shared_through_the_file(fresh_sky, monkeypatch):
+    first = TransitEngine().current_sky("LAHIRI", now=NOW)
+    assert default_sky_path("LAHIRI") == str(fresh_sky / "sky_lahiri.npy")
+
+    restart(monkeypatch)
+    second = TransitEngine().current_sky("LAHIRI", now=NOW + 1)
+    assert TransitEngine.sky_cache_stats() == {"hits": 0, "refreshes": 0, "shared": 1}
+    assert second.bucket == first.bucket and second.jd == first.jd
+    np.testing.assert_array_equal(second.longitude, first.longitude)
+    np.testing.assert_array_equal(second.sign_id, first.sign_id)
+    np.testing.assert_array_equal(second.is_retrograde, first.is_retrograde)
+
+    # A file from an older bucket is replaced, never served
+    restart(monkeypatch)
+    third = TransitEngine().current_sky("LAHIRI", now=NOW + 3600)
+    assert TransitEngine.sky_cache_stats() == {"hits": 0, "refreshes": 1, "shared": 0}
+    assert third.jd > first.jd
+
+
+def test_spawned_workers_share_the_snapshot(fresh_sky):
+    first = TransitEngine().current_sky("LAHIRI", now=NOW)
+    with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context("spawn")) as pool:
+        results = list(pool.map(sky_in_worker, [NOW, NOW]))
+    for jd, longitude, stats in results:
+        assert jd == first.jd and longitude == first.longitude.tolist()
+        assert stats["refreshes"] == 0
+
+
+def test_unreadable_file_is_recomputed(fresh_sky):
+    (fresh_sky / "sky_lahiri.npy").write_bytes(b"not a snapshot")
+    sky = TransitEngine().current_sky("LAHIRI", now=NOW)
+    assert TransitEngine.sky_cache_stats()["refreshes"] == 1
+    assert len(sky.longitude) == 9
+
+
+def test_empty_sky_dir_keeps_it_per_process(fresh_sky, monkeypatch):
+    monkeypatch.setenv("PANDIT_SKY_DIR", "")
+    assert default_sky_path("LAHIRI") is None
+    TransitEngine().current_sky("LAHIRI", now=NOW)
+    assert TransitEngine.sky_cache_stats()["refreshes"] == 1
+    assert list(fresh_sky.iterdir()) == []
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from src.astronomy.chart import ASCENDANT
+from src.astronomy.engine import VedicAstroEngine
+from src.astronomy.vargas import (
+    VARGA_DIVISIONS, VARGA_INDEX, VARGA_TABLE, calculate_d9_navamsa, calculate_varga_sign, calculate_vargas,
+)
+
+ARIES, TAURUS, GEMINI, CANCER, LEO, VIRGO, LIBRA, SCORPIO, SAGITTARIUS, CAPRICORN, AQUARIUS, PISCES = range(12)
+
+
+def reference_d9(absolute_longitude):
+    """The per-point Navamsa arithmetic used before the table."""
+    sign = int(absolute_longitude // 30)
+    pada = int(absolute_longitude % 30 / (30.0 / 9.0))
+    return ((0, 9, 6, 3)[sign % 4] + pada) % 12
+
+
+# (division, rashi sign, degree in sign, varga sign) from the Parashara rules
+SPOT_CHECKS = [
+    (2, ARIES, 10, LEO), (2, ARIES, 20, CANCER), (2, TAURUS, 10, CANCER), (2, TAURUS, 20, LEO),
+    (3, ARIES, 15, LEO), (3, ARIES, 25, SAGITTARIUS), (3, PISCES, 5, PISCES),
+    (4, TAURUS, 10, LEO), (4, TAURUS, 25, AQUARIUS),
+    (7, ARIES, 1, ARIES), (7, TAURUS, 1, SCORPIO),
+    (10, ARIES, 29, CAPRICORN), (10, TAURUS, 1, CAPRICORN),
+    (12, GEMINI, 29, TAURUS),
+    (16, ARIES, 0.5, ARIES), (16, LEO, 0.5, LEO), (16, PISCES, 29.9, PISCES),
+    (20, TAURUS, 0.5, SAGITTARIUS), (20, GEMINI, 0.5, LEO),
+    (24, ARIES, 0.5, LEO), (24, TAURUS, 0.5, CANCER),
+    (27, TAURUS, 0.5, CANCER), (27, PISCES, 29.9, PISCES),
+    (30, ARIES, 3, ARIES), (30, ARIES, 7, AQUARIUS), (30, ARIES, 15, SAGITTARIUS),
+    (30, ARIES, 22, GEMINI), (30, ARIES, 28, LIBRA),
+    (30, TAURUS, 3, TAURUS), (30, TAURUS, 10, VIRGO), (30, TAURUS, 15, PISCES),
+    (30, TAURUS, 22, CAPRICORN), (30, TAURUS, 28, SCORPIO),
+    (40, TAURUS, 0.5, LIBRA),
+    (45, LEO, 0.5, LEO), (45, SAGITTARIUS, 0.5, SAGITTARIUS),
+    (60, ARIES, 0.4, ARIES), (60, ARIES, 29.9, PISCES),
+]
+
+
+@pytest.mark.parametrize("division,sign,degree,expected", SPOT_CHECKS)
+def test_parashara_spot_checks(division, sign, degree, expected):
+    assert calculate_varga_sign(sign * 30 + degree, division) == expected
+
+
+def test_d9_matches_old_arithmetic():
+    lon = np.random.default_rng(0).uniform(0, 360, 20000)
+    expected = [reference_d9(x) for x in lon]
+    assert calculate_vargas(lon)[:, VARGA_INDEX[9]].tolist() == expected
+    assert calculate_d9_navamsa(lon[0]) == expected[0]
+
+
+def test_table_is_complete():
+    for v, division in enumerate(VARGA_DIVISIONS):
+        assert (VARGA_TABLE[v, :, :division] >= 0).all()
+        assert (VARGA_TABLE[v, :, division:] == -1).all()
+
+
+@pytest.mark.parametrize("division", VARGA_DIVISIONS)
+def test_segment_boundaries(division):
+    # D30 is tabulated per whole degree, so its segments are 1 deg wide like the rest
+    v = VARGA_INDEX[division]
+    width = 30.0 / division
+    for sign in range(12):
+        for seg in range(1, division):
+            start = sign * 30 + seg * width
+            assert calculate_vargas(start + 1e-9)[v] == VARGA_TABLE[v, sign, seg]
+            assert calculate_vargas(start - 1e-9)[v] == VARGA_TABLE[v, sign, seg - 1]
+    # End of a sign stays in its last segment; 360 wraps to Aries
+    assert calculate_vargas(30 - 1e-12)[v] == VARGA_TABLE[v, ARIES, division - 1]
+    assert (calculate_vargas(360.0) == calculate_vargas(0.0)).all()
+
+
+def test_chart_and_batch_agree():
+    engine = VedicAstroEngine()
+    births = [(1990, 5, 15, 10, 30, 28.61, 77.20, 5.5), (1975, 11, 2, 23, 5, 40.71, -74.0, -5.0)]
+    batch = engine.calculate_charts_batch(*map(list, zip(*births)))
+    for row, birth in enumerate(births):
+        chart = engine.calculate_chart(*birth)
+        assert [r.vargas for r in chart.records[:ASCENDANT]] == [tuple(v) for v in batch["vargas"][row].tolist()]
+        assert chart.records[ASCENDANT].vargas == tuple(batch["asc_vargas"][row].tolist())
+        for record in chart.records:
+            assert record.d9_sign_id == reference_d9(record.absolute_longitude)